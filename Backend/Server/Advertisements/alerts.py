@@ -0,0 +1,169 @@
+from collections import namedtuple
+from itertools import groupby
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Advertisement, AdCard, SavedSearch, SearchAlert, SearchDocument, StatusChoices
+from . import cards, fulltext
+
+
+
+
+# -------------------------------
+# تطبیق آگهی‌های جدید با جستجوهای ذخیره شده (percolator)
+# -------------------------------
+# به جای اجرای تمام جستجوها برای هر آگهی، هر جستجو تنها با یک کلید (anchor) در ایندکس معکوس
+# (ستون ایندکس شده SavedSearch.anchor) ثبت می‌شود: گزینشی‌ترین شرط آن. چون شرط‌ها با AND ترکیب
+# می‌شوند، هر آگهی منطبق حتماً کلید anchor جستجو را دارد؛ پس برای هر آگهی تنها جستجوهایی که
+# anchor آن‌ها در مجموعه کلیدهای آگهی است خوانده و سپس تمام شرط‌هایشان در پایتون بررسی می‌شوند.
+
+# کلید جستجوهای بدون شرط (منطبق با هر آگهی)
+MATCH_ALL = '*'
+
+# (پیشوند کلید، فیلد جستجوی ذخیره شده، فیلد کارت آگهی) به ترتیب گزینش‌پذیری انتخاب anchor
+# (کلمات کلیدی پیش از همه بررسی می‌شوند)
+FIELDS = (
+    ('city', 'city_id', 'city_id'),
+    ('industry', 'industry_id', 'industry_id'),
+    ('province', 'province_id', 'province_id'),
+    ('salary', 'salary', 'salary'),
+    ('degree', 'degree', 'degree'),
+    ('job_type', 'job_type', 'job_type'),
+)
+
+# حداکثر کلید در هر کوئری IN (محدودیت تعداد پارامتر SQLite)
+KEYS_PER_QUERY = 500
+
+
+def keyword_tokens(keywords):
+    return set(fulltext.tokenize(keywords))
+
+
+def anchor_for(search):
+    """
+    کلید ایندکس معکوس یک جستجو: طولانی‌ترین کلمه کلیدی (معمولاً نادرترین)، وگرنه اولین شرط
+    مشخص شده به ترتیب FIELDS، وگرنه MATCH_ALL.
+    """
+    tokens = keyword_tokens(search.keywords)
+    if tokens:
+        return f"kw:{max(sorted(tokens), key=len)}"
+    for prefix, field, _ in FIELDS:
+        value = getattr(search, field)
+        if value not in (None, ''):
+            return f"{prefix}:{value}"
+    return MATCH_ALL
+
+
+def ad_keys(card, tokens):
+    # تمام کلیدهایی که یک آگهی دارد؛ جستجوهایی با anchor در این مجموعه نامزد تطبیق هستند
+    keys = {MATCH_ALL}
+    keys.update(f"{prefix}:{card[column]}" for prefix, _, column in FIELDS if card[column] not in (None, ''))
+    keys.update(f"kw:{token}" for token in tokens)
+    return keys
+
+
+def matches(search, card, tokens):
+    for _, field, column in FIELDS:
+        value = getattr(search, field)
+        if value not in (None, '') and value != card[column]:
+            return False
+    return keyword_tokens(search.keywords) <= tokens
+
+
+def percolate(advertisement_ids):
+    """
+    قرار دادن هشدار جستجوهای منطبق با آگهی‌های کارفرمای داده شده در صف.
+    تنها آگهی‌های تایید شده با اشتراک فعال منتشر شده‌اند و بررسی می‌شوند؛ هشدار تکراری
+    (آگهی‌ای که قبلاً با همان جستجو منطبق شده) نادیده گرفته می‌شود.
+    خروجی: تعداد هشدارهای منطبق.
+    """
+    advertisement_ids = list(advertisement_ids)
+    if not advertisement_ids:
+        return 0
+    published = list(cards.active(AdCard.objects.filter(
+        id__in=advertisement_ids,
+        kind=Advertisement.TypeChoices.JOB,
+        status=StatusChoices.APPROVED,
+    )).values('id', *(column for _, _, column in FIELDS)))
+    if not published:
+        return 0
+
+    # توکن‌های متن نرمال‌شده عنوان و توضیحات از سند جستجوی متن کامل
+    bodies = dict(SearchDocument.objects.filter(
+        kind=Advertisement.TypeChoices.JOB,
+        object_id__in=[card['id'] for card in published],
+    ).values_list('object_id', 'body'))
+    ads = [(card, set(fulltext.tokenize(bodies.get(card['id'], '')))) for card in published]
+
+    keys = sorted(set().union(*(ad_keys(card, tokens) for card, tokens in ads)))
+    alerts = []
+    for start in range(0, len(keys), KEYS_PER_QUERY):
+        candidates = SavedSearch.objects.filter(anchor__in=keys[start:start + KEYS_PER_QUERY]).only(
+            'id', 'job_seeker_id', 'keywords', *(field for _, field, _ in FIELDS)
+        )
+        for search in candidates:
+            alerts.extend(
+                SearchAlert(saved_search=search, job_advertisement_id=card['id'], job_seeker_id=search.job_seeker_id)
+                for card, tokens in ads
+                if matches(search, card, tokens)
+            )
+    SearchAlert.objects.bulk_create(alerts, ignore_conflicts=True)
+    return len(alerts)
+
+
+def percolate_subscription(subscription):
+    # آگهی‌های تایید شده‌ای که با فعال شدن اشتراک منتشر می‌شوند
+    percolate(cards.active(AdCard.objects.filter(
+        advertisement_id__in=Advertisement.objects.filter(subscription=subscription).values('pk'),
+        kind=Advertisement.TypeChoices.JOB,
+        status=StatusChoices.APPROVED,
+    )).values_list('id', flat=True))
+
+
+# -------------------------------
+# ارسال دسته‌ای هشدارها
+# -------------------------------
+# یک پیام برای هر کارجو شامل تمام آگهی‌های منطبق (بدون تکرار آگهی منطبق با چند جستجو)
+Digest = namedtuple('Digest', ['job_seeker_id', 'phone', 'advertisement_ids'])
+
+
+def pending_digests(job_seeker_ids):
+    rows = (
+        SearchAlert.objects
+        .filter(sent_at__isnull=True, job_seeker_id__in=job_seeker_ids)
+        .order_by('job_seeker_id', 'created_at')
+        .values_list('id', 'job_seeker_id', 'job_seeker__phone', 'job_advertisement_id')
+    )
+    for job_seeker_id, group in groupby(rows, key=lambda row: row[1]):
+        group = list(group)
+        advertisement_ids = list(dict.fromkeys(row[3] for row in group))
+        yield [row[0] for row in group], Digest(job_seeker_id, group[0][2], advertisement_ids)
+
+
+def flush(send, batch_size=None):
+    """
+    ارسال هشدارهای صف با تابع send(digest) و علامت‌گذاری آن‌ها به عنوان ارسال شده.
+    گیرندگان به ترتیب شناسه در دسته‌های batch_size تایی (keyset روی ایندکس search_alert_pending_idx)
+    پردازش می‌شوند و هشدارهای هر دسته با یک UPDATE علامت‌گذاری می‌شوند؛ اگر send خطا دهد
+    هشدارهای ارسال شده تا آن لحظه ثبت و بقیه در صف می‌مانند. خروجی: تعداد پیام‌های ارسال شده.
+    """
+    batch_size = batch_size or getattr(settings, 'SEARCH_ALERTS_BATCH_SIZE', 200)
+    pending = SearchAlert.objects.filter(sent_at__isnull=True)
+    last, digests = None, 0
+    while True:
+        recipients = pending if last is None else pending.filter(job_seeker_id__gt=last)
+        job_seeker_ids = list(
+            recipients.order_by('job_seeker_id').values_list('job_seeker_id', flat=True).distinct()[:batch_size]
+        )
+        if not job_seeker_ids:
+            return digests
+        sent = []
+        try:
+            for alert_ids, digest in pending_digests(job_seeker_ids):
+                send(digest)
+                sent.extend(alert_ids)
+                digests += 1
+        finally:
+            SearchAlert.objects.filter(id__in=sent).update(sent_at=timezone.now())
+        last = job_seeker_ids[-1]
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AdvertisementsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Advertisements'
+
+    def ready(self):
+        from . import signals
+        # بررسی کش مشترک (manage.py check --deploy)؛ سرویس‌های این اپ به آن وابسته‌اند
+        from Server import checks
@@ -0,0 +1,138 @@
+from django.utils import timezone
+
+from Subscriptions.models import AdvertisementSubscription, active_subscription_q
+
+from .models import Advertisement, JobAdvertisement, ResumeAdvertisement, AdCard
+
+
+
+
+# -------------------------------
+# ساخت کارت آگهی
+# -------------------------------
+# روابط مورد نیاز برای ساخت کارت؛ با یک کوئری واکشی می‌شوند
+JOB_CARD_RELATIONS = ('advertisement__subscription', 'company', 'industry', 'location__province')
+RESUME_CARD_RELATIONS = ('advertisement__subscription', 'industry', 'location__province')
+
+
+def card_fields(instance, kind):
+    """
+    مقادیر ستون‌های کارت آگهی را از آگهی کارفرما یا آگهی رزومه (با روابط واکشی شده) استخراج می‌کند.
+    """
+    subscription = instance.advertisement.subscription
+    fields = {
+        'kind': kind,
+        'advertisement_id': instance.advertisement_id,
+        'title': instance.title,
+        'status': instance.status,
+        'gender': instance.gender,
+        'soldier_status': instance.soldier_status,
+        'degree': instance.degree,
+        'salary': instance.salary,
+        'job_type': instance.job_type,
+        'industry_id': instance.industry_id,
+        'industry_name': instance.industry.name,
+        'city_id': instance.location_id,
+        'city_name': instance.location.name,
+        'province_id': instance.location.province_id,
+        'province_name': instance.location.province.name,
+        'subscription_status': subscription.subscription_status,
+        'is_boosted': subscription.subscription_status == AdvertisementSubscription.SubscriptionStatus.SPECIAL,
+        'subscription_end_date': subscription.end_date,
+        'created_at': instance.created_at,
+        'updated_at': instance.updated_at,
+    }
+    if kind == Advertisement.TypeChoices.JOB:
+        fields.update({
+            'owner_id': instance.employer_id,
+            'company_id': instance.company_id,
+            'company_name': instance.company.name,
+            'company_logo': instance.company.logo.name or None,
+        })
+    else:
+        fields['owner_id'] = instance.job_seeker_id
+    return fields
+
+
+def build_card(instance, kind):
+    return AdCard(id=instance.pk, **card_fields(instance, kind))
+
+
+# -------------------------------
+# به‌روزرسانی تدریجی (incremental)
+# -------------------------------
+def refresh_job_card(pk):
+    instance = JobAdvertisement.objects.select_related(*JOB_CARD_RELATIONS).get(pk=pk)
+    AdCard.objects.update_or_create(id=pk, defaults=card_fields(instance, Advertisement.TypeChoices.JOB))
+
+
+def refresh_resume_card(pk):
+    instance = ResumeAdvertisement.objects.select_related(*RESUME_CARD_RELATIONS).get(pk=pk)
+    AdCard.objects.update_or_create(id=pk, defaults=card_fields(instance, Advertisement.TypeChoices.RESUME))
+
+
+def delete_card(pk):
+    AdCard.objects.filter(id=pk).delete()
+
+
+# تغییر داده‌های غیرنرمال کارت (نام شرکت، صنعت، شهر، استان و اشتراک) updated_at آگهی‌های متاثر را نیز به‌روز
+# می‌کند تا فید تغییرات، نقشه سایت، خروجی و ETag جزئیات آگهی آن را ببینند (update سیگنال ذخیره ارسال نمی‌کند).
+def touch(now, **lookup):
+    JobAdvertisement.objects.filter(**lookup).update(updated_at=now)
+    ResumeAdvertisement.objects.filter(**lookup).update(updated_at=now)
+
+
+def refresh_company(company):
+    now = timezone.now()
+    JobAdvertisement.objects.filter(company=company).update(updated_at=now)
+    AdCard.objects.filter(company_id=company.pk).update(
+        company_name=company.name,
+        company_logo=company.logo.name or None,
+        updated_at=now,
+    )
+
+
+def refresh_industry(industry):
+    now = timezone.now()
+    touch(now, industry=industry)
+    AdCard.objects.filter(industry_id=industry.pk).update(industry_name=industry.name, updated_at=now)
+
+
+def refresh_city(city):
+    now = timezone.now()
+    touch(now, location=city)
+    AdCard.objects.filter(city_id=city.pk).update(
+        city_name=city.name,
+        province_id=city.province_id,
+        province_name=city.province.name,
+        updated_at=now,
+    )
+
+
+def refresh_province(province):
+    now = timezone.now()
+    touch(now, location__province=province)
+    AdCard.objects.filter(province_id=province.pk).update(province_name=province.name, updated_at=now)
+
+
+def refresh_subscription(subscription):
+    now = timezone.now()
+    touch(now, advertisement__subscription=subscription)
+    advertisement_ids = Advertisement.objects.filter(subscription=subscription).values('pk')
+    AdCard.objects.filter(advertisement_id__in=advertisement_ids).update(
+        subscription_status=subscription.subscription_status,
+        is_boosted=subscription.subscription_status == AdvertisementSubscription.SubscriptionStatus.SPECIAL,
+        subscription_end_date=subscription.end_date,
+        updated_at=now,
+    )
+
+
+# -------------------------------
+# فیلتر آگهی‌های فعال
+# -------------------------------
+def active(queryset):
+    """
+    محدود کردن کارت‌ها به آگهی‌هایی که اشتراکشان فعال است (معادل AdvertisementSubscription.is_active در SQL).
+    شرط تاریخ پایان، آگهی‌هایی را که هنوز توسط دستور expire_subscriptions منقضی نشده‌اند نیز حذف می‌کند.
+    """
+    return queryset.filter(active_subscription_q(end_date_field='subscription_end_date'))
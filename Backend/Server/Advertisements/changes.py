@@ -0,0 +1,110 @@
+import base64
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Advertisement, JobAdvertisement, AdCard, DeletedAdvertisement, StatusChoices
+from . import cards
+
+
+
+
+# -------------------------------
+# فید تغییرات آگهی‌های کارفرما (همگام‌سازی تدریجی)
+# -------------------------------
+# token شامل کلید (updated_at, id) آخرین آگهی تغییر کرده و (deleted_at, id) آخرین حذف ارسال شده است؛
+# هر صفحه با یک شرط keyset روی ایندکس job_ad_changes_idx و deleted_ad_changes_idx خوانده می‌شود.
+#
+# تغییراتی که در CHANGE_FEED_LAG ثانیه اخیر رخ داده‌اند هنوز ارسال نمی‌شوند: تراکنشی که زودتر شروع شده
+# ولی دیرتر commit می‌شود ممکن است updated_at کوچک‌تر از watermark کلاینت داشته باشد و از دست برود.
+class InvalidToken(ValueError):
+    pass
+
+
+def encode_token(state):
+    raw = json.dumps(state, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_token(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        updated, deleted = state['u'], state['d']
+        return {
+            'u': (datetime.fromisoformat(updated[0]), uuid.UUID(updated[1])) if updated else None,
+            'd': (datetime.fromisoformat(deleted[0]), int(deleted[1])) if deleted else None,
+        }
+    except Exception:
+        raise InvalidToken(token)
+
+
+def after(key, time_field, id_field='id'):
+    # شرط (time_field, id_field) > key
+    if key is None:
+        return Q()
+    return Q(**{f'{time_field}__gt': key[0]}) | Q(**{time_field: key[0], f'{id_field}__gt': key[1]})
+
+
+def key_state(key):
+    return None if key is None else [key[0].isoformat(), str(key[1])]
+
+
+def job_changes(token=None, page_size=None):
+    """
+    یک صفحه از تغییرات آگهی‌های کارفرما پس از token.
+
+    بدون token (همگام‌سازی اولیه) تنها آگهی‌های منتشر شده برگردانده می‌شوند؛ در همگام‌سازی تدریجی آگهی‌ای
+    که دیگر منتشر نیست (رد شده یا با اشتراک منقضی) و آگهی حذف شده به صورت tombstone (op=delete) می‌آیند.
+    خروجی: (لیست تغییرات، token بعدی، وجود صفحه بعد)
+    """
+    page_size = page_size or getattr(settings, 'CHANGE_FEED_PAGE_SIZE', 500)
+    state = decode_token(token) if token else {'u': None, 'd': None}
+    horizon = timezone.now() - timedelta(seconds=getattr(settings, 'CHANGE_FEED_LAG', 5))
+
+    updated = list(
+        JobAdvertisement.objects
+        .filter(after(state['u'], 'updated_at'), updated_at__lte=horizon)
+        .order_by('updated_at', 'id')
+        .values_list('updated_at', 'id')[:page_size + 1]
+    )
+    deleted = []
+    if token:
+        deleted = list(
+            DeletedAdvertisement.objects
+            .filter(after(state['d'], 'deleted_at'), kind=Advertisement.TypeChoices.JOB, deleted_at__lte=horizon)
+            .order_by('deleted_at', 'id')
+            .values_list('deleted_at', 'id', 'object_id')[:page_size + 1]
+        )
+    has_more = len(updated) > page_size or len(deleted) > page_size
+    updated, deleted = updated[:page_size], deleted[:page_size]
+
+    # آگهی‌های منتشر شده با داده کارت؛ بقیه در همگام‌سازی تدریجی tombstone هستند
+    published = cards.active(AdCard.objects.filter(
+        id__in=[pk for _, pk in updated],
+        kind=Advertisement.TypeChoices.JOB,
+        status=StatusChoices.APPROVED,
+    )).in_bulk()
+
+    changes = []
+    for updated_at, pk in updated:
+        card = published.get(pk)
+        if card is not None:
+            changes.append({'id': pk, 'op': 'upsert', 'card': card})
+        elif token:
+            changes.append({'id': pk, 'op': 'delete'})
+    for _, _, object_id in deleted:
+        changes.append({'id': object_id, 'op': 'delete'})
+
+    next_state = {
+        'u': key_state(updated[-1][:2]) if updated else key_state(state['u']),
+        'd': key_state(deleted[-1][:2]) if deleted else key_state(state['d']),
+    }
+    if not token:
+        # همگام‌سازی اولیه: حذف‌های پیش از آن لازم نیستند و watermark حذف‌ها از افق فعلی شروع می‌شود
+        next_state['d'] = [horizon.isoformat(), '0']
+    return changes, encode_token(next_state), has_more
@@ -0,0 +1,223 @@
+import atexit
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, F, Value, When
+
+from .models import Advertisement, JobAdvertisement, ResumeAdvertisement
+
+
+
+
+# -------------------------------
+# شمارنده بازدید با بافر نوشتن
+# -------------------------------
+# هر بازدید تنها یک incr اتمیک روی کلید کش آگهی است؛ مجموع افزایش‌ها به صورت دوره‌ای
+# با یک UPDATE دسته‌ای (CASE/WHEN) به ستون views منتقل می‌شود، به جای یک UPDATE به ازای هر بازدید.
+#
+# شمارنده‌ها در کش مشترک (نه در حافظه پروسه) نگهداری می‌شوند: هر پروسه آگهی‌های بازدید شده خود را
+# پس از ADS_VIEW_FLUSH_INTERVAL ثانیه (یا ADS_VIEW_FLUSH_MAX_PENDING آگهی) در بازدید بعدی flush می‌کند و
+# دستور flush_ad_views افزایش‌های پروسه‌های بیکار یا متوقف شده را ذخیره می‌کند.
+#
+# مجموعه آگهی‌های تغییر کرده نیز در کش مشترک است: اولین بازدید هر آگهی پس از آخرین flush آن (cache.add
+# روی کلید نشانگر) شناسه آگهی را به انتهای یک لاگ افزایشی (شماره خانه با incr اتمیک) اضافه می‌کند؛ دستور
+# flush_ad_views تنها خانه‌های جدید لاگ را می‌خواند، پس هزینه هر اجرا متناسب با آگهی‌های بازدید شده است نه
+# تعداد کل آگهی‌ها. پنجره از دست رفتن داده: تنها افزایش‌هایی که کش پیش از flush حذف (evict) یا با
+# راه‌اندازی مجدد پاک کند از دست می‌روند.
+#
+# views عمداً جزو ETag/Last-Modified نمایش آگهی نیست: هر بازدید updated_at را تغییر نمی‌دهد، پس کلاینتی که با
+# If-None-Match اعتبارسنجی مجدد می‌کند تا تغییر بعدی آگهی پاسخ 304 و views ذخیره شده خود را می‌گیرد. مقدار views
+# در پاسخ‌های جزئیات ممکن است عقب باشد؛ برای مقدار تازه درخواست بدون هدرهای شرطی ارسال شود.
+MODELS = {
+    Advertisement.TypeChoices.JOB: JobAdvertisement,
+    Advertisement.TypeChoices.RESUME: ResumeAdvertisement,
+}
+
+# قفل مشترک flush تا یک افزایش دو بار به دیتابیس منتقل نشود (انقضا در صورت توقف پروسه نگهدارنده قفل)
+FLUSH_LOCK_KEY = 'ads:views:flush-lock'
+FLUSH_LOCK_TIMEOUT = 60
+
+# لاگ آگهی‌های تغییر کرده: آخرین خانه نوشته شده، آخرین خانه خوانده شده و خانه‌هایی که هنگام خواندن
+# هنوز نوشته نشده بودند (incr انجام شده ولی set هنوز نه) به همراه تعداد تلاش‌ها
+LOG_HEAD_KEY = 'ads:views:log:head'
+LOG_TAIL_KEY = 'ads:views:log:tail'
+LOG_RETRY_KEY = 'ads:views:log:retry'
+LOG_MAX_RETRIES = 3
+
+# تعداد خانه لاگ در هر get_many
+SCAN_BATCH_SIZE = 1000
+
+# آگهی‌هایی که این پروسه برایشان افزایش ثبت کرده و هنوز flush نشده‌اند
+_dirty = set()
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def counter_key(kind, pk):
+    return f'ads:views:{kind}:{pk}'
+
+
+def dirty_key(kind, pk):
+    return f'ads:views:dirty:{kind}:{pk}'
+
+
+def log_key(slot):
+    return f'ads:views:log:{slot}'
+
+
+def incr(key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # کلید وجود ندارد؛ add در صورت ثبت همزمان توسط درخواست دیگر اثری ندارد
+        cache.add(key, 0, None)
+        return cache.incr(key)
+
+
+def record_view(kind, pk):
+    """
+    ثبت یک بازدید؛ در صورت گذشت بازه flush، افزایش‌های انباشته در دیتابیس ذخیره می‌شوند.
+    """
+    incr(counter_key(kind, pk))
+    # اولین بازدید پس از آخرین flush این آگهی: ثبت در لاگ مشترک آگهی‌های تغییر کرده
+    if cache.add(dirty_key(kind, pk), 1, None):
+        cache.set(log_key(incr(LOG_HEAD_KEY)), (kind, pk), None)
+
+    with _lock:
+        _dirty.add((kind, pk))
+        pending = len(_dirty)
+    interval = getattr(settings, 'ADS_VIEW_FLUSH_INTERVAL', 30)
+    max_pending = getattr(settings, 'ADS_VIEW_FLUSH_MAX_PENDING', 1000)
+    if pending >= max_pending or time.monotonic() - _last_flush >= interval:
+        flush()
+
+
+def pending_views(kind, pk):
+    return cache.get(counter_key(kind, pk), 0)
+
+
+def current_views(kind, instance):
+    """
+    تعداد فعلی بازدید: مقدار ذخیره شده در دیتابیس به علاوه افزایش‌های flush نشده.
+    (در پاسخ 304 ارسال نمی‌شود و ممکن است در نسخه ذخیره شده کلاینت عقب باشد.)
+    """
+    return instance.views + pending_views(kind, instance.pk)
+
+
+def acquire_flush_lock(wait=False):
+    deadline = time.monotonic() + FLUSH_LOCK_TIMEOUT
+    while not cache.add(FLUSH_LOCK_KEY, 1, FLUSH_LOCK_TIMEOUT):
+        if not wait or time.monotonic() >= deadline:
+            return False
+        time.sleep(0.1)
+    return True
+
+
+def release_flush_lock():
+    cache.delete(FLUSH_LOCK_KEY)
+
+
+def flush_counters(ads):
+    """
+    انتقال افزایش‌های انباشته آگهی‌های داده شده ((نوع، شناسه)) به دیتابیس؛ برای هر نوع آگهی یک UPDATE.
+    باید با قفل flush فراخوانی شود. از هر کلید تنها مقدار خوانده شده کم می‌شود (decr اتمیک)
+    تا بازدیدهای همزمان از دست نروند.
+    """
+    # نشانگر پیش از خواندن شمارنده حذف می‌شود تا بازدید بعدی آگهی دوباره در لاگ ثبت شود
+    cache.delete_many([dirty_key(kind, pk) for kind, pk in ads])
+    keys = {counter_key(kind, pk): (kind, pk) for kind, pk in ads}
+    counts = cache.get_many(list(keys))
+
+    updates = {kind: [] for kind in MODELS}
+    for key, count in counts.items():
+        if count:
+            kind, pk = keys[key]
+            updates[kind].append((pk, count))
+
+    flushed = 0
+    for kind, rows in updates.items():
+        if not rows:
+            continue
+        MODELS[kind].objects.filter(pk__in=[pk for pk, _ in rows]).update(
+            views=F('views') + Case(
+                *[When(pk=pk, then=Value(count)) for pk, count in rows],
+                default=Value(0),
+            )
+        )
+        for pk, count in rows:
+            try:
+                cache.decr(counter_key(kind, pk), count)
+            except ValueError:
+                # کلید پس از خواندن از کش حذف شده؛ مقدار خوانده شده ذخیره شده و چیزی برای کم کردن نمانده
+                pass
+            flushed += count
+    return flushed
+
+
+def flush():
+    """
+    ذخیره افزایش‌های آگهی‌هایی که این پروسه بازدید کرده است. اگر پروسه دیگری در حال flush باشد
+    آگهی‌ها برای flush بعدی نگه داشته می‌شوند.
+    """
+    global _last_flush
+    with _lock:
+        dirty = list(_dirty)
+        _dirty.clear()
+        _last_flush = time.monotonic()
+    if not dirty:
+        return 0
+
+    if not acquire_flush_lock():
+        with _lock:
+            _dirty.update(dirty)
+        return 0
+    try:
+        return flush_counters(dirty)
+    finally:
+        release_flush_lock()
+
+
+def flush_all(batch_size=None):
+    """
+    خواندن خانه‌های جدید لاگ آگهی‌های تغییر کرده (مستقل از حافظه پروسه‌ها) و ذخیره افزایش‌های انباشته آن‌ها؛
+    برای اجرای دوره‌ای توسط دستور flush_ad_views.
+    """
+    batch_size = batch_size or SCAN_BATCH_SIZE
+    if not acquire_flush_lock(wait=True):
+        return 0
+    try:
+        tail = cache.get(LOG_TAIL_KEY, 0)
+        head = cache.get(LOG_HEAD_KEY, 0)
+        retry = cache.get(LOG_RETRY_KEY, {})
+        slots = sorted(retry) + list(range(tail + 1, head + 1))
+
+        flushed = 0
+        pending = {}
+        for start in range(0, len(slots), batch_size):
+            batch = slots[start:start + batch_size]
+            entries = cache.get_many([log_key(slot) for slot in batch])
+            for slot in batch:
+                attempts = retry.get(slot, 0) + 1
+                if log_key(slot) not in entries and attempts < LOG_MAX_RETRIES:
+                    pending[slot] = attempts
+            if entries:
+                flushed += flush_counters(set(entries.values()))
+                cache.delete_many(list(entries))
+
+        cache.set_many({LOG_TAIL_KEY: head, LOG_RETRY_KEY: pending}, None)
+        return flushed
+    finally:
+        release_flush_lock()
+
+
+@atexit.register
+def flush_at_exit():
+    # ذخیره افزایش‌های باقی‌مانده هنگام خروج عادی پروسه؛ خطا (مثلاً بسته بودن اتصال دیتابیس) نادیده گرفته می‌شود
+    # و افزایش‌ها در کش مشترک باقی می‌مانند تا توسط دستور flush_ad_views ذخیره شوند
+    if _dirty:
+        try:
+            flush()
+        except Exception:
+            pass
@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.utils import timezone
+
+from Subscriptions.models import AdvertisementSubscription
+from .models import Advertisement, JobAdvertisement, ResumeAdvertisement, AdCard
+from . import recommendations, response_cache
+
+
+
+
+def expire_batch(batch_size=1000):
+    """
+    منقضی کردن یک دسته از اشتراک‌هایی که تاریخ پایانشان گذشته است.
+    تمام تغییرات با UPDATEهای مجموعه‌ای (set-based) انجام می‌شود: وضعیت اشتراک، فیلد is_boosted
+    آگهی‌های کارفرما و کارت‌های آگهی؛ سیگنال‌های ذخیره برای هر ردیف اجرا نمی‌شوند.
+    تعداد اشتراک‌های منقضی شده برگردانده می‌شود.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # انتخاب دسته با استفاده از ایندکس end_date
+        ids = list(
+            AdvertisementSubscription.objects.expired().order_by('end_date').values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+
+        expired = AdvertisementSubscription.SubscriptionStatus.EXPIRED
+        count = AdvertisementSubscription.objects.filter(pk__in=ids).update(
+            subscription_status=expired,
+            updated_at=now,
+        )
+        advertisement_ids = Advertisement.objects.filter(subscription_id__in=ids).values('pk')
+        # updated_at آگهی‌ها نیز تغییر می‌کند تا فید تغییرات و نقشه سایت خروج آن‌ها را ببینند
+        JobAdvertisement.objects.filter(advertisement__in=advertisement_ids).update(is_boosted=False, updated_at=now)
+        ResumeAdvertisement.objects.filter(advertisement__in=advertisement_ids).update(updated_at=now)
+        AdCard.objects.filter(advertisement_id__in=advertisement_ids).update(
+            subscription_status=expired,
+            is_boosted=False,
+        )
+        response_cache.bump(response_cache.JOB, response_cache.RESUME)
+        recommendations.invalidate_for_ads(
+            JobAdvertisement.objects.filter(advertisement__in=advertisement_ids).only('industry_id', 'location_id')
+        )
+    return count
+
+
+def expire_subscriptions(batch_size=1000):
+    """
+    اجرای expire_batch تا زمانی که اشتراک منقضی نشده‌ای باقی نماند؛ هر دسته در تراکنش جداگانه است
+    تا قفل‌ها کوتاه بمانند.
+    """
+    total = 0
+    while True:
+        count = expire_batch(batch_size)
+        total += count
+        if count < batch_size:
+            return total
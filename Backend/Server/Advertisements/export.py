@@ -0,0 +1,114 @@
+import json
+import zlib
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from Subscriptions.models import active_subscription_q
+
+from .models import JobAdvertisement, StatusChoices
+
+
+
+
+# -------------------------------
+# خروجی NDJSON آگهی‌های تایید شده
+# -------------------------------
+# ستون‌های هر سطر؛ روابط با یک JOIN در همان کوئری خوانده می‌شوند (بدون ساخت شیء مدل یا سریالایزر)
+FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'company_id': 'company_id',
+    'company_name': 'company__name',
+    'industry_id': 'industry_id',
+    'industry_name': 'industry__name',
+    'city_id': 'location_id',
+    'city_name': 'location__name',
+    'province_id': 'location__province_id',
+    'province_name': 'location__province__name',
+    'gender': 'gender',
+    'soldier_status': 'soldier_status',
+    'degree': 'degree',
+    'salary': 'salary',
+    'job_type': 'job_type',
+    'is_boosted': 'is_boosted',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def parse_since(value):
+    """
+    تبدیل پارامتر since (تاریخ ISO 8601) به datetime؛ در صورت نامعتبر بودن ValueError.
+    """
+    since = parse_datetime(value)
+    if since is None:
+        raise ValueError(value)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since, timezone.get_default_timezone())
+    return since
+
+
+def export_queryset(since=None, until=None):
+    """
+    آگهی‌های تایید شده با اشتراک فعال که پس از since (و تا until) بروزرسانی شده‌اند،
+    به ترتیب (updated_at, id) جهت استفاده از ایندکس job_ad_export_idx.
+    """
+    queryset = JobAdvertisement.objects.filter(
+        active_subscription_q('advertisement__subscription__'),
+        status=StatusChoices.APPROVED,
+    )
+    if since is not None:
+        queryset = queryset.filter(updated_at__gt=since)
+    if until is not None:
+        queryset = queryset.filter(updated_at__lte=until)
+    return queryset.order_by('updated_at', 'id').values_list(*FIELDS.values())
+
+
+def ndjson_lines(since=None, until=None, chunk_size=None):
+    """
+    تولید سطرهای NDJSON با حافظه ثابت: ردیف‌ها با cursor سمت سرور (iterator) به صورت
+    دسته‌های chunk_size تایی خوانده و بلافاصله نوشته می‌شوند.
+    """
+    chunk_size = chunk_size or getattr(settings, 'ADS_EXPORT_CHUNK_SIZE', 2000)
+    names = list(FIELDS)
+    for row in export_queryset(since, until).iterator(chunk_size=chunk_size):
+        yield json.dumps(dict(zip(names, row)), cls=DjangoJSONEncoder, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def buffered(chunks, size=None):
+    """
+    تجمیع قطعه‌های کوچک (هر سطر) در بلوک‌های حداقل STREAM_CHUNK_SIZE بایتی جهت کاهش تعداد نوشتن روی سوکت.
+    """
+    size = size or STREAM_CHUNK_SIZE
+    buffer, length = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield b''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+def gzip_stream(chunks):
+    """
+    فشرده‌سازی تدریجی یک جریان بایت با فرمت gzip (بدون نگهداری کل خروجی در حافظه).
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream(since=None, until=None, compress=False, chunk_size=None):
+    chunks = buffered(ndjson_lines(since, until, chunk_size))
+    return gzip_stream(chunks) if compress else chunks
@@ -0,0 +1,161 @@
+import re
+from functools import lru_cache
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from .models import SearchDocument
+
+
+
+
+# -------------------------------
+# نرمال‌سازی متن فارسی
+# -------------------------------
+# یکسان‌سازی حروف عربی با معادل فارسی
+_CHARACTER_MAP = str.maketrans({
+    'ي': 'ی',  # ی عربی
+    'ى': 'ی',  # الف مقصوره
+    'ك': 'ک',  # ک عربی
+    'ۀ': 'ه',
+    'ة': 'ه',
+    'أ': 'ا',
+    'إ': 'ا',
+    'آ': 'ا',
+    'ؤ': 'و',
+    # تبدیل ارقام فارسی و عربی به ارقام لاتین
+    **{chr(0x06F0 + digit): str(digit) for digit in range(10)},
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+    # حذف نیم‌فاصله (ZWNJ)، اتصال‌دهنده (ZWJ) و کشیده؛ «کتاب‌ها» و «کتابها» یکسان می‌شوند
+    '\u200c': '',
+    '\u200d': '',
+    '\u0640': '',
+})
+
+# اعراب و علائم تشکیل (فتحه، کسره، تنوین، تشدید، سکون و ...)
+_DIACRITICS = re.compile(r'[\u064B-\u065F\u0670\u06D6-\u06ED]')
+
+_TOKEN = re.compile(r'\w+')
+
+
+def normalize_persian(text):
+    """
+    نرمال‌سازی متن برای نمایه‌سازی و جستجو:
+    یکسان‌سازی ی/ک عربی و فارسی، حذف نیم‌فاصله و اعراب، تبدیل ارقام و حروف کوچک لاتین.
+    """
+    if not text:
+        return ''
+    text = _DIACRITICS.sub('', text.translate(_CHARACTER_MAP))
+    return ' '.join(text.lower().split())
+
+
+def tokenize(text):
+    return _TOKEN.findall(normalize_persian(text))
+
+
+# -------------------------------
+# نگهداری سند جستجو
+# -------------------------------
+def document_body(instance):
+    return normalize_persian(f"{instance.title} {instance.description or ''}")
+
+
+def build_document(instance, kind):
+    # ساخت سند جستجو بدون ذخیره؛ جهت bulk_create
+    return SearchDocument(kind=kind, object_id=instance.pk, body=document_body(instance))
+
+
+def index_advertisement(instance, kind):
+    """
+    ذخیره متن نرمال‌شده عنوان و توضیحات آگهی در جدول سند جستجو.
+    جدول FTS5 (در SQLite) با تریگر و ایندکس GIN (در Postgres) روی همین جدول ساخته شده‌اند.
+    """
+    SearchDocument.objects.update_or_create(
+        kind=kind,
+        object_id=instance.pk,
+        defaults={'body': document_body(instance)},
+    )
+
+
+def unindex_advertisement(instance, kind):
+    SearchDocument.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+
+# -------------------------------
+# پیاده‌سازی‌های جستجو
+# -------------------------------
+class SQLiteFullTextBackend:
+    """
+    جستجو با جدول مجازی FTS5 که محتوای خود را از جدول SearchDocument می‌خواند.
+    """
+    table = SearchDocument._meta.db_table
+
+    def build_query(self, tokens):
+        # هر توکن به صورت عبارت نقل‌قول‌شده با جستجوی پیشوندی؛ توکن‌ها با AND ترکیب می‌شوند
+        return ' AND '.join(f'"{token}"*' for token in tokens)
+
+    def matching_ids(self, tokens, kind):
+        sql = (
+            f'SELECT d.object_id FROM "{self.table}" d '
+            f'JOIN "{self.table}_fts" f ON f.rowid = d.id '
+            f'WHERE "{self.table}_fts" MATCH %s AND d.kind = %s'
+        )
+        return RawSQL(sql, (self.build_query(tokens), kind))
+
+
+class PostgresFullTextBackend:
+    """
+    جستجو با tsvector روی ستون body که توسط ایندکس GIN بیانی (expression index) پشتیبانی می‌شود.
+    """
+    table = SearchDocument._meta.db_table
+
+    def build_query(self, tokens):
+        return ' & '.join(f'{token}:*' for token in tokens)
+
+    def matching_ids(self, tokens, kind):
+        sql = (
+            f'SELECT object_id FROM "{self.table}" '
+            f"WHERE to_tsvector('simple', body) @@ to_tsquery('simple', %s) AND kind = %s"
+        )
+        return RawSQL(sql, (self.build_query(tokens), kind))
+
+
+class FallbackFullTextBackend:
+    """
+    برای دیتابیس‌های بدون پشتیبانی متن کامل؛ روی متن نرمال‌شده جستجوی زیررشته انجام می‌دهد.
+    """
+
+    def matching_ids(self, tokens, kind):
+        queryset = SearchDocument.objects.filter(kind=kind)
+        for token in tokens:
+            queryset = queryset.filter(body__icontains=token)
+        return queryset.values('object_id')
+
+
+def get_backend():
+    if connection.vendor == 'postgresql':
+        return PostgresFullTextBackend()
+    if connection.vendor == 'sqlite' and sqlite_fts5_available():
+        return SQLiteFullTextBackend()
+    return FallbackFullTextBackend()
+
+
+@lru_cache(maxsize=None)
+def sqlite_fts5_available():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [f'{SearchDocument._meta.db_table}_fts'],
+        )
+        return cursor.fetchone() is not None
+
+
+def search(queryset, query, kind):
+    """
+    رابط واحد جستجوی متن کامل: queryset آگهی‌ها را به ردیف‌هایی محدود می‌کند
+    که عنوان یا توضیحاتشان تمام کلمات query را (به صورت پیشوندی) دارند.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return queryset
+    return queryset.filter(pk__in=get_backend().matching_ids(tokens, kind))
@@ -0,0 +1,31 @@
+from django.db import transaction
+
+from .models import StatusChoices
+from . import alerts, recommendations, response_cache
+
+
+
+
+# -------------------------------
+# اثرات جانبی ذخیره آگهی‌های کارفرما
+# -------------------------------
+# هر مسیر نوشتن آگهی کارفرما پس از به‌روزرسانی مدل‌های خواندنی (سند جستجو، کارت و ایندکس شباهت)
+# این تابع را فراخوانی می‌کند: سیگنال post_save برای ذخیره تکی و سریالایزر ایجاد دسته‌ای که با
+# bulk_create هیچ سیگنالی ارسال نمی‌کند؛ مصرف‌کننده جدید تنها باید اینجا اضافه شود.
+def job_advertisements_saved(job_advertisements, created):
+    """
+    ابطال کش پیشنهادها و لیست‌ها و تطبیق آگهی‌های تایید شده با جستجوهای ذخیره شده.
+    """
+    approved = [job for job in job_advertisements if job.status == StatusChoices.APPROVED]
+    # آگهی جدید در حال بررسی هنوز در پیشنهادها نیست؛ آگهی تایید شده یا ویرایش/رد آگهی موجود بر آن‌ها اثر دارد
+    changed = approved if created else list(job_advertisements)
+    approved_ids = [job.pk for job in approved]
+
+    def after_commit():
+        # پس از commit: درخواست همزمان پیشنهادها نتیجه پیش از تغییر را دوباره کش نمی‌کند و هشدارها تنها
+        # برای ردیف‌های ذخیره شده ثبت می‌شوند؛ هشدار تکراری (ویرایش آگهی تایید شده) ثبت نمی‌شود
+        recommendations.invalidate_for_ads(changed)
+        alerts.percolate(approved_ids)
+
+    transaction.on_commit(after_commit)
+    response_cache.bump(response_cache.JOB)
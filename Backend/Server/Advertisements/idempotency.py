@@ -0,0 +1,81 @@
+import functools
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from rest_framework import status
+from rest_framework.response import Response
+
+
+
+
+# -------------------------------
+# درخواست‌های تکرارپذیر (Idempotency-Key)
+# -------------------------------
+HEADER = 'Idempotency-Key'
+
+# وضعیت درخواستی که هنوز در حال پردازش است
+IN_PROGRESS = 'in-progress'
+
+
+def cache_key(request, key):
+    # کلید به کاربر و مسیر درخواست محدود می‌شود تا کاربران مختلف با یک کلید تداخل نداشته باشند
+    return f'idempotency:{request.user.pk}:{request.path}:{key}'
+
+
+def fingerprint(request):
+    return hashlib.sha256(request.body).hexdigest()
+
+
+def idempotent(view_method):
+    """
+    دکوریتور اکشن‌های ایجاد (POST) ViewSet:
+    در صورت ارسال هدر Idempotency-Key، پاسخ اولین درخواست برای مدت IDEMPOTENCY_KEY_TTL ذخیره
+    و درخواست‌های تکراری با همان کلید، بدون اجرای مجدد مسیر نوشتن، همان پاسخ را دریافت می‌کنند.
+    - درخواست همزمان با کلیدی که هنوز در حال پردازش است: 409
+    - استفاده مجدد از کلید با بدنه متفاوت: 422
+    """
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+
+        ttl = getattr(settings, 'IDEMPOTENCY_KEY_TTL', 3600)
+        store_key = cache_key(request, key)
+        body_hash = fingerprint(request)
+
+        # ثبت اتمیک کلید؛ در صورت وجود، پاسخ ذخیره شده بازگردانده می‌شود
+        if not cache.add(store_key, (IN_PROGRESS, body_hash), ttl):
+            stored = cache.get(store_key)
+            if stored is None:
+                return Response({"Massage": "Request with this Idempotency-Key is in progress."}, status=status.HTTP_409_CONFLICT)
+            state, stored_hash, *response = stored
+            if stored_hash != body_hash:
+                return Response(
+                    {"Massage": "Idempotency-Key was already used with a different request body."},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                )
+            if state == IN_PROGRESS:
+                return Response({"Massage": "Request with this Idempotency-Key is in progress."}, status=status.HTTP_409_CONFLICT)
+            status_code, data = response
+            replay = Response(data, status=status_code)
+            replay['Idempotent-Replayed'] = 'true'
+            return replay
+
+        try:
+            response = view_method(self, request, *args, **kwargs)
+        except Exception:
+            # در صورت خطای پیش‌بینی نشده، کلید آزاد می‌شود تا کلاینت بتواند دوباره تلاش کند
+            cache.delete(store_key)
+            raise
+
+        # تنها پاسخ‌های قطعی (موفق یا خطای کلاینت) ذخیره می‌شوند
+        if response.status_code < 500:
+            cache.set(store_key, ('done', body_hash, response.status_code, response.data), ttl)
+        else:
+            cache.delete(store_key)
+        return response
+
+    return wrapper
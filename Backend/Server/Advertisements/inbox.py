@@ -0,0 +1,78 @@
+import uuid
+
+from django.db.models import Count
+
+from rest_framework.exceptions import ValidationError
+
+from .models import JobAdvertisement, Application
+
+
+
+
+class ApplicationInbox:
+    """
+    صندوق درخواست‌های کارفرما: تنها درخواست‌های ارسال شده به آگهی‌های خود کارفرما.
+
+    فیلترها:
+        ?advertisement=<uuid>,<uuid>   محدود کردن به آگهی‌های مشخص
+        ?status=PE,IR                  محدود کردن به وضعیت‌های مشخص
+        ?unread=true                   تنها درخواست‌های مشاهده نشده
+
+    شمارش هر وضعیت و تعداد خوانده نشده‌ها با یک کوئری GROUP BY محاسبه می‌شود؛
+    فیلتر وضعیت و unread روی شمارش‌ها اعمال نمی‌شود تا کلاینت بتواند تعداد هر زبانه را نمایش دهد.
+    """
+
+    def __init__(self, employer, params):
+        self.employer = employer
+        self.advertisements = self.parse_list(params, 'advertisement')
+        self.statuses = self.parse_list(params, 'status')
+        self.unread = params.get('unread', '').lower() in ('1', 'true', 'yes')
+
+        try:
+            self.advertisements = [uuid.UUID(value) for value in self.advertisements]
+        except ValueError:
+            raise ValidationError({'advertisement': 'A comma separated list of advertisement ids is expected.'})
+
+        invalid = set(self.statuses) - set(Application.StatusChoices.values)
+        if invalid:
+            raise ValidationError({'status': f'Invalid status: {", ".join(sorted(invalid))}.'})
+
+    def parse_list(self, params, name):
+        values = []
+        for raw in params.getlist(name):
+            values.extend(value.strip() for value in raw.split(',') if value.strip())
+        return values
+
+    # -------------------------------
+    # فیلتر کردن نتایج
+    # -------------------------------
+    def scope(self):
+        """
+        درخواست‌های آگهی‌های کارفرما؛ شرط مالکیت به صورت زیرکوئری روی شناسه آگهی‌ها اعمال می‌شود
+        تا ایندکس ترکیبی (advertisement, status, created_at) قابل استفاده باشد.
+        """
+        advertisements = JobAdvertisement.objects.filter(employer=self.employer)
+        if self.advertisements:
+            advertisements = advertisements.filter(id__in=self.advertisements)
+        return Application.objects.filter(advertisement__in=advertisements.values('pk'))
+
+    def filter(self, queryset):
+        if self.statuses:
+            queryset = queryset.filter(status__in=self.statuses)
+        if self.unread:
+            queryset = queryset.filter(viewed_by_employer=False)
+        return queryset
+
+    # -------------------------------
+    # شمارش‌ها
+    # -------------------------------
+    def counts(self, queryset):
+        rows = queryset.order_by().values('status', 'viewed_by_employer').annotate(count=Count('pk'))
+        by_status = {value: 0 for value in Application.StatusChoices.values}
+        unread = total = 0
+        for row in rows:
+            by_status[row['status']] = by_status.get(row['status'], 0) + row['count']
+            total += row['count']
+            if not row['viewed_by_employer']:
+                unread += row['count']
+        return {'status': by_status, 'unread': unread, 'total': total}
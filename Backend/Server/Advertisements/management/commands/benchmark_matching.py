@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+
+from django.core.management.base import BaseCommand
+
+from Advertisements.matching import ResumeMatrix, score_resumes, top_k
+
+
+class Command(BaseCommand):
+    help = 'Benchmark vectorized job-to-candidate scoring over a synthetic resume matrix'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resumes', type=int, default=500_000)
+        parser.add_argument('--skills-per-resume', type=int, default=5)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--k', type=int, default=20)
+
+    def handle(self, *args, **options):
+        n = options['resumes']
+        per_resume = options['skills_per_resume']
+        rng = np.random.default_rng(0)
+
+        salary_low = rng.choice([5, 10, 15, 20, 30, 50, np.nan], size=n).astype(np.float32)
+        matrix = ResumeMatrix(
+            ids=np.arange(1, n + 1, dtype=np.int64),
+            job_seeker_ids=np.arange(1, n + 1, dtype=np.int64),
+            industry=rng.integers(1, 200, size=n, dtype=np.int32),
+            city=rng.integers(1, 1000, size=n, dtype=np.int32),
+            province=rng.integers(1, 32, size=n, dtype=np.int32),
+            degree=rng.integers(-1, 6, size=n, dtype=np.int8),
+            salary_low=salary_low,
+            salary_high=salary_low + 5,
+            job_type=rng.integers(-1, 4, size=n, dtype=np.int8),
+            experience=rng.integers(-1, 4, size=n, dtype=np.int8),
+            skill_rows=np.repeat(np.arange(n, dtype=np.int32), per_resume),
+            skill_ids=rng.integers(1, 2000, size=n * per_resume, dtype=np.int32),
+        )
+
+        timings = []
+        for _ in range(options['repeat']):
+            started = time.perf_counter()
+            scores = score_resumes(
+                matrix, industry_id=7, city_id=42, province_id=3, degree='BA',
+                salary='10 to 15', job_type='FT', skill_ids=rng.integers(1, 2000, size=8),
+            )
+            top_k(scores, options['k'])
+            timings.append((time.perf_counter() - started) * 1000)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{n} resumes: median {np.median(timings):.1f} ms, '
+            f'p95 {np.percentile(timings, 95):.1f} ms, max {max(timings):.1f} ms'
+        ))
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from Advertisements.expiry import expire_subscriptions
+
+
+class Command(BaseCommand):
+    help = 'Expire advertisement subscriptions whose end date has passed (run periodically, e.g. from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running and sweep every INTERVAL seconds (0 = sweep once and exit)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = expire_subscriptions(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Successfully expired {count} subscriptions!'))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,37 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from Advertisements import export
+
+
+class Command(BaseCommand):
+    help = 'Export approved job advertisements as NDJSON (optionally gzip) with constant memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only ads updated after this ISO 8601 datetime')
+        parser.add_argument('--output', help='Output file (default: stdout)')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--chunk-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = export.parse_since(options['since'])
+            except ValueError:
+                raise CommandError('--since must be an ISO 8601 datetime.')
+        until = timezone.now()
+
+        chunks = export.stream(since, until, compress=options['gzip'], chunk_size=options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                for chunk in chunks:
+                    output.write(chunk)
+            # مرز بالای خروجی؛ مقدار --since اجرای بعدی
+            self.stderr.write(f'Exported ads updated until {until.isoformat()}')
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
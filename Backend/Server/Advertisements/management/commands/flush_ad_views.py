@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from Advertisements.counters import flush_all
+
+
+class Command(BaseCommand):
+    help = 'Save buffered advertisement view counts from the shared cache to the database (run periodically, e.g. from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running and flush every INTERVAL seconds (0 = flush once and exit)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = flush_all(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Successfully flushed {count} views!'))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from Advertisements import sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Incrementally regenerate the sharded XML sitemaps of approved job ads and companies'
+
+    def add_arguments(self, parser):
+        # ساخت کامل از ابتدا (حذف آدرس‌های ردیف‌های حذف شده)
+        parser.add_argument('--full', action='store_true')
+
+    def handle(self, *args, **options):
+        written = sitemaps.generate(full=options['full'])
+        for section, count in written.items():
+            self.stdout.write(f'{section}: {count} shard(s) rewritten')
+        self.stdout.write(self.style.SUCCESS('Successfully generated the sitemaps!'))
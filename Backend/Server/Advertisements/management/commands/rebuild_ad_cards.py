@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from Advertisements.models import Advertisement, JobAdvertisement, ResumeAdvertisement, AdCard
+from Advertisements.cards import JOB_CARD_RELATIONS, RESUME_CARD_RELATIONS, build_card
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized ad-card read table from job and resume advertisements'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        sources = (
+            (Advertisement.TypeChoices.JOB, JobAdvertisement.objects.select_related(*JOB_CARD_RELATIONS)),
+            (Advertisement.TypeChoices.RESUME, ResumeAdvertisement.objects.select_related(*RESUME_CARD_RELATIONS)),
+        )
+
+        count = 0
+        with transaction.atomic():
+            AdCard.objects.all().delete()
+            for kind, queryset in sources:
+                batch = []
+                for instance in queryset.iterator(chunk_size=batch_size):
+                    batch.append(build_card(instance, kind))
+                    if len(batch) >= batch_size:
+                        AdCard.objects.bulk_create(batch)
+                        count += len(batch)
+                        batch = []
+                AdCard.objects.bulk_create(batch)
+                count += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt {count} ad cards!'))
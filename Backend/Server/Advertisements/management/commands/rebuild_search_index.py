@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from Advertisements.models import Advertisement, JobAdvertisement, ResumeAdvertisement, SearchDocument
+from Advertisements.fulltext import normalize_persian
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search documents of job and resume advertisements'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        sources = (
+            (Advertisement.TypeChoices.JOB, JobAdvertisement),
+            (Advertisement.TypeChoices.RESUME, ResumeAdvertisement),
+        )
+
+        with transaction.atomic():
+            SearchDocument.objects.all().delete()
+            for kind, model in sources:
+                batch = []
+                rows = model.objects.values_list('id', 'title', 'description').iterator(chunk_size=batch_size)
+                for object_id, title, description in rows:
+                    batch.append(SearchDocument(
+                        kind=kind,
+                        object_id=object_id,
+                        body=normalize_persian(f"{title} {description or ''}"),
+                    ))
+                    if len(batch) >= batch_size:
+                        SearchDocument.objects.bulk_create(batch)
+                        batch = []
+                SearchDocument.objects.bulk_create(batch)
+
+        self.stdout.write(self.style.SUCCESS('Successfully rebuilt the search index!'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from Advertisements.models import JobAdvertisement, SimilarityBucket, SimilaritySignature
+from Advertisements import similarity
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the MinHash signatures and LSH buckets of job advertisements (similar jobs)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        with transaction.atomic():
+            SimilarityBucket.objects.all().delete()
+            SimilaritySignature.objects.all().delete()
+            signatures, buckets = [], []
+            rows = JobAdvertisement.objects.only('id', 'title', 'description').iterator(chunk_size=batch_size)
+            for job_advertisement in rows:
+                signature, job_buckets = similarity.build_rows(job_advertisement)
+                signatures.append(signature)
+                buckets.extend(job_buckets)
+                if len(signatures) >= batch_size:
+                    SimilaritySignature.objects.bulk_create(signatures)
+                    SimilarityBucket.objects.bulk_create(buckets)
+                    signatures, buckets = [], []
+            SimilaritySignature.objects.bulk_create(signatures)
+            SimilarityBucket.objects.bulk_create(buckets)
+
+        self.stdout.write(self.style.SUCCESS('Successfully rebuilt the similarity index!'))
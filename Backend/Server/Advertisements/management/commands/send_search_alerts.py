@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from kavenegar import KavenegarAPI, APIException, HTTPException
+
+from Server.settings import KAVENEGAR_API_KEY
+from Advertisements import alerts
+
+
+class Command(BaseCommand):
+    help = 'Send queued saved-search alerts as one SMS digest per job seeker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Job seekers per round')
+
+    def handle(self, *args, **options):
+        api = KavenegarAPI(str(KAVENEGAR_API_KEY))
+
+        def send(digest):
+            api.sms_send({
+                'sender': '2000660110',
+                'receptor': str(digest.phone),
+                'message': f'{len(digest.advertisement_ids)} آگهی جدید مطابق جستجوهای ذخیره شده شما در ماهر کار منتشر شد.',
+            })
+
+        try:
+            sent = alerts.flush(send, batch_size=options['batch_size'])
+        except (APIException, HTTPException) as e:
+            # هشدارهای ارسال نشده در صف می‌مانند و در اجرای بعدی ارسال می‌شوند
+            raise CommandError(f'Sending stopped: {e}')
+        self.stdout.write(f'Sent {sent} alert digest(s)')
@@ -0,0 +1,278 @@
+import threading
+import time
+
+import numpy as np
+
+from django.conf import settings
+
+from Resumes.models import JobSeekerResume, JobSeekerSkill
+from .models import DegreeChoices, JobTypeChoices, SalaryChoices
+
+
+
+
+# -------------------------------
+# کدگذاری مقادیر انتخابی به اعداد
+# -------------------------------
+# ترتیب مدارک تحصیلی (آگهی و رزومه از مقادیر متفاوتی استفاده می‌کنند)
+AD_DEGREE_ORDER = {
+    DegreeChoices.BELOW_DIPLOMA: 0,
+    DegreeChoices.DIPLOMA: 1,
+    DegreeChoices.ASSOCIATE: 2,
+    DegreeChoices.BACHELOR: 3,
+    DegreeChoices.MASTER: 4,
+    DegreeChoices.DOCTORATE: 5,
+}
+RESUME_DEGREE_ORDER = {
+    JobSeekerResume.DegreeChoices.BELOW_DIPLOMA: 0,
+    JobSeekerResume.DegreeChoices.DIPLOMA: 1,
+    JobSeekerResume.DegreeChoices.ASSOCIATE: 2,
+    JobSeekerResume.DegreeChoices.BACHELOR: 3,
+    JobSeekerResume.DegreeChoices.MASTER: 4,
+    JobSeekerResume.DegreeChoices.DOCTORATE: 5,
+}
+
+AD_JOB_TYPE_CODES = {
+    JobTypeChoices.FULL_TIME: 0,
+    JobTypeChoices.PART_TIME: 1,
+    JobTypeChoices.REMOTE: 2,
+    JobTypeChoices.INTERNSHIP: 3,
+}
+RESUME_JOB_TYPE_CODES = {
+    JobSeekerResume.JobTypeChoices.FULL_TIME: 0,
+    JobSeekerResume.JobTypeChoices.PART_TIME: 1,
+    JobSeekerResume.JobTypeChoices.REMOTE: 2,
+    JobSeekerResume.JobTypeChoices.INTERNSHIP: 3,
+}
+
+EXPERIENCE_ORDER = {
+    JobSeekerResume.CooperationTypeChoices.NO_EXPERIENCE: 0,
+    JobSeekerResume.CooperationTypeChoices.LESS_THAN_3_YEARS: 1,
+    JobSeekerResume.CooperationTypeChoices.BETWEEN_3_AND_6_YEARS: 2,
+    JobSeekerResume.CooperationTypeChoices.MORE_THAN_6_YEARS: 3,
+}
+
+# بازه حقوق (میلیون تومان)؛ حقوق توافقی بازه مشخصی ندارد
+SALARY_RANGES = {
+    SalaryChoices.RANGE_5_TO_10: (5, 10),
+    SalaryChoices.RANGE_10_TO_15: (10, 15),
+    SalaryChoices.RANGE_15_TO_20: (15, 20),
+    SalaryChoices.RANGE_20_TO_30: (20, 30),
+    SalaryChoices.RANGE_30_TO_50: (30, 50),
+    SalaryChoices.MORE_THAN_50: (50, np.inf),
+}
+
+# وزن هر معیار در امتیاز نهایی
+WEIGHTS = {
+    'industry': 3.0,
+    'location': 2.0,
+    'degree': 1.5,
+    'salary': 1.0,
+    'job_type': 1.0,
+    'experience': 1.0,
+    'skills': 2.5,
+}
+
+MISSING = -1
+
+
+def salary_bounds(value):
+    return SALARY_RANGES.get(value, (np.nan, np.nan))
+
+
+# -------------------------------
+# ماتریس فشرده رزومه‌ها
+# -------------------------------
+class ResumeMatrix:
+    """
+    نمایش ستونی (columnar) و فشرده تمام رزومه‌ها در آرایه‌های NumPy.
+    هر ستون یک آرایه به طول تعداد رزومه‌هاست؛ مقادیر ناموجود با -1 (یا NaN برای حقوق) کد می‌شوند.
+    مهارت‌ها به صورت CSR نگهداری می‌شوند: skill_rows[i] شماره ردیف رزومه‌ی مهارت skill_ids[i] است.
+    """
+
+    def __init__(self, ids, job_seeker_ids, industry, city, province, degree,
+                 salary_low, salary_high, job_type, experience, skill_rows, skill_ids):
+        self.ids = ids
+        self.job_seeker_ids = job_seeker_ids
+        self.industry = industry
+        self.city = city
+        self.province = province
+        self.degree = degree
+        self.salary_low = salary_low
+        self.salary_high = salary_high
+        self.job_type = job_type
+        self.experience = experience
+        self.skill_rows = skill_rows
+        self.skill_ids = skill_ids
+        self.built_at = time.monotonic()
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_database(cls, chunk_size=5000):
+        rows = JobSeekerResume.objects.order_by('id').values_list(
+            'id', 'job_seeker_id', 'industry_id', 'location_id', 'location__province_id',
+            'degree', 'expected_salary', 'preferred_job_type', 'experience',
+        ).iterator(chunk_size=chunk_size)
+
+        columns = [[] for _ in range(10)]
+        for (pk, job_seeker_id, industry_id, city_id, province_id,
+             degree, salary, job_type, experience) in rows:
+            low, high = salary_bounds(salary)
+            values = (
+                pk, job_seeker_id,
+                MISSING if industry_id is None else industry_id,
+                MISSING if city_id is None else city_id,
+                MISSING if province_id is None else province_id,
+                RESUME_DEGREE_ORDER.get(degree, MISSING),
+                low, high,
+                RESUME_JOB_TYPE_CODES.get(job_type, MISSING),
+                EXPERIENCE_ORDER.get(experience, MISSING),
+            )
+            for column, value in zip(columns, values):
+                column.append(value)
+
+        ids = np.asarray(columns[0], dtype=np.int64)
+
+        # مهارت‌ها: تبدیل شناسه رزومه به شماره ردیف با جستجوی دودویی روی ids مرتب
+        skills = np.asarray(
+            list(JobSeekerSkill.objects.filter(skill__isnull=False).values_list('resume_id', 'skill_id')),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        skill_rows = np.searchsorted(ids, skills[:, 0]).astype(np.int32)
+
+        return cls(
+            ids=ids,
+            job_seeker_ids=np.asarray(columns[1], dtype=np.int64),
+            industry=np.asarray(columns[2], dtype=np.int32),
+            city=np.asarray(columns[3], dtype=np.int32),
+            province=np.asarray(columns[4], dtype=np.int32),
+            degree=np.asarray(columns[5], dtype=np.int8),
+            salary_low=np.asarray(columns[6], dtype=np.float32),
+            salary_high=np.asarray(columns[7], dtype=np.float32),
+            job_type=np.asarray(columns[8], dtype=np.int8),
+            experience=np.asarray(columns[9], dtype=np.int8),
+            skill_rows=skill_rows,
+            skill_ids=skills[:, 1].astype(np.int32),
+        )
+
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+def get_resume_matrix():
+    """
+    ماتریس رزومه‌ها در حافظه پروسه نگهداری و پس از MATCHING_MATRIX_TTL ثانیه بازسازی می‌شود.
+    """
+    global _matrix
+    ttl = getattr(settings, 'MATCHING_MATRIX_TTL', 300)
+    with _matrix_lock:
+        if _matrix is None or time.monotonic() - _matrix.built_at > ttl:
+            _matrix = ResumeMatrix.from_database()
+        return _matrix
+
+
+def invalidate_resume_matrix():
+    global _matrix
+    with _matrix_lock:
+        _matrix = None
+
+
+# -------------------------------
+# امتیازدهی برداری
+# -------------------------------
+def score_resumes(matrix, industry_id, city_id, province_id, degree=None, salary=None,
+                  job_type=None, skill_ids=(), min_experience=None):
+    """
+    امتیاز تمام رزومه‌ها نسبت به یک آگهی را به صورت برداری (بدون حلقه روی ردیف‌ها) محاسبه می‌کند.
+    خروجی آرایه‌ای از امتیازها در بازه [0, 1] به ترتیب ردیف‌های matrix است.
+    """
+    n = len(matrix)
+    score = np.zeros(n, dtype=np.float32)
+
+    # صنعت
+    score += WEIGHTS['industry'] * (matrix.industry == industry_id)
+
+    # موقعیت مکانی: هم‌شهر امتیاز کامل، هم‌استان نصف امتیاز؛ دورکاری برای همه امتیاز کامل
+    if job_type == JobTypeChoices.REMOTE:
+        score += WEIGHTS['location']
+    else:
+        location = np.where(matrix.city == city_id, 1.0, np.where(matrix.province == province_id, 0.5, 0.0))
+        score += WEIGHTS['location'] * location.astype(np.float32)
+
+    # مدرک تحصیلی: رزومه‌هایی که حداقل مدرک آگهی را دارند
+    required_degree = AD_DEGREE_ORDER.get(degree)
+    if required_degree is None:
+        score += WEIGHTS['degree']
+    else:
+        score += WEIGHTS['degree'] * (matrix.degree >= required_degree)
+
+    # هم‌پوشانی بازه حقوق؛ در صورت نامشخص بودن یکی از طرفین، نیم امتیاز
+    low, high = salary_bounds(salary)
+    if np.isnan(low):
+        score += WEIGHTS['salary'] * 0.5
+    else:
+        overlap = (matrix.salary_low <= high) & (matrix.salary_high >= low)
+        score += WEIGHTS['salary'] * np.where(np.isnan(matrix.salary_low), 0.5, overlap).astype(np.float32)
+
+    # نوع همکاری
+    job_type_code = AD_JOB_TYPE_CODES.get(job_type)
+    if job_type_code is None:
+        score += WEIGHTS['job_type']
+    else:
+        score += WEIGHTS['job_type'] * (matrix.job_type == job_type_code)
+
+    # سابقه کار: با حداقل سابقه تعیین‌شده مقایسه می‌شود؛ در غیر این صورت سابقه بیشتر امتیاز بیشتری دارد
+    experience = matrix.experience.astype(np.float32)
+    if min_experience is None:
+        score += WEIGHTS['experience'] * np.clip(experience, 0, None) / 3.0
+    else:
+        score += WEIGHTS['experience'] * (experience >= min_experience)
+
+    # مهارت‌ها: نسبت مهارت‌های مورد نیاز که در رزومه وجود دارند
+    if len(skill_ids):
+        wanted = np.asarray(list(skill_ids), dtype=np.int32)
+        hits = np.isin(matrix.skill_ids, wanted)
+        counts = np.bincount(matrix.skill_rows[hits], minlength=n)[:n]
+        score += WEIGHTS['skills'] * np.minimum(counts / len(wanted), 1.0).astype(np.float32)
+
+    return score / sum(WEIGHTS.values())
+
+
+def top_k(scores, k):
+    """
+    شماره ردیف k امتیاز برتر به ترتیب نزولی؛ با argpartition (O(n)) به جای مرتب‌سازی کامل.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
+def match_candidates(job_advertisement, k=20, skill_ids=None, min_experience=None):
+    """
+    k رزومه برتر برای یک آگهی کارفرما؛ خروجی لیستی از (شناسه رزومه، شناسه کارجو، امتیاز).
+    در صورت عدم تعیین مهارت‌ها، مهارت‌های صنعت آگهی به عنوان مهارت‌های مطلوب در نظر گرفته می‌شوند.
+    """
+    matrix = get_resume_matrix()
+    if skill_ids is None:
+        skill_ids = job_advertisement.industry.skill_set.values_list('id', flat=True)
+    scores = score_resumes(
+        matrix,
+        industry_id=job_advertisement.industry_id,
+        city_id=job_advertisement.location_id,
+        province_id=job_advertisement.location.province_id,
+        degree=job_advertisement.degree,
+        salary=job_advertisement.salary,
+        job_type=job_advertisement.job_type,
+        skill_ids=list(skill_ids),
+        min_experience=min_experience,
+    )
+    rows = top_k(scores, k)
+    return [
+        (int(matrix.ids[row]), int(matrix.job_seeker_ids[row]), round(float(scores[row]), 4))
+        for row in rows
+    ]
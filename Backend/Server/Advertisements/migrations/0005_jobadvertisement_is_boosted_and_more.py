@@ -0,0 +1,35 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_is_boosted(apps, schema_editor):
+    JobAdvertisement = apps.get_model('Advertisements', 'JobAdvertisement')
+    JobAdvertisement.objects.filter(
+        advertisement__subscription__subscription_status='special'
+    ).update(is_boosted=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Advertisements', '0004_remove_jobadvertisement_subscription_and_more'),
+        ('Companies', '0003_remove_company_slug_alter_company_id'),
+        ('Industry', '0003_industry_category'),
+        ('Locations', '0002_remove_city_slug_remove_province_slug'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobadvertisement',
+            name='is_boosted',
+            field=models.BooleanField(default=False, verbose_name='آگهی ویژه'),
+        ),
+        migrations.AddIndex(
+            model_name='jobadvertisement',
+            index=models.Index(fields=['-is_boosted', '-created_at', '-id'], name='job_ad_feed_idx'),
+        ),
+        migrations.RunPython(backfill_is_boosted, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:31
+
+from django.db import migrations, models, transaction
+from django.db.utils import OperationalError
+
+
+TABLE = 'Advertisements_searchdocument'
+
+
+def create_fulltext_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX "{TABLE}_body_gin" ON "{TABLE}" '
+            f"USING GIN (to_tsvector('simple', body))"
+        )
+    elif connection.vendor == 'sqlite':
+        statements = [
+            f'CREATE VIRTUAL TABLE "{TABLE}_fts" USING fts5('
+            f"body, content='{TABLE}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+            f'CREATE TRIGGER "{TABLE}_ai" AFTER INSERT ON "{TABLE}" BEGIN '
+            f'INSERT INTO "{TABLE}_fts"(rowid, body) VALUES (new.id, new.body); END',
+            f'CREATE TRIGGER "{TABLE}_ad" AFTER DELETE ON "{TABLE}" BEGIN '
+            f'INSERT INTO "{TABLE}_fts"("{TABLE}_fts", rowid, body) VALUES (\'delete\', old.id, old.body); END',
+            f'CREATE TRIGGER "{TABLE}_au" AFTER UPDATE ON "{TABLE}" BEGIN '
+            f'INSERT INTO "{TABLE}_fts"("{TABLE}_fts", rowid, body) VALUES (\'delete\', old.id, old.body); '
+            f'INSERT INTO "{TABLE}_fts"(rowid, body) VALUES (new.id, new.body); END',
+        ]
+        try:
+            with transaction.atomic(using=connection.alias):
+                for statement in statements:
+                    schema_editor.execute(statement)
+        except OperationalError:
+            # SQLite بدون ماژول FTS5 کامپایل شده است؛ جستجو به حالت جایگزین (icontains) برمی‌گردد
+            pass
+
+
+def drop_fulltext_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{TABLE}_body_gin"')
+    elif connection.vendor == 'sqlite':
+        for trigger in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS "{TABLE}_{trigger}"')
+        schema_editor.execute(f'DROP TABLE IF EXISTS "{TABLE}_fts"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Advertisements', '0006_jobadvertisement_job_ad_facet_place_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('J', 'شغل'), ('R', 'رزومه')], max_length=1, verbose_name='نوع آگهی')),
+                ('object_id', models.UUIDField(verbose_name='شناسه آگهی')),
+                ('body', models.TextField(verbose_name='متن نرمال\u200cشده')),
+            ],
+            options={
+                'verbose_name': 'سند جستجو',
+                'verbose_name_plural': 'اسناد جستجو',
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_document')],
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
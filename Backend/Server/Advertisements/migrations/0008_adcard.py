@@ -0,0 +1,47 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Advertisements', '0007_searchdocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdCard',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False, verbose_name='شناسه آگهی')),
+                ('kind', models.CharField(choices=[('J', 'شغل'), ('R', 'رزومه')], max_length=1, verbose_name='نوع آگهی')),
+                ('advertisement_id', models.UUIDField(verbose_name='شناسه آگهی پایه')),
+                ('owner_id', models.BigIntegerField(verbose_name='شناسه مالک')),
+                ('title', models.CharField(max_length=255, verbose_name='عنوان آگهی')),
+                ('status', models.CharField(choices=[('P', 'در حال بررسی'), ('A', 'تایید شده'), ('R', 'رد شده')], max_length=2, verbose_name='وضعیت آگهی')),
+                ('gender', models.CharField(blank=True, max_length=2, null=True, verbose_name='جنسیت')),
+                ('soldier_status', models.CharField(blank=True, max_length=2, null=True, verbose_name='وضعیت سربازی')),
+                ('degree', models.CharField(blank=True, max_length=2, null=True, verbose_name='حداقل مدرک تحصیلی')),
+                ('salary', models.CharField(blank=True, max_length=30, null=True, verbose_name='محدوده حقوق')),
+                ('job_type', models.CharField(blank=True, max_length=2, null=True, verbose_name='نوع کار')),
+                ('company_id', models.UUIDField(blank=True, null=True, verbose_name='شناسه شرکت')),
+                ('company_name', models.CharField(blank=True, max_length=255, null=True, verbose_name='نام شرکت')),
+                ('company_logo', models.CharField(blank=True, max_length=255, null=True, verbose_name='لوگو')),
+                ('industry_id', models.BigIntegerField(verbose_name='شناسه صنعت')),
+                ('industry_name', models.CharField(max_length=100, verbose_name='نام صنعت')),
+                ('city_id', models.BigIntegerField(verbose_name='شناسه شهر')),
+                ('city_name', models.CharField(max_length=100, verbose_name='نام شهر')),
+                ('province_id', models.BigIntegerField(verbose_name='شناسه استان')),
+                ('province_name', models.CharField(max_length=100, verbose_name='نام استان')),
+                ('subscription_status', models.CharField(max_length=30, verbose_name='وضعیت اشتراک')),
+                ('is_boosted', models.BooleanField(default=False, verbose_name='آگهی ویژه')),
+                ('created_at', models.DateTimeField(verbose_name='تاریخ ایجاد')),
+                ('updated_at', models.DateTimeField(verbose_name='تاریخ بروزرسانی')),
+            ],
+            options={
+                'verbose_name': 'کارت آگهی',
+                'verbose_name_plural': 'کارت\u200cهای آگهی',
+                'indexes': [models.Index(fields=['kind', '-is_boosted', '-created_at', '-id'], name='ad_card_feed_idx'), models.Index(fields=['kind', 'status', 'industry_id', 'city_id'], name='ad_card_facet_place_idx'), models.Index(fields=['kind', 'status', 'job_type', 'degree', 'salary'], name='ad_card_facet_terms_idx'), models.Index(fields=['company_id'], name='ad_card_company_idx'), models.Index(fields=['advertisement_id'], name='ad_card_advertisement_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Advertisements', '0008_adcard'),
+        ('Resumes', '0003_alter_experience_location_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['advertisement', 'status', '-created_at', '-id'], name='application_inbox_idx'),
+        ),
+    ]
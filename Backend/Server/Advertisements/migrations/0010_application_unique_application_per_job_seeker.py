@@ -0,0 +1,36 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:43
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def delete_duplicate_applications(apps, schema_editor):
+    # پیش از افزودن قید یکتایی، تنها قدیمی‌ترین درخواست هر کارجو برای هر آگهی نگه داشته می‌شود
+    Application = apps.get_model('Advertisements', 'Application')
+    duplicates = Application.objects.values('job_seeker', 'advertisement').annotate(
+        count=Count('id')
+    ).filter(count__gt=1).order_by()
+    for row in duplicates:
+        rows = Application.objects.filter(
+            job_seeker=row['job_seeker'], advertisement=row['advertisement']
+        ).order_by('created_at', 'id')
+        keep = rows.values_list('id', flat=True).first()
+        rows.exclude(id=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Advertisements', '0009_application_application_inbox_idx'),
+        ('Resumes', '0003_alter_experience_location_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('job_seeker', 'advertisement'), name='unique_application_per_job_seeker'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:48
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_subscription_end_date(apps, schema_editor):
+    AdCard = apps.get_model('Advertisements', 'AdCard')
+    Advertisement = apps.get_model('Advertisements', 'Advertisement')
+    AdCard.objects.update(subscription_end_date=Subquery(
+        Advertisement.objects.filter(pk=OuterRef('advertisement_id')).values('subscription__end_date')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Advertisements', '0010_application_unique_application_per_job_seeker'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adcard',
+            name='subscription_end_date',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='تاریخ پایان اشتراک'),
+        ),
+        migrations.RunPython(backfill_subscription_end_date, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Advertisements', '0011_adcard_subscription_end_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobadvertisement',
+            name='views',
+            field=models.PositiveIntegerField(default=0, verbose_name='تعداد بازدید'),
+        ),
+        migrations.AddField(
+            model_name='resumeadvertisement',
+            name='views',
+            field=models.PositiveIntegerField(default=0, verbose_name='تعداد بازدید'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Advertisements', '0012_jobadvertisement_views_resumeadvertisement_views'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilaritySignature',
+            fields=[
+                ('job_advertisement', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='similarity_signature', serialize=False, to='Advertisements.jobadvertisement', verbose_name='آگهی کارفرما')),
+                ('signature', models.BinaryField(verbose_name='امضای MinHash')),
+            ],
+            options={
+                'verbose_name': 'امضای شباهت',
+                'verbose_name_plural': 'امضاهای شباهت',
+            },
+        ),
+        migrations.CreateModel(
+            name='SimilarityBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField(verbose_name='کلید سطل')),
+                ('job_advertisement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarity_buckets', to='Advertisements.jobadvertisement', verbose_name='آگهی کارفرما')),
+            ],
+            options={
+                'verbose_name': 'سطل شباهت',
+                'verbose_name_plural': 'سطل\u200cهای شباهت',
+                'indexes': [models.Index(fields=['key'], name='similarity_bucket_key_idx')],
+            },
+        ),
+    ]
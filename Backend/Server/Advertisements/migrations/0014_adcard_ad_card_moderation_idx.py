@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Advertisements', '0013_similaritysignature_similaritybucket'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='adcard',
+            index=models.Index(condition=models.Q(('status', 'P')), fields=['created_at', 'id'], name='ad_card_moderation_idx'),
+        ),
+    ]
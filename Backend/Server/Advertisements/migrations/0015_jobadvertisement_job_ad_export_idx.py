@@ -0,0 +1,22 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Advertisements', '0014_adcard_ad_card_moderation_idx'),
+        ('Companies', '0003_remove_company_slug_alter_company_id'),
+        ('Industry', '0003_industry_category'),
+        ('Locations', '0002_remove_city_slug_remove_province_slug'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobadvertisement',
+            index=models.Index(fields=['status', 'updated_at', 'id'], name='job_ad_export_idx'),
+        ),
+    ]
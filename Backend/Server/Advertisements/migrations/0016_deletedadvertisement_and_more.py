@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:01
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Advertisements', '0015_jobadvertisement_job_ad_export_idx'),
+        ('Companies', '0003_remove_company_slug_alter_company_id'),
+        ('Industry', '0003_industry_category'),
+        ('Locations', '0002_remove_city_slug_remove_province_slug'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedAdvertisement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('J', 'شغل'), ('R', 'رزومه')], max_length=1, verbose_name='نوع آگهی')),
+                ('object_id', models.UUIDField(verbose_name='شناسه آگهی')),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='تاریخ حذف')),
+            ],
+            options={
+                'verbose_name': 'آگهی حذف شده',
+                'verbose_name_plural': 'آگهی\u200cهای حذف شده',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='jobadvertisement',
+            index=models.Index(fields=['updated_at', 'id'], name='job_ad_changes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='deletedadvertisement',
+            index=models.Index(fields=['kind', 'deleted_at', 'id'], name='deleted_ad_changes_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Advertisements', '0016_deletedadvertisement_and_more'),
+        ('Industry', '0003_industry_category'),
+        ('Locations', '0002_remove_city_slug_remove_province_slug'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=100, verbose_name='عنوان جستجو')),
+                ('salary', models.CharField(blank=True, choices=[('5 to 10', '5 تا 10 میلیون تومان'), ('10 to 15', '10 تا 15 میلیون تومان'), ('15 to 20', '15 تا 20 میلیون تومان'), ('20 to 30', '20 تا 30 میلیون تومان'), ('30 to 50', '30 تا 50 میلیون تومان'), ('More than 50', 'بیش از 50 میلیون تومان'), ('Negotiable', 'توافقی')], max_length=30, null=True, verbose_name='محدوده حقوق')),
+                ('job_type', models.CharField(blank=True, choices=[('FT', 'تمام وقت'), ('PT', 'پاره وقت'), ('RE', 'دورکاری'), ('IN', 'کارآموزی')], max_length=2, null=True, verbose_name='نوع کار')),
+                ('degree', models.CharField(blank=True, choices=[('BD', 'زیر دیپلم'), ('DI', 'دیپلم'), ('AS', 'فوق دیپلم'), ('BA', 'لیسانس'), ('MA', 'فوق لیسانس'), ('DO', 'دکترا')], max_length=2, null=True, verbose_name='حداقل مدرک تحصیلی')),
+                ('keywords', models.CharField(blank=True, max_length=255, verbose_name='کلمات کلیدی')),
+                ('anchor', models.CharField(db_index=True, editable=False, max_length=260, verbose_name='کلید ایندکس')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاریخ ایجاد')),
+                ('city', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to='Locations.city', verbose_name='شهر')),
+                ('industry', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to='Industry.industry', verbose_name='صنعت')),
+                ('job_seeker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL, verbose_name='کارجو')),
+                ('province', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to='Locations.province', verbose_name='استان')),
+            ],
+            options={
+                'verbose_name': 'جستجوی ذخیره شده',
+                'verbose_name_plural': 'جستجوهای ذخیره شده',
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاریخ ایجاد')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='تاریخ ارسال')),
+                ('job_advertisement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_alerts', to='Advertisements.jobadvertisement', verbose_name='آگهی کارفرما')),
+                ('job_seeker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_alerts', to=settings.AUTH_USER_MODEL, verbose_name='کارجو')),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='Advertisements.savedsearch', verbose_name='جستجوی ذخیره شده')),
+            ],
+            options={
+                'verbose_name': 'هشدار جستجو',
+                'verbose_name_plural': 'هشدارهای جستجو',
+                'indexes': [models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['job_seeker', 'created_at'], name='search_alert_pending_idx')],
+                'constraints': [models.UniqueConstraint(fields=('saved_search', 'job_advertisement'), name='unique_search_alert')],
+            },
+        ),
+    ]
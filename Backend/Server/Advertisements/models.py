@@ -1,9 +1,10 @@
 from django.db import models  # ایمپورت مدل‌های Django جهت تعریف مدل‌های دیتابیس
+from django.utils import timezone                # زمان جاری جهت مقدار پیش‌فرض تاریخ حذف
 
 # ایمپورت مدل‌های مرتبط از اپ‌های دیگر
 from Companies.models import Company           # وارد کردن مدل Company از اپ Companies
 from Industry.models import Industry             # وارد کردن مدل Industry از اپ Industry
-from Locations.models import City                # وارد کردن مدل City از اپ Locations
+from Locations.models import City, Province      # وارد کردن مدل‌های City و Province از اپ Locations
 from Users.models import User                    # وارد کردن مدل User از اپ Users
 from Resumes.models import JobSeekerResume       # وارد کردن مدل JobSeekerResume از اپ Resumes
 from Subscriptions.models import AdvertisementSubscription  # وارد کردن مدل AdvertisementSubscription از اپ Subscriptions
@@ -179,12 +180,30 @@ class JobAdvertisement(models.Model):
         blank=True, null=True
     )
 
+    # کپی غیرنرمال از وضعیت اشتراک (special) جهت رتبه‌بندی فید بدون join به جدول اشتراک؛
+    # توسط سیگنال post_save مدل AdvertisementSubscription همگام نگه داشته می‌شود.
+    is_boosted = models.BooleanField(default=False, verbose_name="آگهی ویژه")
+
+    # تعداد بازدید؛ افزایش‌ها در کش جمع و به صورت دوره‌ای با UPDATE دسته‌ای ذخیره می‌شوند (Advertisements/counters.py)
+    views = models.PositiveIntegerField(default=0, verbose_name="تعداد بازدید")
+
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="تاریخ ایجاد")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="تاریخ بروزرسانی")
 
     class Meta:
         verbose_name = "آگهی کارفرما"
         verbose_name_plural = "آگهی‌های کارفرما"
+        indexes = [
+            # ایندکس ترکیبی پشتیبان صفحه‌بندی keyset فید آگهی‌ها
+            models.Index(fields=['-is_boosted', '-created_at', '-id'], name='job_ad_feed_idx'),
+            # ایندکس‌های ترکیبی پشتیبان فیلترها و شمارش وجه‌های جستجو
+            models.Index(fields=['status', 'industry', 'location'], name='job_ad_facet_place_idx'),
+            models.Index(fields=['status', 'job_type', 'degree', 'salary'], name='job_ad_facet_terms_idx'),
+            # خروجی تدریجی آگهی‌های تایید شده (?since=) به ترتیب زمان بروزرسانی
+            models.Index(fields=['status', 'updated_at', 'id'], name='job_ad_export_idx'),
+            # فید تغییرات (همگام‌سازی تدریجی) روی تمام آگهی‌ها با هر وضعیت
+            models.Index(fields=['updated_at', 'id'], name='job_ad_changes_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.company.name})"
@@ -290,6 +309,9 @@ class ResumeAdvertisement(models.Model):
         blank=True, null=True
     )
 
+    # تعداد بازدید؛ افزایش‌ها در کش جمع و به صورت دوره‌ای با UPDATE دسته‌ای ذخیره می‌شوند (Advertisements/counters.py)
+    views = models.PositiveIntegerField(default=0, verbose_name="تعداد بازدید")
+
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="تاریخ ایجاد")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="تاریخ بروزرسانی")
 
@@ -299,7 +321,7 @@ class ResumeAdvertisement(models.Model):
         verbose_name_plural = "آگهی‌های رزومه کارجو"
 
     def __str__(self):
-        return f"{self.title} ({self.job_seeker.username})"
+        return f"{self.title} ({self.job_seeker.full_name})"
 
 
 
@@ -345,17 +367,330 @@ class Application(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # صندوق درخواست‌های کارفرما: فیلتر آگهی و وضعیت و صفحه‌بندی keyset بر اساس تاریخ
+            models.Index(fields=['advertisement', 'status', '-created_at', '-id'], name='application_inbox_idx'),
+        ]
+        constraints = [
+            # هر کارجو تنها یک بار می‌تواند برای هر آگهی درخواست ارسال کند
+            models.UniqueConstraint(fields=['job_seeker', 'advertisement'], name='unique_application_per_job_seeker'),
+        ]
     
     def __str__(self):
-        return f"{self.job_seeker.username} -> {self.advertisement.title}"
+        return f"{self.job_seeker.full_name} -> {self.advertisement.title}"
     
     def mark_as_viewed(self):
         """
         علامت‌گذاری درخواست به عنوان مشاهده شده توسط کارفرما.
         این متد، فیلد viewed_by_employer را به True تغییر می‌دهد و تغییرات را ذخیره می‌کند.
+        برای علامت‌گذاری گروهی از endpoint دسته‌ای (ApplicationBulkUpdateSerializer) استفاده شود.
         """
         self.viewed_by_employer = True
-        self.save() 
+        # تنها ستون‌های تغییر یافته ذخیره می‌شوند
+        self.save(update_fields=['viewed_by_employer', 'updated_at'])
     
     def get_status_display_verbose(self):
         return self.get_status_display()
+
+
+
+class DeletedAdvertisement(models.Model):
+    """
+    لاگ حذف آگهی‌ها؛ فید تغییرات برای آگهی‌های حذف شده (که دیگر ردیفی ندارند) از این جدول
+    tombstone برمی‌گرداند. ردیف‌ها توسط سیگنال post_delete ثبت می‌شوند.
+    """
+    kind = models.CharField(
+        max_length=1,
+        choices=Advertisement.TypeChoices.choices,
+        verbose_name="نوع آگهی"
+    )
+
+    # شناسه آگهی کارفرما یا آگهی رزومه حذف شده
+    object_id = models.UUIDField(verbose_name="شناسه آگهی")
+
+    deleted_at = models.DateTimeField(default=timezone.now, verbose_name="تاریخ حذف")
+
+    class Meta:
+        verbose_name = "آگهی حذف شده"
+        verbose_name_plural = "آگهی‌های حذف شده"
+        indexes = [
+            models.Index(fields=['kind', 'deleted_at', 'id'], name='deleted_ad_changes_idx'),
+        ]
+
+
+
+class SearchDocument(models.Model):
+    """
+    متن نرمال‌شده (فارسی) عنوان و توضیحات آگهی‌ها جهت جستجوی متن کامل.
+    در SQLite یک جدول مجازی FTS5 و در Postgres یک ایندکس GIN روی tsvector همین جدول ساخته می‌شود.
+    """
+    kind = models.CharField(
+        max_length=1,
+        choices=Advertisement.TypeChoices.choices,
+        verbose_name="نوع آگهی"
+    )
+
+    # شناسه آگهی کارفرما یا آگهی رزومه
+    object_id = models.UUIDField(verbose_name="شناسه آگهی")
+
+    body = models.TextField(verbose_name="متن نرمال‌شده")
+
+    class Meta:
+        verbose_name = "سند جستجو"
+        verbose_name_plural = "اسناد جستجو"
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
+
+
+
+class AdCard(models.Model):
+    """
+    مدل خواندنی غیرنرمال (read model) «کارت آگهی».
+    اطلاعات آگهی به همراه شرکت، صنعت، شهر، استان و اشتراک در یک ردیف تخت ذخیره می‌شود
+    تا لیست و جستجوی آگهی‌ها بدون join از یک جدول خوانده شوند.
+    این جدول از طریق سیگنال‌های ذخیره و حذف به‌روز نگه داشته می‌شود (Advertisements/cards.py)
+    و با دستور rebuild_ad_cards قابل بازسازی است.
+    """
+
+    # شناسه کارت برابر با شناسه آگهی کارفرما یا آگهی رزومه است
+    id = models.UUIDField(primary_key=True, verbose_name="شناسه آگهی")
+
+    kind = models.CharField(max_length=1, choices=Advertisement.TypeChoices.choices, verbose_name="نوع آگهی")
+
+    advertisement_id = models.UUIDField(verbose_name="شناسه آگهی پایه")
+
+    # مالک آگهی (کارفرما یا کارجو)
+    owner_id = models.BigIntegerField(verbose_name="شناسه مالک")
+
+    title = models.CharField(max_length=255, verbose_name="عنوان آگهی")
+    status = models.CharField(max_length=2, choices=StatusChoices.choices, verbose_name="وضعیت آگهی")
+    gender = models.CharField(max_length=2, blank=True, null=True, verbose_name="جنسیت")
+    soldier_status = models.CharField(max_length=2, blank=True, null=True, verbose_name="وضعیت سربازی")
+    degree = models.CharField(max_length=2, blank=True, null=True, verbose_name="حداقل مدرک تحصیلی")
+    salary = models.CharField(max_length=30, blank=True, null=True, verbose_name="محدوده حقوق")
+    job_type = models.CharField(max_length=2, blank=True, null=True, verbose_name="نوع کار")
+
+    # اطلاعات شرکت (فقط برای آگهی‌های کارفرما)
+    company_id = models.UUIDField(blank=True, null=True, verbose_name="شناسه شرکت")
+    company_name = models.CharField(max_length=255, blank=True, null=True, verbose_name="نام شرکت")
+    company_logo = models.CharField(max_length=255, blank=True, null=True, verbose_name="لوگو")
+
+    industry_id = models.BigIntegerField(verbose_name="شناسه صنعت")
+    industry_name = models.CharField(max_length=100, verbose_name="نام صنعت")
+
+    city_id = models.BigIntegerField(verbose_name="شناسه شهر")
+    city_name = models.CharField(max_length=100, verbose_name="نام شهر")
+    province_id = models.BigIntegerField(verbose_name="شناسه استان")
+    province_name = models.CharField(max_length=100, verbose_name="نام استان")
+
+    # اطلاعات اشتراک
+    subscription_status = models.CharField(max_length=30, verbose_name="وضعیت اشتراک")
+    is_boosted = models.BooleanField(default=False, verbose_name="آگهی ویژه")
+    subscription_end_date = models.DateTimeField(blank=True, null=True, verbose_name="تاریخ پایان اشتراک")
+
+    created_at = models.DateTimeField(verbose_name="تاریخ ایجاد")
+    updated_at = models.DateTimeField(verbose_name="تاریخ بروزرسانی")
+
+    class Meta:
+        verbose_name = "کارت آگهی"
+        verbose_name_plural = "کارت‌های آگهی"
+        indexes = [
+            # صفحه‌بندی keyset فید هر نوع آگهی
+            models.Index(fields=['kind', '-is_boosted', '-created_at', '-id'], name='ad_card_feed_idx'),
+            # فیلترها و شمارش وجه‌های جستجو
+            models.Index(fields=['kind', 'status', 'industry_id', 'city_id'], name='ad_card_facet_place_idx'),
+            models.Index(fields=['kind', 'status', 'job_type', 'degree', 'salary'], name='ad_card_facet_terms_idx'),
+            models.Index(fields=['company_id'], name='ad_card_company_idx'),
+            models.Index(fields=['advertisement_id'], name='ad_card_advertisement_idx'),
+            # صف بررسی آگهی‌ها (قدیمی‌ترین ابتدا)؛ ایندکس جزئی تنها شامل آگهی‌های در حال بررسی است
+            models.Index(
+                fields=['created_at', 'id'],
+                condition=models.Q(status=StatusChoices.PENDING),
+                name='ad_card_moderation_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+
+class SimilaritySignature(models.Model):
+    """
+    امضای MinHash متن نرمال‌شده عنوان و توضیحات آگهی کارفرما جهت یافتن «آگهی‌های مشابه».
+    امضا به صورت آرایه uint32 در یک ستون باینری ذخیره می‌شود (Advertisements/similarity.py).
+    """
+    job_advertisement = models.OneToOneField(
+        JobAdvertisement,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='similarity_signature',
+        verbose_name="آگهی کارفرما"
+    )
+
+    signature = models.BinaryField(verbose_name="امضای MinHash")
+
+    class Meta:
+        verbose_name = "امضای شباهت"
+        verbose_name_plural = "امضاهای شباهت"
+
+
+
+class SimilarityBucket(models.Model):
+    """
+    ایندکس LSH: هر آگهی به ازای هر باند امضای خود در یک سطل (bucket) قرار می‌گیرد.
+    آگهی‌هایی که حداقل در یک سطل مشترک هستند نامزد شباهت‌اند؛ جستجو تنها روی ایندکس key انجام می‌شود.
+    """
+    job_advertisement = models.ForeignKey(
+        JobAdvertisement,
+        on_delete=models.CASCADE,
+        related_name='similarity_buckets',
+        verbose_name="آگهی کارفرما"
+    )
+
+    # هش شماره باند به همراه مقادیر همان باند
+    key = models.BigIntegerField(verbose_name="کلید سطل")
+
+    class Meta:
+        verbose_name = "سطل شباهت"
+        verbose_name_plural = "سطل‌های شباهت"
+        indexes = [
+            models.Index(fields=['key'], name='similarity_bucket_key_idx'),
+        ]
+
+
+
+class SavedSearch(models.Model):
+    """
+    جستجوی ذخیره شده کارجو؛ با تایید آگهی کارفرمای منطبق، هشدار در صف ارسال قرار می‌گیرد.
+    تمام شرط‌ها با AND ترکیب می‌شوند و شرط خالی یعنی «هر مقدار».
+
+    ستون anchor کلید ایندکس معکوس (Advertisements/alerts.py) است: گزینشی‌ترین شرط جستجو
+    (مثلاً «city:12» یا «kw:پایتون»). هر آگهی منطبق حتماً این کلید را دارد، پس برای آگهی جدید
+    تنها جستجوهایی که anchor آن‌ها در کلیدهای آگهی است بررسی می‌شوند.
+    """
+    job_seeker = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="saved_searches",
+        verbose_name="کارجو"
+    )
+
+    name = models.CharField(max_length=100, blank=True, verbose_name="عنوان جستجو")
+
+    industry = models.ForeignKey(
+        Industry,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="saved_searches",
+        verbose_name="صنعت"
+    )
+
+    city = models.ForeignKey(
+        City,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="saved_searches",
+        verbose_name="شهر"
+    )
+
+    province = models.ForeignKey(
+        Province,
+        on_delete=models.CASCADE,
+        blank=True,
+        null=True,
+        related_name="saved_searches",
+        verbose_name="استان"
+    )
+
+    salary = models.CharField(
+        max_length=30,
+        choices=SalaryChoices.choices,
+        blank=True,
+        null=True,
+        verbose_name="محدوده حقوق"
+    )
+
+    job_type = models.CharField(
+        max_length=2,
+        choices=JobTypeChoices.choices,
+        blank=True,
+        null=True,
+        verbose_name="نوع کار"
+    )
+
+    degree = models.CharField(
+        max_length=2,
+        choices=DegreeChoices.choices,
+        blank=True,
+        null=True,
+        verbose_name="حداقل مدرک تحصیلی"
+    )
+
+    # کلمات کلیدی؛ تمام کلمات باید در عنوان یا توضیحات آگهی باشند
+    keywords = models.CharField(max_length=255, blank=True, verbose_name="کلمات کلیدی")
+
+    # کلید ایندکس معکوس؛ هنگام ذخیره توسط سیگنال pre_save محاسبه می‌شود
+    anchor = models.CharField(max_length=260, editable=False, db_index=True, verbose_name="کلید ایندکس")
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="تاریخ ایجاد")
+
+    class Meta:
+        verbose_name = "جستجوی ذخیره شده"
+        verbose_name_plural = "جستجوهای ذخیره شده"
+
+    def __str__(self):
+        return self.name or f"جستجوی {self.pk}"
+
+
+
+class SearchAlert(models.Model):
+    """
+    صف هشدارهای جستجوی ذخیره شده: هر ردیف یک آگهی منطبق با یک جستجو است.
+    ردیف‌های ارسال نشده (sent_at خالی) توسط دستور send_search_alerts به صورت یک پیام
+    برای هر کارجو ارسال می‌شوند. محدودیت یکتایی از هشدار تکراری (مثلاً پس از ویرایش آگهی) جلوگیری می‌کند.
+    """
+    saved_search = models.ForeignKey(
+        SavedSearch,
+        on_delete=models.CASCADE,
+        related_name="alerts",
+        verbose_name="جستجوی ذخیره شده"
+    )
+
+    job_advertisement = models.ForeignKey(
+        JobAdvertisement,
+        on_delete=models.CASCADE,
+        related_name="search_alerts",
+        verbose_name="آگهی کارفرما"
+    )
+
+    # کارجو (غیرنرمال) جهت گروه‌بندی صف بر اساس گیرنده بدون join
+    job_seeker = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="search_alerts",
+        verbose_name="کارجو"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="تاریخ ایجاد")
+    sent_at = models.DateTimeField(blank=True, null=True, verbose_name="تاریخ ارسال")
+
+    class Meta:
+        verbose_name = "هشدار جستجو"
+        verbose_name_plural = "هشدارهای جستجو"
+        constraints = [
+            models.UniqueConstraint(fields=['saved_search', 'job_advertisement'], name='unique_search_alert'),
+        ]
+        indexes = [
+            # صف ارسال؛ ایندکس جزئی تنها شامل هشدارهای ارسال نشده است
+            models.Index(
+                fields=['job_seeker', 'created_at'],
+                condition=models.Q(sent_at__isnull=True),
+                name='search_alert_pending_idx',
+            ),
+        ]
@@ -0,0 +1,122 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+
+
+class KeysetPagination(BasePagination):
+    """
+    صفحه‌بندی مبتنی بر کلید (keyset / seek).
+    به جای OFFSET، مقدار کلیدهای مرتب‌سازی آخرین ردیف صفحه در یک cursor مات (opaque)
+    قرار می‌گیرد و صفحه بعد با یک شرط WHERE روی همان کلیدها واکشی می‌شود؛
+    بنابراین هزینه صفحات عمیق با صفحه اول برابر است (به شرط وجود ایندکس ترکیبی روی ordering).
+
+    ordering باید به یک فیلد یکتا (معمولاً id) ختم شود تا ترتیب پایدار باشد.
+    """
+    ordering = ('-created_at', '-id')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+        self.next_cursor = None
+        self.page_size = None
+
+    # -------------------------------
+    # اندازه صفحه
+    # -------------------------------
+    def get_page_size(self, request):
+        default_size = getattr(settings, 'ADS_PAGE_SIZE', 20)
+        max_size = getattr(settings, 'ADS_MAX_PAGE_SIZE', 100)
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, default_size))
+        except (TypeError, ValueError):
+            size = default_size
+        # محدود کردن اندازه صفحه به بازه [1, max_size]
+        return max(1, min(size, max_size))
+
+    # -------------------------------
+    # کدگذاری و کدگشایی cursor
+    # -------------------------------
+    def encode_cursor(self, instance):
+        values = []
+        for field_name in self._field_names():
+            value = getattr(instance, field_name)
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            elif value is not None and not isinstance(value, (bool, int, float, str)):
+                value = str(value)  # مانند UUID
+            values.append(value)
+        raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, queryset, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            field_names = self._field_names()
+            if not isinstance(values, list) or len(values) != len(field_names):
+                raise ValueError
+            opts = queryset.model._meta
+            # تبدیل مقادیر خام به نوع پایتونی فیلد (datetime، UUID، bool و ...)
+            return [
+                opts.get_field(name).to_python(value)
+                for name, value in zip(field_names, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    # -------------------------------
+    # ساخت شرط keyset
+    # -------------------------------
+    def _field_names(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def build_seek_filter(self, values):
+        """
+        شرط (k1, k2, ..., kn) "بعد از" cursor را به صورت OR از AND ها می‌سازد:
+        k1 > v1 OR (k1 = v1 AND k2 > v2) OR ...
+        جهت مقایسه (lt/gt) برای هر فیلد بر اساس صعودی/نزولی بودن آن تعیین می‌شود.
+        """
+        condition = Q()
+        equal_prefix = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal_prefix & Q(**{f'{name}__{lookup}': value})
+            equal_prefix &= Q(**{name: value})
+        return condition
+
+    # -------------------------------
+    # رابط BasePagination
+    # -------------------------------
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.build_seek_filter(self.decode_cursor(queryset, cursor)))
+
+        # یک ردیف اضافه واکشی می‌شود تا وجود صفحه بعد بدون COUNT مشخص شود
+        rows = list(queryset[:self.page_size + 1])
+        has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.next_cursor = self.encode_cursor(rows[-1]) if has_next and rows else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.next_cursor,
+            'page_size': self.page_size,
+            'results': data,
+        })
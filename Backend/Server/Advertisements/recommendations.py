@@ -0,0 +1,171 @@
+import numpy as np
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Q
+
+from Resumes.models import JobSeekerResume
+from .models import Advertisement, AdCard, JobTypeChoices, StatusChoices
+from . import cards, matching
+
+
+
+
+# -------------------------------
+# کش لیست پیشنهادها
+# -------------------------------
+# وزن هر معیار در رتبه‌بندی آگهی‌ها برای یک رزومه
+WEIGHTS = {
+    'industry': 3.0,
+    'location': 2.0,
+    'degree': 1.5,
+    'salary': 1.0,
+    'job_type': 1.0,
+}
+
+# تعداد کلیدهای حذف شده در هر فراخوانی delete_many
+INVALIDATION_BATCH_SIZE = 1000
+
+
+def get_cache():
+    # کش اختصاصی با TTL و حذف LRU (تنظیمات CACHES['recommendations'])
+    return caches['recommendations']
+
+
+def cache_key(user_id):
+    return f'recommendations:{user_id}'
+
+
+def invalidate_user(user_id):
+    get_cache().delete(cache_key(user_id))
+
+
+def invalidate_for_ads(job_advertisements):
+    """
+    حذف لیست پیشنهاد کارجویانی که صنعت یا شهر رزومه‌شان با یکی از آگهی‌ها یکسان است.
+    """
+    industries = {ad.industry_id for ad in job_advertisements if ad.industry_id}
+    cities = {ad.location_id for ad in job_advertisements if ad.location_id}
+    if not industries and not cities:
+        return
+    user_ids = JobSeekerResume.objects.filter(
+        Q(industry_id__in=industries) | Q(location_id__in=cities)
+    ).values_list('job_seeker_id', flat=True)
+
+    cache = get_cache()
+    keys = []
+    for user_id in user_ids.iterator(chunk_size=INVALIDATION_BATCH_SIZE):
+        keys.append(cache_key(user_id))
+        if len(keys) >= INVALIDATION_BATCH_SIZE:
+            cache.delete_many(keys)
+            keys = []
+    if keys:
+        cache.delete_many(keys)
+
+
+# -------------------------------
+# رتبه‌بندی آگهی‌ها
+# -------------------------------
+def score_advertisements(resume, rows, skill_industries=(), experience_cities=()):
+    """
+    امتیاز تمام آگهی‌های تایید شده نسبت به یک رزومه به صورت برداری.
+    rows لیستی از (id, industry_id, city_id, province_id, degree, salary, job_type) کارت‌های آگهی است.
+    """
+    n = len(rows)
+    if not n:
+        return np.zeros(0, dtype=np.float32)
+    _, industry, city, province, degree, salary, job_type = zip(*rows)
+    industry = np.asarray([matching.MISSING if value is None else value for value in industry])
+    city = np.asarray([matching.MISSING if value is None else value for value in city])
+    province = np.asarray([matching.MISSING if value is None else value for value in province])
+    degree = np.asarray([matching.AD_DEGREE_ORDER.get(value, matching.MISSING) for value in degree])
+    bounds = np.asarray([matching.salary_bounds(value) for value in salary], dtype=np.float32)
+    job_type_codes = np.asarray([matching.AD_JOB_TYPE_CODES.get(value, matching.MISSING) for value in job_type])
+
+    score = np.zeros(n, dtype=np.float32)
+
+    # صنعت رزومه امتیاز کامل، صنعت مهارت‌های کارجو نیم امتیاز
+    industry_score = np.where(np.isin(industry, list(skill_industries)), 0.5, 0.0)
+    industry_score = np.where(industry == (resume.industry_id or matching.MISSING), 1.0, industry_score)
+    score += WEIGHTS['industry'] * industry_score
+
+    # شهر رزومه امتیاز کامل، شهرهای سوابق کاری و استان رزومه امتیاز کمتر؛ دورکاری امتیاز کامل
+    province_id = resume.location.province_id if resume.location_id else matching.MISSING
+    location_score = np.where(province == province_id, 0.5, 0.0)
+    location_score = np.where(np.isin(city, list(experience_cities)), 0.75, location_score)
+    location_score = np.where(city == (resume.location_id or matching.MISSING), 1.0, location_score)
+    remote = job_type_codes == matching.AD_JOB_TYPE_CODES[JobTypeChoices.REMOTE]
+    score += WEIGHTS['location'] * np.where(remote, 1.0, location_score)
+
+    # مدرک رزومه باید حداقل برابر مدرک مورد نیاز آگهی باشد
+    resume_degree = matching.RESUME_DEGREE_ORDER.get(resume.degree, matching.MISSING)
+    score += WEIGHTS['degree'] * ((degree == matching.MISSING) | (degree <= resume_degree))
+
+    # هم‌پوشانی بازه حقوق؛ در صورت نامشخص بودن یکی از طرفین، نیم امتیاز
+    low, high = matching.salary_bounds(resume.expected_salary)
+    if np.isnan(low):
+        score += WEIGHTS['salary'] * 0.5
+    else:
+        overlap = (bounds[:, 0] <= high) & (bounds[:, 1] >= low)
+        score += WEIGHTS['salary'] * np.where(np.isnan(bounds[:, 0]), 0.5, overlap)
+
+    # نوع همکاری مورد نظر کارجو
+    preferred = matching.RESUME_JOB_TYPE_CODES.get(resume.preferred_job_type)
+    if preferred is None:
+        score += WEIGHTS['job_type'] * 0.5
+    else:
+        score += WEIGHTS['job_type'] * np.where(
+            job_type_codes == matching.MISSING, 0.5, job_type_codes == preferred
+        )
+
+    return score / sum(WEIGHTS.values())
+
+
+def rank_advertisements(resume, size):
+    """
+    size آگهی برتر تایید شده برای رزومه؛ خروجی لیستی از (شناسه کارت، امتیاز).
+    آگهی‌ها از جدول تخت AdCard خوانده می‌شوند و در امتیاز برابر، جدیدترها مقدم هستند.
+    """
+    rows = list(
+        cards.active(AdCard.objects.filter(
+            kind=Advertisement.TypeChoices.JOB,
+            status=StatusChoices.APPROVED,
+        )).order_by('-created_at', '-id').values_list(
+            'id', 'industry_id', 'city_id', 'province_id', 'degree', 'salary', 'job_type',
+        )
+    )
+    skill_industries = resume.Job_Seeker_Skills.filter(
+        skill__isnull=False
+    ).values_list('skill__industry_id', flat=True).distinct()
+    experience_cities = resume.Experiences.filter(
+        location__isnull=False
+    ).values_list('location_id', flat=True).distinct()
+
+    scores = score_advertisements(resume, rows, set(skill_industries), set(experience_cities))
+    order = np.argsort(-scores, kind='stable')[:size]
+    return [(rows[index][0], round(float(scores[index]), 4)) for index in order]
+
+
+def get_recommendations(user):
+    """
+    لیست پیشنهادهای کاربر از کش خوانده می‌شود؛ در صورت عدم وجود، رتبه‌بندی کامل انجام و ذخیره می‌شود.
+    """
+    # ایمپورت داخلی جهت جلوگیری از وابستگی چرخشی (serializers از این ماژول استفاده می‌کند)
+    from .serializers import AdCardSerializer
+
+    cache = get_cache()
+    key = cache_key(user.pk)
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    resume = JobSeekerResume.objects.select_related('location').get(job_seeker=user)
+    ranked = rank_advertisements(resume, getattr(settings, 'RECOMMENDATIONS_SIZE', 50))
+    ranked_cards = AdCard.objects.in_bulk([pk for pk, _ in ranked])
+    data = []
+    for pk, score in ranked:
+        item = dict(AdCardSerializer(ranked_cards[pk]).data)
+        item['score'] = score
+        data.append(item)
+    cache.set(key, data)
+    return data
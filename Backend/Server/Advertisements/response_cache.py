@@ -0,0 +1,97 @@
+import functools
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from rest_framework import status
+from rest_framework.response import Response
+
+
+
+
+# -------------------------------
+# کش پاسخ لیست‌های عمومی آگهی‌ها
+# -------------------------------
+# خانواده‌های کلید: هر خانواده یک شمارنده نسل (generation) دارد
+JOB = 'job'
+RESUME = 'resume'
+
+
+def generation_key(family):
+    return f'ads:generation:{family}'
+
+
+def get_generation(family):
+    key = generation_key(family)
+    generation = cache.get(key)
+    if generation is None:
+        # شمارنده بدون انقضا؛ add در صورت ثبت همزمان توسط پروسه دیگر اثری ندارد
+        cache.add(key, 1, None)
+        generation = cache.get(key, 1)
+    return generation
+
+
+def _bump(families):
+    for family in families:
+        key = generation_key(family)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 1, None)
+            cache.incr(key)
+
+
+def bump(*families):
+    """
+    باطل کردن تمام پاسخ‌های کش شده یک یا چند خانواده با افزایش شمارنده نسل؛
+    کلیدهای قدیمی دیگر خوانده نمی‌شوند و با TTL منقضی می‌شوند (سایر خانواده‌ها دست نمی‌خورند).
+    شمارنده یک بار فوراً و یک بار پس از commit تراکنش افزایش می‌یابد تا پاسخی که خواننده‌ای همزمان
+    پیش از commit از داده‌های قدیمی ساخته و کش کرده است نیز کنار گذاشته شود.
+    """
+    _bump(families)
+    transaction.on_commit(lambda: _bump(families))
+
+
+def normalize_params(params):
+    """
+    نرمال‌سازی پارامترهای کوئری: ترتیب پارامترها و مقادیر چندگانه (تکرار یا جدا شده با کاما) اهمیتی ندارد.
+    """
+    normalized = []
+    for name in sorted(params.keys()):
+        values = []
+        for raw in params.getlist(name):
+            values.extend(value.strip() for value in raw.split(',') if value.strip())
+        if values:
+            normalized.append(f"{name}={','.join(sorted(set(values)))}")
+    return '&'.join(normalized)
+
+
+def response_key(family, view_name, params):
+    digest = hashlib.sha1(normalize_params(params).encode('utf-8')).hexdigest()
+    return f'ads:response:{family}:{get_generation(family)}:{view_name}:{digest}'
+
+
+def cached_response(family):
+    """
+    دکوریتور اکشن‌های لیست: پاسخ 200 با کلید (خانواده، نسل، نام اکشن، پارامترهای نرمال‌شده) ذخیره می‌شود.
+    خروجی این اکشن‌ها به کاربر وابسته نیست، بنابراین کش بین همه درخواست‌ها مشترک است.
+    """
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            key = response_key(family, view_method.__name__, request.query_params)
+            data = cache.get(key)
+            if data is not None:
+                response = Response(data, status=status.HTTP_200_OK)
+                response['X-Cache'] = 'HIT'
+                return response
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, getattr(settings, 'ADS_RESPONSE_CACHE_TTL', 60))
+                response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -3,7 +3,9 @@ from django.urls import path, include               # وارد کردن تواب
 from Advertisements.views import (
     JobAdvertisementViewSet,
     ResumeAdvertisementViewSet,
-    ApplicationViewSet
+    ApplicationViewSet,
+    ModerationViewSet,
+    SavedSearchViewSet
 )  # ایمپورت ویوست‌های مربوط به آگهی‌ها از ماژول views اپلیکیشن آگهی‌ها
 
 
@@ -20,6 +22,20 @@ class JobAdvertisementRouter(routers.DefaultRouter):
             path('', include([
                 # مسیر خالی: تعریف متد get (لیست) برای آگهی‌های کارفرما
                 path('', JobAdvertisementViewSet.as_view({'get': 'list', 'post': 'create'})),
+                # مسیر جستجوی چندوجهی آگهی‌های کارفرما به همراه شمارش وجه‌ها
+                path('search/', JobAdvertisementViewSet.as_view({'get': 'search'})),
+                # مسیر ایجاد دسته‌ای آگهی‌های کارفرما
+                path('batch/', JobAdvertisementViewSet.as_view({'post': 'batch_create'})),
+                # مسیر خروجی NDJSON آگهی‌های تایید شده (?since= جهت دریافت تدریجی، ?gzip=1)
+                path('export/', JobAdvertisementViewSet.as_view({'get': 'export'})),
+                # مسیر فید تغییرات جهت همگام‌سازی تدریجی (?since=<token>)
+                path('changes/', JobAdvertisementViewSet.as_view({'get': 'changes'})),
+                # مسیر آگهی‌های پیشنهادی شخصی‌سازی شده برای کارجو
+                path('recommended/', JobAdvertisementViewSet.as_view({'get': 'recommended'})),
+                # مسیر رزومه‌های متناسب با آگهی (تطبیق کارجو با آگهی) جهت کارفرما
+                path('<uuid:pk>/candidates/', JobAdvertisementViewSet.as_view({'get': 'candidates'})),
+                # مسیر آگهی‌های مشابه (MinHash / LSH روی عنوان و توضیحات)
+                path('<uuid:pk>/similar/', JobAdvertisementViewSet.as_view({'get': 'similar'})),
                 # مسیر شامل پارامتر uuid: برای دریافت (GET) یک آگهی کارفرما و ایجاد (POST) آگهی
                 path('<uuid:pk>/', JobAdvertisementViewSet.as_view({'get': 'retrieve', 'put': 'update', 'delete': 'destroy'})),
             ])),
@@ -39,6 +55,8 @@ class ResumeAdvertisementRouter(routers.DefaultRouter):
             path('', include([
                 # مسیر خالی: متدهای get (لیست کردن) و post (ایجاد) برای آگهی‌های رزومه کارجو
                 path('', ResumeAdvertisementViewSet.as_view({'get': 'list', 'post': 'create'})),
+                # مسیر جستجوی متن کامل آگهی‌های رزومه کارجو
+                path('search/', ResumeAdvertisementViewSet.as_view({'get': 'search'})),
                 # مسیر شامل یک پارامتر pk جهت دریافت آگهی رزومه کارجو بر اساس pk آگهی
                 path('<uuid:pk>/', ResumeAdvertisementViewSet.as_view({'get': 'retrieve', 'delete': 'destroy', 'put': 'update'})),
             ])),
@@ -57,6 +75,10 @@ class ApplicationRouter(routers.DefaultRouter):
             path('', include([
                 # مسیر خالی: متد get (لیست کردن) و post (ایجاد) برای درخواست‌ها
                 path('', ApplicationViewSet.as_view({'get': 'list', 'post': 'create'})),
+                # صندوق درخواست‌های کارفرما
+                path('inbox/', ApplicationViewSet.as_view({'get': 'inbox'})),
+                # تغییر وضعیت / علامت‌گذاری مشاهده دسته‌ای درخواست‌ها
+                path('bulk/', ApplicationViewSet.as_view({'post': 'bulk_update'})),
                 # مسیر شامل یک پارامتر pk از نوع uuid جهت مدیریت عملیات retrieve، update و delete
                 path('<uuid:pk>/', include([
                     path('', ApplicationViewSet.as_view({'get': 'retrieve', 'put': 'update', 'delete': 'destroy'})),
@@ -64,3 +86,38 @@ class ApplicationRouter(routers.DefaultRouter):
             ])),
         ]
         return custom_urls
+
+
+
+class ModerationRouter(routers.DefaultRouter):
+    def __init__(self):
+        super().__init__()
+        # ثبت ModerationViewSet با prefix خالی و تعیین basename 'moderation'
+        self.register(r'', ModerationViewSet, basename='moderation')
+
+    def get_urls(self):
+        custom_urls = [
+            path('', include([
+                # صف آگهی‌های در حال بررسی (get) و تایید/رد دسته‌ای (post)
+                path('', ModerationViewSet.as_view({'get': 'queue', 'post': 'decide'})),
+            ])),
+        ]
+        return custom_urls
+
+
+
+class SavedSearchRouter(routers.DefaultRouter):
+    def __init__(self):
+        super().__init__()
+        # ثبت SavedSearchViewSet با prefix خالی و تعیین basename 'saved_searches'
+        self.register(r'', SavedSearchViewSet, basename='saved_searches')
+
+    def get_urls(self):
+        custom_urls = [
+            path('', include([
+                # لیست (get) و ایجاد (post) جستجوهای ذخیره شده کارجو
+                path('', SavedSearchViewSet.as_view({'get': 'list', 'post': 'create'})),
+                path('<int:pk>/', SavedSearchViewSet.as_view({'patch': 'update', 'delete': 'destroy'})),
+            ])),
+        ]
+        return custom_urls
@@ -0,0 +1,138 @@
+from collections import defaultdict
+
+from django.db.models import Count
+
+from rest_framework.exceptions import ValidationError
+
+from Locations import province_map
+
+from . import fulltext
+from .models import Advertisement
+
+
+
+
+class JobAdvertisementSearch:
+    """
+    جستجوی چندوجهی (faceted) روی کارت‌های آگهی کارفرما (AdCard).
+
+    هر وجه (facet) یک پارامتر کوئری است که به یک فیلد مدل نگاشت می‌شود؛
+    مقادیر چندگانه با کاما جدا می‌شوند (مثلاً ?job_type=FT,PT).
+    شمارش وجه‌ها با یک کوئری GROUP BY روی تمام ابعاد محاسبه و سپس در پایتون جمع‌بندی می‌شود،
+    به جای یک COUNT جداگانه برای هر مقدار هر وجه.
+    """
+
+    # نگاشت پارامتر کوئری -> مسیر فیلد در ORM
+    FACETS = {
+        'industry': 'industry_id',
+        'city': 'city_id',
+        'province': 'province_id',
+        'salary': 'salary',
+        'degree': 'degree',
+        'gender': 'gender',
+        'soldier_status': 'soldier_status',
+        'job_type': 'job_type',
+        'status': 'status',
+    }
+
+    # وجه‌هایی که مقدارشان شناسه عددی است
+    INTEGER_FACETS = ('industry', 'city', 'province')
+
+    # نوع آگهی جهت جستجوی متن کامل
+    kind = Advertisement.TypeChoices.JOB
+
+    def __init__(self, params):
+        self.selected = self.parse(params)
+        # عبارت جستجوی متن کامل روی عنوان و توضیحات
+        self.query = params.get('q', '').strip()
+
+    # -------------------------------
+    # خواندن پارامترها
+    # -------------------------------
+    def parse(self, params):
+        selected = {}
+        for name in self.FACETS:
+            values = []
+            for raw in params.getlist(name):
+                values.extend(value.strip() for value in raw.split(',') if value.strip())
+            if not values:
+                continue
+            if name in self.INTEGER_FACETS:
+                try:
+                    values = [int(value) for value in values]
+                except ValueError:
+                    raise ValidationError({name: 'A comma separated list of integer ids is expected.'})
+            selected[name] = values
+        return selected
+
+    # -------------------------------
+    # فیلتر کردن نتایج
+    # -------------------------------
+    def apply_query(self, queryset):
+        # جستجوی متن کامل، برخلاف وجه‌ها، روی شمارش وجه‌ها نیز اعمال می‌شود
+        if self.query:
+            queryset = fulltext.search(queryset, self.query, self.kind)
+        return queryset
+
+    def filter(self, queryset, exclude=None):
+        queryset = self.apply_query(queryset)
+        for name, values in self.selected.items():
+            if name == exclude:
+                continue
+            if name == 'province':
+                # گسترش استان به شهرهای آن از نگاشت درون‌حافظه‌ای و فیلتر روی city_id (ایندکس مکان)
+                queryset = queryset.filter(city_id__in=province_map.cities_in(values))
+                continue
+            queryset = queryset.filter(**{f'{self.FACETS[name]}__in': values})
+        return queryset
+
+    # -------------------------------
+    # شمارش وجه‌ها
+    # -------------------------------
+    def facet_counts(self, queryset):
+        """
+        شمارش هر مقدار هر وجه با منطق disjunctive:
+        شمارش‌های یک وجه با اعمال فیلتر تمام وجه‌های دیگر (به جز خود آن وجه) محاسبه می‌شود
+        تا کلاینت بتواند مقادیر دیگر همان وجه را نیز انتخاب کند.
+        تمام این شمارش‌ها از یک کوئری GROUP BY واحد به دست می‌آیند.
+        """
+        paths = list(self.FACETS.values())
+        rows = self.apply_query(queryset).order_by().values(*paths).annotate(count=Count('pk'))
+
+        selected = {
+            self.FACETS[name]: {str(value) for value in values}
+            for name, values in self.selected.items()
+        }
+        counts = {name: defaultdict(int) for name in self.FACETS}
+
+        for row in rows:
+            # وجه‌هایی که این ردیف با فیلترشان مطابقت ندارد
+            mismatched = [
+                path for path, values in selected.items()
+                if str(row[path]) not in values
+            ]
+            if len(mismatched) > 1:
+                continue
+            for name, path in self.FACETS.items():
+                # ردیف فقط در صورتی برای یک وجه شمرده می‌شود که تمام وجه‌های دیگر را پاس کند
+                if mismatched and mismatched[0] != path:
+                    continue
+                if row[path] is not None:
+                    counts[name][str(row[path])] += row['count']
+
+        return {name: dict(values) for name, values in counts.items()}
+
+
+
+class ResumeAdvertisementSearch(JobAdvertisementSearch):
+    """
+    جستجوی آگهی‌های رزومه: متن کامل به همراه فیلتر صنعت، شهر و استان.
+    """
+
+    FACETS = {
+        'industry': 'industry_id',
+        'city': 'city_id',
+        'province': 'province_id',
+    }
+
+    kind = Advertisement.TypeChoices.RESUME
@@ -1,4 +1,8 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from rest_framework import serializers
+from Server.fieldsets import SparseFieldsetsMixin
 import uuid
 
 # Import related models from various apps.
@@ -7,7 +11,11 @@ from Locations.models import City
 from Companies.models import Company
 from Subscriptions.models import AdvertisementSubscription
 from Resumes.models import JobSeekerResume
-from .models import Advertisement, JobAdvertisement, ResumeAdvertisement, Application
+from .models import (
+    Advertisement, JobAdvertisement, ResumeAdvertisement, Application, AdCard, SearchDocument, StatusChoices,
+    SimilarityBucket, SimilaritySignature, SavedSearch,
+)
+from . import alerts, cards, fulltext, hooks, recommendations, response_cache, similarity
 
 
 
@@ -22,7 +30,17 @@ class AdvertisementSerializer(serializers.ModelSerializer):
 
 
 
-class JobAdvertisementSerializer(serializers.ModelSerializer):
+class AdCardSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    # Flat, read-only representation used by list and search endpoints.
+
+    class Meta:
+        model = AdCard
+        fields = '__all__'
+
+
+
+
+class JobAdvertisementSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     # Accepting 'company_id' and 'industry_id' as input only.
     company_id = serializers.CharField(write_only=True, required=False)
     industry_id = serializers.CharField(write_only=True, required=False)
@@ -32,7 +50,7 @@ class JobAdvertisementSerializer(serializers.ModelSerializer):
         fields = '__all__'
         # These fields are automatically set by the create() method,
         # so they cannot be modified via the serializer.
-        read_only_fields = ['employer', 'location', 'company', 'advertisement', 'industry']
+        read_only_fields = ['employer', 'location', 'company', 'advertisement', 'industry', 'is_boosted', 'views']
 
     def create(self, validated_data):
         # Retrieve the current request and logged-in user.
@@ -133,7 +151,133 @@ class JobAdvertisementSerializer(serializers.ModelSerializer):
         return instance
 
 
-class ResumeAdvertisementSerializer(serializers.ModelSerializer):
+class JobAdvertisementBatchItemSerializer(JobAdvertisementSerializer):
+    # The batch path generates the primary key itself, so a client-sent id is ignored.
+
+    class Meta(JobAdvertisementSerializer.Meta):
+        read_only_fields = ['id', *JobAdvertisementSerializer.Meta.read_only_fields]
+
+
+class JobAdvertisementBatchSerializer(serializers.Serializer):
+    """
+    Batch creation of job advertisements for high-volume employers.
+
+    Every item is validated independently with JobAdvertisementBatchItemSerializer; referenced
+    companies and industries are resolved with one query each, and all rows
+    (subscriptions, advertisements, job ads, search documents and ad cards) are written
+    with bulk_create inside a single transaction.
+    """
+    advertisements = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=settings.ADS_BATCH_MAX_SIZE,
+    )
+
+    def validate_item(self, item):
+        # Returns (company_id, industry_id, data) or raises ValidationError for this item only.
+        serializer = JobAdvertisementBatchItemSerializer(data=item)
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+
+        company_id = data.pop('company_id', None)
+        industry_id = data.pop('industry_id', None)
+        errors = {}
+        try:
+            company_id = uuid.UUID(str(company_id)) if company_id else None
+        except ValueError:
+            errors['company_id'] = 'Must be a valid UUID.'
+        else:
+            if company_id is None:
+                errors['company_id'] = 'This field is required.'
+        try:
+            industry_id = int(industry_id) if industry_id else None
+        except ValueError:
+            errors['industry_id'] = 'Must be an integer id.'
+        else:
+            if industry_id is None:
+                errors['industry_id'] = 'This field is required.'
+        if errors:
+            raise serializers.ValidationError(errors)
+        return company_id, industry_id, data
+
+    def create(self, validated_data):
+        request = self.context.get('request')
+        user = request.user
+
+        errors = []
+        pending = []
+        for index, item in enumerate(validated_data['advertisements']):
+            try:
+                pending.append((index, *self.validate_item(item)))
+            except serializers.ValidationError as exc:
+                errors.append({'index': index, 'errors': exc.detail})
+
+        # Resolve every referenced company and industry with a single query each.
+        companies = Company.objects.select_related('location__province').in_bulk(
+            {company_id for _, company_id, _, _ in pending}
+        )
+        industries = Industry.objects.in_bulk({industry_id for _, _, industry_id, _ in pending})
+
+        subscriptions, advertisements, job_advertisements, results = [], [], [], []
+        for index, company_id, industry_id, data in pending:
+            company = companies.get(company_id)
+            industry = industries.get(industry_id)
+            if company is None:
+                errors.append({'index': index, 'errors': {'company': 'The company does not exist.'}})
+                continue
+            if industry is None:
+                errors.append({'index': index, 'errors': {'industry': 'The industry does not exist.'}})
+                continue
+            if company.employer_id != user.id and not user.is_staff:
+                errors.append({'index': index, 'errors': {'error': 'You are not the employer of this company.'}})
+                continue
+            # Only staff may set the moderation status.
+            if not user.is_staff:
+                data.pop('status', None)
+
+            subscription = AdvertisementSubscription()
+            advertisement = Advertisement(id=uuid.uuid4(), subscription=subscription, ad_type="J")
+            job_advertisement = JobAdvertisement(
+                id=uuid.uuid4(),
+                advertisement=advertisement,
+                industry=industry,
+                company=company,
+                location=company.location,  # Location is inferred from the company.
+                employer=user,
+                **data
+            )
+            subscriptions.append(subscription)
+            advertisements.append(advertisement)
+            job_advertisements.append(job_advertisement)
+            results.append({'index': index, 'id': str(job_advertisement.id)})
+
+        if job_advertisements:
+            with transaction.atomic():
+                AdvertisementSubscription.objects.bulk_create(subscriptions)
+                Advertisement.objects.bulk_create(advertisements)
+                JobAdvertisement.objects.bulk_create(job_advertisements)
+                # bulk_create sends no post_save signals, so the read models are written here.
+                SearchDocument.objects.bulk_create([
+                    fulltext.build_document(job, Advertisement.TypeChoices.JOB) for job in job_advertisements
+                ])
+                AdCard.objects.bulk_create([
+                    cards.build_card(job, Advertisement.TypeChoices.JOB) for job in job_advertisements
+                ])
+                signatures, buckets = [], []
+                for job in job_advertisements:
+                    signature, job_buckets = similarity.build_rows(job)
+                    signatures.append(signature)
+                    buckets.extend(job_buckets)
+                SimilaritySignature.objects.bulk_create(signatures)
+                SimilarityBucket.objects.bulk_create(buckets)
+                # The same hooks post_save runs: recommendations, listing caches and saved-search alerts.
+                hooks.job_advertisements_saved(job_advertisements, created=True)
+
+        errors.sort(key=lambda error: error['index'])
+        return {'created': results, 'errors': errors}
+
+
+class ResumeAdvertisementSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
 
     # Accepting input for a related city and industry.
     city_id = serializers.CharField(write_only=True, required=False)
@@ -143,7 +287,7 @@ class ResumeAdvertisementSerializer(serializers.ModelSerializer):
         model = ResumeAdvertisement
         fields = '__all__'
         # job_seeker, location, and resume are controlled by the system.
-        read_only_fields = ['job_seeker', 'location', 'resume', 'advertisement', 'industry']
+        read_only_fields = ['job_seeker', 'location', 'resume', 'advertisement', 'industry', 'views']
 
     def create(self, validated_data):
         # Get the request context to access the user.
@@ -276,13 +420,18 @@ class ApplicationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({'resume': 'No resume found for the job seeker.'})
         
         # Create the Application instance. Use get() with a default value on cover_letter to avoid KeyError.
-        application_instance = Application.objects.create(
-            id=generated_id,
-            advertisement=advertisement,
-            job_seeker=user,
-            resume=resume,
-            cover_letter=validated_data.get('cover_letter', '')
-        )
+        # The (job_seeker, advertisement) unique constraint rejects duplicates, including concurrent retries.
+        try:
+            with transaction.atomic():
+                application_instance = Application.objects.create(
+                    id=generated_id,
+                    advertisement=advertisement,
+                    job_seeker=user,
+                    resume=resume,
+                    cover_letter=validated_data.get('cover_letter', '')
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({'advertisement': 'You have already applied to this advertisement.'})
         return application_instance
 
     def update(self, instance, validated_data):
@@ -304,3 +453,124 @@ class ApplicationSerializer(serializers.ModelSerializer):
 
         instance.save()
         return instance
+
+
+
+class ApplicationBulkUpdateSerializer(serializers.Serializer):
+    """
+    Bulk status transition and/or mark-as-viewed for a set of applications.
+
+    All rows are changed with a single set-based UPDATE; the ownership check
+    (the application's job ad belongs to the requesting employer) is part of the
+    same statement, so ids the caller does not own are silently left untouched
+    and are not counted.
+    """
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=settings.APPLICATIONS_BULK_MAX_SIZE,
+    )
+    status = serializers.ChoiceField(choices=Application.StatusChoices.choices, required=False)
+    viewed_by_employer = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        if 'status' not in attrs and 'viewed_by_employer' not in attrs:
+            raise serializers.ValidationError('Either status or viewed_by_employer is required.')
+        return attrs
+
+    def create(self, validated_data):
+        user = self.context['request'].user
+
+        queryset = Application.objects.filter(id__in=set(validated_data['ids']))
+        if not user.is_staff:
+            queryset = queryset.filter(
+                advertisement__in=JobAdvertisement.objects.filter(employer=user).values('pk')
+            )
+
+        changes = {'updated_at': timezone.now()}
+        for field in ('status', 'viewed_by_employer'):
+            if field in validated_data:
+                changes[field] = validated_data[field]
+        return {'updated': queryset.update(**changes)}
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    """
+    A job seeker's saved search. Every given criterion must match (empty means
+    any); keywords must all appear in the ad title or description.
+    """
+
+    class Meta:
+        model = SavedSearch
+        fields = [
+            'id', 'name', 'industry', 'city', 'province', 'salary', 'job_type', 'degree', 'keywords', 'created_at',
+        ]
+        read_only_fields = ['id', 'created_at']
+
+    def validate_keywords(self, value):
+        if len(alerts.keyword_tokens(value)) > settings.SAVED_SEARCH_MAX_KEYWORDS:
+            raise serializers.ValidationError(
+                f'At most {settings.SAVED_SEARCH_MAX_KEYWORDS} keywords are allowed.'
+            )
+        return value
+
+    def create(self, validated_data):
+        user = self.context['request'].user
+        if SavedSearch.objects.filter(job_seeker=user).count() >= settings.SAVED_SEARCH_MAX_PER_USER:
+            raise serializers.ValidationError(
+                {'saved_search': f'At most {settings.SAVED_SEARCH_MAX_PER_USER} saved searches are allowed.'}
+            )
+        return SavedSearch.objects.create(job_seeker=user, **validated_data)
+
+
+
+class ModerationDecisionSerializer(serializers.Serializer):
+    """
+    Batch approve/reject of pending job and resume advertisements (staff only).
+
+    Each table is changed with a single set-based UPDATE restricted to rows that
+    are still pending, so ids already decided (e.g. by another moderator) are
+    left untouched and are not counted. The ad cards are updated the same way;
+    since update() sends no post_save signals, the listing caches are
+    invalidated here.
+    """
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=settings.ADS_MODERATION_MAX_SIZE,
+    )
+    status = serializers.ChoiceField(choices=[
+        (StatusChoices.APPROVED, StatusChoices.APPROVED.label),
+        (StatusChoices.REJECTED, StatusChoices.REJECTED.label),
+    ])
+
+    def create(self, validated_data):
+        ids = set(validated_data['ids'])
+        decision = validated_data['status']
+        now = timezone.now()
+
+        with transaction.atomic():
+            pending_jobs = JobAdvertisement.objects.filter(id__in=ids, status=StatusChoices.PENDING)
+            # Newly approved ads change the recommendations of job seekers in the same industry or city.
+            approved_jobs = []
+            if decision == StatusChoices.APPROVED:
+                approved_jobs = list(pending_jobs.only('id', 'industry_id', 'location_id'))
+
+            jobs = pending_jobs.update(status=decision, updated_at=now)
+            resumes = ResumeAdvertisement.objects.filter(
+                id__in=ids, status=StatusChoices.PENDING
+            ).update(status=decision, updated_at=now)
+            AdCard.objects.filter(id__in=ids, status=StatusChoices.PENDING).update(status=decision, updated_at=now)
+
+            if approved_jobs:
+                # update() sends no post_save, so recommendations and saved-search alerts are handled here,
+                # after commit so a concurrent request cannot re-cache the pre-approval recommendations.
+                approved_ids = [job.pk for job in approved_jobs]
+                transaction.on_commit(lambda: recommendations.invalidate_for_ads(approved_jobs))
+                transaction.on_commit(lambda: alerts.percolate(approved_ids))
+            if jobs:
+                response_cache.bump(response_cache.JOB)
+            if resumes:
+                response_cache.bump(response_cache.RESUME)
+
+        return {'updated': jobs + resumes, 'job': jobs, 'resume': resumes}
@@ -0,0 +1,186 @@
+from django.db.models.signals import pre_save, post_save, post_delete  # ایمپورت سیگنال‌های ذخیره و حذف شیء
+from django.dispatch import receiver                    # ایمپورت دکوریتور receiver برای اتصال تابع به سیگنال مربوطه
+
+from Companies.models import Company
+from Industry.models import Industry
+from Locations.models import Province, City
+from Resumes.models import JobSeekerResume, Experience, JobSeekerSkill
+from Subscriptions.models import AdvertisementSubscription
+from .models import Advertisement, JobAdvertisement, ResumeAdvertisement, DeletedAdvertisement, SavedSearch
+from . import alerts, cards, fulltext, hooks, recommendations, response_cache, similarity
+
+
+# همگام‌سازی فیلد غیرنرمال is_boosted آگهی کارفرما با وضعیت اشتراک آن
+@receiver(post_save, sender=AdvertisementSubscription)
+def sync_job_advertisement_boost(sender, instance, **kwargs):
+    """
+    پس از ذخیره اشتراک (مثلاً پس از پرداخت موفق و ویژه شدن آگهی)،
+    فیلد is_boosted آگهی کارفرمای مرتبط با یک UPDATE به‌روزرسانی می‌شود
+    تا فید آگهی‌ها بدون join به جدول اشتراک مرتب شود.
+    """
+    is_boosted = instance.subscription_status == AdvertisementSubscription.SubscriptionStatus.SPECIAL
+    JobAdvertisement.objects.filter(
+        advertisement__subscription=instance
+    ).exclude(is_boosted=is_boosted).update(is_boosted=is_boosted)
+    cards.refresh_subscription(instance)
+
+
+# نگهداری سند جستجوی متن کامل آگهی‌ها
+@receiver(post_save, sender=JobAdvertisement)
+def index_job_advertisement(sender, instance, **kwargs):
+    fulltext.index_advertisement(instance, Advertisement.TypeChoices.JOB)
+
+
+@receiver(post_delete, sender=JobAdvertisement)
+def unindex_job_advertisement(sender, instance, **kwargs):
+    fulltext.unindex_advertisement(instance, Advertisement.TypeChoices.JOB)
+
+
+# نگهداری تدریجی ایندکس LSH آگهی‌های مشابه (حذف با CASCADE انجام می‌شود)
+@receiver(post_save, sender=JobAdvertisement)
+def index_job_advertisement_similarity(sender, instance, **kwargs):
+    similarity.index_advertisement(instance)
+
+
+@receiver(post_save, sender=ResumeAdvertisement)
+def index_resume_advertisement(sender, instance, **kwargs):
+    fulltext.index_advertisement(instance, Advertisement.TypeChoices.RESUME)
+
+
+@receiver(post_delete, sender=ResumeAdvertisement)
+def unindex_resume_advertisement(sender, instance, **kwargs):
+    fulltext.unindex_advertisement(instance, Advertisement.TypeChoices.RESUME)
+
+
+# لاگ حذف آگهی‌ها جهت tombstoneهای فید تغییرات
+@receiver(post_delete, sender=JobAdvertisement)
+def log_deleted_job_advertisement(sender, instance, **kwargs):
+    DeletedAdvertisement.objects.create(kind=Advertisement.TypeChoices.JOB, object_id=instance.pk)
+
+
+@receiver(post_delete, sender=ResumeAdvertisement)
+def log_deleted_resume_advertisement(sender, instance, **kwargs):
+    DeletedAdvertisement.objects.create(kind=Advertisement.TypeChoices.RESUME, object_id=instance.pk)
+
+
+# -------------------------------
+# نگهداری تدریجی کارت‌های آگهی (AdCard)
+# -------------------------------
+@receiver(post_save, sender=JobAdvertisement)
+def refresh_job_advertisement_card(sender, instance, **kwargs):
+    cards.refresh_job_card(instance.pk)
+
+
+@receiver(post_save, sender=ResumeAdvertisement)
+def refresh_resume_advertisement_card(sender, instance, **kwargs):
+    cards.refresh_resume_card(instance.pk)
+
+
+@receiver(post_delete, sender=JobAdvertisement)
+@receiver(post_delete, sender=ResumeAdvertisement)
+def delete_advertisement_card(sender, instance, **kwargs):
+    cards.delete_card(instance.pk)
+
+
+@receiver(post_save, sender=Company)
+def refresh_company_cards(sender, instance, created, **kwargs):
+    if not created:
+        cards.refresh_company(instance)
+
+
+@receiver(post_save, sender=Industry)
+def refresh_industry_cards(sender, instance, created, **kwargs):
+    if not created:
+        cards.refresh_industry(instance)
+
+
+@receiver(post_save, sender=City)
+def refresh_city_cards(sender, instance, created, **kwargs):
+    if not created:
+        cards.refresh_city(instance)
+
+
+@receiver(post_save, sender=Province)
+def refresh_province_cards(sender, instance, created, **kwargs):
+    if not created:
+        cards.refresh_province(instance)
+
+
+# -------------------------------
+# ابطال کش پیشنهادهای شخصی‌سازی شده
+# -------------------------------
+@receiver(post_save, sender=JobSeekerResume)
+@receiver(post_delete, sender=JobSeekerResume)
+def invalidate_resume_recommendations(sender, instance, **kwargs):
+    recommendations.invalidate_user(instance.job_seeker_id)
+
+
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+@receiver(post_save, sender=JobSeekerSkill)
+@receiver(post_delete, sender=JobSeekerSkill)
+def invalidate_resume_item_recommendations(sender, instance, **kwargs):
+    job_seeker_id = JobSeekerResume.objects.filter(pk=instance.resume_id).values_list('job_seeker_id', flat=True).first()
+    if job_seeker_id is not None:
+        recommendations.invalidate_user(job_seeker_id)
+
+
+@receiver(post_delete, sender=JobAdvertisement)
+def invalidate_deleted_job_advertisement_recommendations(sender, instance, **kwargs):
+    recommendations.invalidate_for_ads([instance])
+
+
+# -------------------------------
+# ابطال کش پاسخ لیست‌های عمومی (تنها خانواده‌های متاثر)
+# -------------------------------
+@receiver(post_delete, sender=JobAdvertisement)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_job_listings(sender, **kwargs):
+    response_cache.bump(response_cache.JOB)
+
+
+@receiver(post_save, sender=ResumeAdvertisement)
+@receiver(post_delete, sender=ResumeAdvertisement)
+def invalidate_resume_listings(sender, **kwargs):
+    response_cache.bump(response_cache.RESUME)
+
+
+# صنعت، شهر، استان و اشتراک (ترتیب آگهی‌های ویژه) روی کارت هر دو نوع آگهی اثر دارند
+@receiver(post_save, sender=Industry)
+@receiver(post_delete, sender=Industry)
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+@receiver(post_save, sender=Province)
+@receiver(post_delete, sender=Province)
+def invalidate_all_listings(sender, **kwargs):
+    response_cache.bump(response_cache.JOB, response_cache.RESUME)
+
+
+@receiver(post_save, sender=AdvertisementSubscription)
+def invalidate_listings_on_subscription_change(sender, instance, created, **kwargs):
+    # اشتراک تازه ایجاد شده هنوز به آگهی‌ای متصل نیست
+    if not created:
+        response_cache.bump(response_cache.JOB, response_cache.RESUME)
+
+
+
+# -------------------------------
+# هشدار جستجوهای ذخیره شده
+# -------------------------------
+@receiver(pre_save, sender=SavedSearch)
+def index_saved_search(sender, instance, **kwargs):
+    instance.anchor = alerts.anchor_for(instance)
+
+
+# پس از بروزرسانی کارت، سند جستجو و ایندکس شباهت (گیرنده‌های بالا) اجرا می‌شود؛
+# ابطال پیشنهادها و لیست‌ها و تطبیق هشدارها مشترک با ایجاد دسته‌ای آگهی‌هاست
+@receiver(post_save, sender=JobAdvertisement)
+def job_advertisement_saved(sender, instance, created, **kwargs):
+    hooks.job_advertisements_saved([instance], created)
+
+
+@receiver(post_save, sender=AdvertisementSubscription)
+def percolate_subscription_advertisements(sender, instance, created, **kwargs):
+    if not created:
+        alerts.percolate_subscription(instance)
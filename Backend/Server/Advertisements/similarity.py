@@ -0,0 +1,162 @@
+import hashlib
+import zlib
+
+import numpy as np
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+
+from .fulltext import normalize_persian
+from .models import Advertisement, AdCard, SimilarityBucket, SimilaritySignature, StatusChoices
+from . import cards
+
+
+
+
+# -------------------------------
+# پارامترهای MinHash / LSH
+# -------------------------------
+# امضا از NUM_PERM مقدار کمینه تشکیل می‌شود و به BANDS باند ROWS تایی تقسیم می‌شود؛
+# دو آگهی با شباهت Jaccard برابر s با احتمال 1 - (1 - s^ROWS)^BANDS حداقل در یک سطل مشترک‌اند
+# (آستانه تقریبی (1/BANDS)^(1/ROWS) ≈ 0.42).
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+
+# طول shingle (کاراکتری) روی متن نرمال‌شده؛ نسبت به پسوندهای فارسی (ها، ی، ...) مقاوم‌تر از shingle کلمه‌ای است
+SHINGLE_SIZE = 5
+
+# حداکثر نامزدهای LSH که امضایشان برای رتبه‌بندی خوانده می‌شود
+MAX_CANDIDATES = 500
+
+# توابع درهم‌سازی (a * x + b) mod p با بذر ثابت تا امضاها بین پروسه‌ها و اجراها یکسان باشند
+_PRIME = np.uint64((1 << 61) - 1)
+_random = np.random.RandomState(1)
+_A = _random.randint(1, 1 << 31, size=NUM_PERM).astype(np.uint64)
+_B = _random.randint(0, 1 << 31, size=NUM_PERM).astype(np.uint64)
+_MAX_HASH = np.uint32(0xFFFFFFFF)
+
+
+def document_text(title, description):
+    return normalize_persian(f"{title} {description or ''}")
+
+
+def shingles(text):
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[index:index + SHINGLE_SIZE] for index in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def compute_signature(title, description):
+    """
+    امضای MinHash متن آگهی: برای هر تابع درهم‌سازی، کمینه مقدار روی تمام shingleها.
+    """
+    values = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingles(document_text(title, description))]
+    if not values:
+        return np.full(NUM_PERM, _MAX_HASH, dtype=np.uint32)
+    hashes = np.array(values, dtype=np.uint64)
+    # ماتریس (تعداد shingle × NUM_PERM)؛ a < 2^31 و x < 2^32 پس حاصل‌ضرب در uint64 سرریز نمی‌کند
+    permuted = ((np.outer(hashes, _A) + _B) % _PRIME) & np.uint64(0xFFFFFFFF)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def band_keys(signature):
+    """
+    کلید سطل هر باند: هش 64 بیتی شماره باند و مقادیر آن (عدد علامت‌دار جهت BigIntegerField).
+    امضای متن خالی در هیچ سطلی قرار نمی‌گیرد.
+    """
+    if (signature == _MAX_HASH).all():
+        return []
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(
+            band.to_bytes(2, 'big') + signature[band * ROWS:(band + 1) * ROWS].tobytes(),
+            digest_size=8,
+        ).digest()
+        keys.append(int.from_bytes(digest, 'big', signed=True))
+    return keys
+
+
+def decode(value):
+    return np.frombuffer(bytes(value), dtype=np.uint32)
+
+
+# -------------------------------
+# نگهداری تدریجی ایندکس
+# -------------------------------
+def build_rows(job_advertisement):
+    # ساخت ردیف‌های امضا و سطل‌ها بدون ذخیره؛ جهت bulk_create
+    signature = compute_signature(job_advertisement.title, job_advertisement.description)
+    return (
+        SimilaritySignature(job_advertisement_id=job_advertisement.pk, signature=signature.tobytes()),
+        [SimilarityBucket(job_advertisement_id=job_advertisement.pk, key=key) for key in band_keys(signature)],
+    )
+
+
+def index_advertisement(job_advertisement):
+    """
+    به‌روزرسانی امضا و سطل‌های یک آگهی؛ در صورتی که عنوان و توضیحات تغییری نکرده باشند
+    (امضای یکسان) سطل‌ها بازنویسی نمی‌شوند.
+    """
+    signature_row, buckets = build_rows(job_advertisement)
+    stored = SimilaritySignature.objects.filter(pk=job_advertisement.pk).values_list('signature', flat=True).first()
+    if stored is not None and bytes(stored) == signature_row.signature:
+        return
+    with transaction.atomic():
+        SimilaritySignature.objects.update_or_create(
+            job_advertisement_id=job_advertisement.pk,
+            defaults={'signature': signature_row.signature},
+        )
+        SimilarityBucket.objects.filter(job_advertisement_id=job_advertisement.pk).delete()
+        SimilarityBucket.objects.bulk_create(buckets)
+
+
+# -------------------------------
+# یافتن آگهی‌های مشابه
+# -------------------------------
+def similar_ads(job_advertisement, limit=None, min_score=None):
+    """
+    آگهی‌های تایید شده و فعال مشابه با یک آگهی کارفرما به صورت لیست (کارت آگهی، شباهت تخمینی) به ترتیب نزولی شباهت.
+
+    نامزدها تنها از طریق ایندکس سطل‌های مشترک یافته می‌شوند (بدون مقایسه با تمام آگهی‌ها)؛
+    سپس شباهت Jaccard هر نامزد از نسبت مقادیر برابر دو امضا تخمین زده می‌شود.
+    """
+    limit = limit or getattr(settings, 'ADS_SIMILAR_SIZE', 10)
+    min_score = getattr(settings, 'ADS_SIMILAR_MIN_SCORE', 0.3) if min_score is None else min_score
+
+    stored = SimilaritySignature.objects.filter(pk=job_advertisement.pk).values_list('signature', flat=True).first()
+    if stored is not None:
+        signature = decode(stored)
+    else:
+        signature = compute_signature(job_advertisement.title, job_advertisement.description)
+    keys = band_keys(signature)
+    if not keys:
+        return []
+
+    # تنها آگهی‌های منتشر شده (تایید شده با اشتراک فعال) پیشنهاد می‌شوند
+    active_ids = cards.active(AdCard.objects.filter(
+        kind=Advertisement.TypeChoices.JOB, status=StatusChoices.APPROVED,
+    )).values('id')
+    candidate_ids = list(
+        SimilarityBucket.objects
+        .filter(key__in=keys, job_advertisement_id__in=active_ids)
+        .exclude(job_advertisement_id=job_advertisement.pk)
+        .values('job_advertisement_id')
+        .annotate(shared=Count('pk'))
+        .order_by('-shared')
+        .values_list('job_advertisement_id', flat=True)[:MAX_CANDIDATES]
+    )
+    if not candidate_ids:
+        return []
+
+    rows = list(SimilaritySignature.objects.filter(pk__in=candidate_ids).values_list('pk', 'signature'))
+    matrix = np.vstack([decode(value) for _, value in rows])
+    scores = (matrix == signature).mean(axis=1)
+
+    ranked = sorted(
+        ((pk, float(score)) for (pk, _), score in zip(rows, scores) if score >= min_score),
+        key=lambda item: -item[1],
+    )[:limit]
+    ad_cards = AdCard.objects.in_bulk([pk for pk, _ in ranked])
+    return [(ad_cards[pk], round(score, 4)) for pk, score in ranked if pk in ad_cards]
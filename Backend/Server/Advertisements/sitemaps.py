@@ -0,0 +1,259 @@
+import bisect
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from Companies.models import Company
+from Subscriptions.models import active_subscription_q
+
+from .models import JobAdvertisement, StatusChoices
+
+
+
+
+# -------------------------------
+# نقشه سایت XML تکه‌تکه (sharded) با تولید تدریجی
+# -------------------------------
+# هر بخش (آگهی‌ها، شرکت‌ها) به ترتیب (created_at, id) به تکه‌هایی با حداکثر SITEMAP_SHARD_SIZE آدرس تقسیم می‌شود؛
+# هر تکه بازه‌ای از کلیدها را پوشش می‌دهد (از کلید شروع خود تا کلید شروع تکه بعد).
+# در هر اجرا تنها تکه‌هایی بازنویسی می‌شوند که ردیفی از بازه‌شان پس از watermark قبلی تغییر کرده باشد؛
+# ردیف‌های جدید به انتهای آخرین تکه اضافه می‌شوند و تکه پر شده تقسیم می‌شود.
+# فایل‌ها در SITEMAP_ROOT نوشته و مستقیماً توسط وب سرور سرو می‌شوند (بدون عبور از ORM).
+#
+# ردیف‌های حذف شده با updated_at قابل تشخیص نیستند؛ اجرای دوره‌ای با --full آن‌ها را نیز حذف می‌کند.
+MANIFEST = 'manifest.json'
+INDEX = 'sitemap.xml'
+
+# همپوشانی watermark جهت ردیف‌هایی که تراکنششان پس از شروع اجرای قبلی commit شده است
+WATERMARK_OVERLAP = timedelta(minutes=1)
+
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def approved_job_advertisements():
+    return JobAdvertisement.objects.filter(
+        active_subscription_q('advertisement__subscription__'),
+        status=StatusChoices.APPROVED,
+    )
+
+
+# نام بخش -> (مدل پایه جهت تشخیص تغییرات، queryset آدرس‌های منتشر شده، نام تنظیم مسیر صفحه)
+SECTIONS = {
+    'jobs': (JobAdvertisement, approved_job_advertisements, 'SITEMAP_JOB_PATH'),
+    'companies': (Company, lambda: Company.objects.all(), 'SITEMAP_COMPANY_PATH'),
+}
+
+
+def sitemap_root():
+    return getattr(settings, 'SITEMAP_ROOT', os.path.join(settings.MEDIA_ROOT, 'sitemaps'))
+
+
+def shard_size():
+    return getattr(settings, 'SITEMAP_SHARD_SIZE', 50000)
+
+
+def site_url(path):
+    return getattr(settings, 'SITEMAP_SITE_URL', '').rstrip('/') + '/' + path.lstrip('/')
+
+
+def shard_url(filename):
+    return site_url(f"{settings.MEDIA_URL.strip('/')}/sitemaps/{filename}")
+
+
+def shard_filename(section, shard_id):
+    return f'{section}-{shard_id}.xml'
+
+
+# -------------------------------
+# کلید مرتب‌سازی (created_at, id)
+# -------------------------------
+def encode_key(key):
+    return None if key is None else [key[0].isoformat(), str(key[1])]
+
+
+def decode_key(value):
+    return None if value is None else (datetime.fromisoformat(value[0]), uuid.UUID(value[1]))
+
+
+def key_range(start, end):
+    # شرط start <= (created_at, id) < end
+    condition = Q()
+    if start is not None:
+        condition &= Q(created_at__gt=start[0]) | Q(created_at=start[0], id__gte=start[1])
+    if end is not None:
+        condition &= Q(created_at__lt=end[0]) | Q(created_at=end[0], id__lt=end[1])
+    return condition
+
+
+# -------------------------------
+# نوشتن فایل‌ها
+# -------------------------------
+def write_atomic(path, chunks):
+    # نوشتن در فایل موقت و جایگزینی اتمیک؛ خزنده هرگز فایل نیمه‌کاره نمی‌بیند
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as output:
+        for chunk in chunks:
+            output.write(chunk)
+    os.replace(temporary, path)
+
+
+def lastmod(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class ShardWriter:
+    """
+    نوشتن جریانی آدرس‌های یک بازه در یک یا چند تکه؛ در صورت رسیدن به سقف، تکه جدیدی
+    با کلید شروع ردیف جاری آغاز می‌شود.
+    """
+
+    def __init__(self, root, section, path_template, shard, manifest):
+        self.root = root
+        self.section = section
+        self.path_template = path_template
+        self.manifest = manifest
+        self.shards = []
+        self.output = None
+        self.temporary = None
+        self.open_shard(shard)
+
+    def open_shard(self, shard):
+        self.close()
+        shard.update(count=0, lastmod=None)
+        self.shards.append(shard)
+        self.temporary = os.path.join(self.root, shard_filename(self.section, shard['id']) + '.tmp')
+        self.output = open(self.temporary, 'w', encoding='utf-8')
+        self.output.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{XMLNS}">\n')
+
+    def write(self, created_at, pk, updated_at):
+        shard = self.shards[-1]
+        if shard['count'] >= shard_size():
+            shard = {'id': self.manifest['next_id'], 'start': encode_key((created_at, pk))}
+            self.manifest['next_id'] += 1
+            self.open_shard(shard)
+        location = escape(site_url(self.path_template.format(id=pk)))
+        self.output.write(f'<url><loc>{location}</loc><lastmod>{lastmod(updated_at)}</lastmod></url>\n')
+        shard['count'] += 1
+        if shard['lastmod'] is None or updated_at.isoformat() > shard['lastmod']:
+            shard['lastmod'] = updated_at.isoformat()
+
+    def close(self):
+        if self.output is None:
+            return
+        self.output.write('</urlset>\n')
+        self.output.close()
+        shard = self.shards[-1]
+        os.replace(self.temporary, os.path.join(self.root, shard_filename(self.section, shard['id'])))
+        self.output = None
+
+
+def regenerate(root, section, manifest, index):
+    """
+    بازنویسی تکه index (و تقسیم آن در صورت پر شدن)؛ تکه‌های جدید بلافاصله پس از آن درج می‌شوند.
+    """
+    _, published, path_setting = SECTIONS[section]
+    shards = manifest['shards']
+    shard = shards[index]
+    end = decode_key(shards[index + 1]['start']) if index + 1 < len(shards) else None
+
+    rows = (
+        published()
+        .filter(key_range(decode_key(shard['start']), end))
+        .order_by('created_at', 'id')
+        .values_list('created_at', 'id', 'updated_at')
+        .iterator(chunk_size=2000)
+    )
+    writer = ShardWriter(root, section, getattr(settings, path_setting), shard, manifest)
+    for created_at, pk, updated_at in rows:
+        writer.write(created_at, pk, updated_at)
+    writer.close()
+    shards[index:index + 1] = writer.shards
+
+    # تکه خالی حذف و بازه‌اش به تکه قبلی ملحق می‌شود (به جز تنها تکه بخش)
+    if shard['count'] == 0 and len(shards) > 1:
+        os.remove(os.path.join(root, shard_filename(section, shard['id'])))
+        del shards[index]
+        shards[0]['start'] = None
+
+
+def affected_shards(section, manifest, since):
+    """
+    شماره تکه‌هایی که حداقل یک ردیف (با هر وضعیتی) در بازه‌شان پس از since تغییر کرده است.
+    """
+    model = SECTIONS[section][0]
+    starts = [decode_key(shard['start']) for shard in manifest['shards'][1:]]
+    affected = set()
+    changed = model.objects.filter(updated_at__gt=since).values_list('created_at', 'id').iterator(chunk_size=2000)
+    for key in changed:
+        affected.add(bisect.bisect_right(starts, key))
+    return affected
+
+
+# -------------------------------
+# رابط اصلی
+# -------------------------------
+def load_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST), encoding='utf-8') as manifest:
+            return json.load(manifest)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def generate(full=False):
+    """
+    تولید تدریجی نقشه سایت؛ در اولین اجرا یا با full=True تمام تکه‌ها از ابتدا ساخته می‌شوند.
+    خروجی: دیکشنری نام بخش -> تعداد تکه‌های بازنویسی شده.
+    """
+    root = sitemap_root()
+    os.makedirs(root, exist_ok=True)
+    started_at = timezone.now()
+
+    manifest = load_manifest(root) or {'sections': {}}
+    written = {}
+
+    for section in SECTIONS:
+        state = manifest['sections'].get(section)
+        if state is None or full:
+            stale = [shard['id'] for shard in state['shards']] if state else []
+            state = {'watermark': None, 'next_id': max(stale, default=0) + 1, 'shards': []}
+            state['shards'].append({'id': state['next_id'], 'start': None})
+            state['next_id'] += 1
+            affected = {0}
+        else:
+            stale = []
+            since = datetime.fromisoformat(state['watermark']) - WATERMARK_OVERLAP
+            affected = affected_shards(section, state, since)
+
+        # از آخر به اول تا تقسیم یا حذف یک تکه شماره تکه‌های قبلی را تغییر ندهد
+        for index in sorted(affected, reverse=True):
+            regenerate(root, section, state, index)
+
+        for shard_id in stale:
+            path = os.path.join(root, shard_filename(section, shard_id))
+            if os.path.exists(path):
+                os.remove(path)
+
+        state['watermark'] = started_at.isoformat()
+        manifest['sections'][section] = state
+        written[section] = len(affected)
+
+    write_atomic(os.path.join(root, INDEX), index_xml(manifest, started_at))
+    write_atomic(os.path.join(root, MANIFEST), [json.dumps(manifest)])
+    return written
+
+
+def index_xml(manifest, generated_at):
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{XMLNS}">\n'
+    for section, state in manifest['sections'].items():
+        for shard in state['shards']:
+            modified = datetime.fromisoformat(shard['lastmod']) if shard.get('lastmod') else generated_at
+            location = escape(shard_url(shard_filename(section, shard['id'])))
+            yield f'<sitemap><loc>{location}</loc><lastmod>{lastmod(modified)}</lastmod></sitemap>\n'
+    yield '</sitemapindex>\n'
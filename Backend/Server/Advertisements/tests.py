@@ -1,3 +1,1146 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+from xml.etree import ElementTree
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from Companies.models import Company
+from Industry.models import Industry, IndustryCategory, Skill
+from Locations.models import Province, City
+from Locations import province_map
+from Resumes.models import JobSeekerSkill
+from Server.checks import check_shared_caches
+from Subscriptions.models import AdvertisementSubscription
+from Users.models import User
+from .expiry import expire_subscriptions
+from .fulltext import normalize_persian
+from .models import (
+    Advertisement, JobAdvertisement, ResumeAdvertisement, Application, AdCard, SavedSearch, SearchAlert,
+)
+from .similarity import compute_signature
+from . import alerts, counters, matching, recommendations, sitemaps
+
+
+
+
+class AdvertisementTestMixin:
+    """
+    داده‌های پایه مشترک برای تست‌های اپ آگهی‌ها.
+    """
+
+    def setUp(self):
+        # کش پاسخ لیست‌ها و شمارنده‌های نسل بین تست‌ها مشترک است
+        cache.clear()
+        # flush شمارنده بازدید تنها در صورت فراخوانی صریح (تعداد کوئری‌ها قطعی بماند)
+        flush_settings = self.settings(ADS_VIEW_FLUSH_INTERVAL=3600)
+        flush_settings.enable()
+        self.addCleanup(flush_settings.disable)
+        self.client = APIClient()
+        self.employer = User.objects.create_user(
+            phone="09120000001",
+            user_type="EM",
+            password="password123",
+            full_name="employer"
+        )
+        self.province = Province.objects.create(name="تهران")
+        self.city = City.objects.create(province=self.province, name="تهران")
+        category = IndustryCategory.objects.create(name="فناوری")
+        self.industry = Industry.objects.create(name="نرم‌افزار", category=category)
+        self.company = Company.objects.create(
+            employer=self.employer,
+            name="شرکت نمونه",
+            location=self.city,
+            industry=self.industry
+        )
+
+    def create_job_seeker(self, phone="09120000002"):
+        return User.objects.create_user(
+            phone=phone,
+            user_type="JS",
+            password="password123",
+            full_name="job seeker"
+        )
+
+    def create_resume_ad(self, job_seeker, title="رزومه", **extra):
+        subscription = AdvertisementSubscription.objects.create()
+        advertisement = Advertisement.objects.create(subscription=subscription, ad_type="R")
+        return ResumeAdvertisement.objects.create(
+            advertisement=advertisement,
+            job_seeker=job_seeker,
+            resume=job_seeker.resume,
+            industry=self.industry,
+            location=self.city,
+            title=title,
+            **extra
+        )
+
+    def create_job_ad(self, title="برنامه‌نویس", **extra):
+        subscription = AdvertisementSubscription.objects.create()
+        advertisement = Advertisement.objects.create(subscription=subscription, ad_type="J")
+        extra.setdefault("location", self.city)
+        extra.setdefault("employer", self.employer)
+        return JobAdvertisement.objects.create(
+            advertisement=advertisement,
+            company=self.company,
+            industry=self.industry,
+            title=title,
+            **extra
+        )
+
+
+class JobAdvertisementFeedTest(AdvertisementTestMixin, TestCase):
+    """
+    تست صفحه‌بندی keyset فید آگهی‌های کارفرما.
+    """
+
+    def test_cursor_walks_every_ad_once(self):
+        """
+        پیمایش تمام صفحات با cursor باید هر آگهی را دقیقاً یک بار برگرداند.
+        """
+        ads = [self.create_job_ad(title=f"آگهی {i}") for i in range(7)]
+        seen = []
+        url = "/ads/job/?page_size=3"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(item["id"] for item in response.data["results"])
+            cursor = response.data["next"]
+            url = f"/ads/job/?page_size=3&cursor={cursor}" if cursor else None
+        self.assertEqual(sorted(seen), sorted(str(ad.id) for ad in ads))
+
+    def test_boosted_ads_come_first(self):
+        """
+        آگهی‌هایی که اشتراک ویژه دارند باید در ابتدای فید قرار بگیرند.
+        """
+        self.create_job_ad(title="عادی")
+        boosted = self.create_job_ad(title="ویژه قدیمی")
+        self.create_job_ad(title="عادی جدید")
+        subscription = boosted.advertisement.subscription
+        subscription.subscription_status = AdvertisementSubscription.SubscriptionStatus.SPECIAL
+        subscription.save()
+
+        response = self.client.get("/ads/job/")
+        self.assertEqual(response.data["results"][0]["id"], str(boosted.id))
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get("/ads/job/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, 404)
+
+
+class JobAdvertisementSearchTest(AdvertisementTestMixin, TestCase):
+    """
+    تست جستجوی چندوجهی آگهی‌های کارفرما.
+    """
+
+    def test_filters_and_disjunctive_facet_counts(self):
+        self.create_job_ad(job_type="FT", degree="BA")
+        self.create_job_ad(job_type="FT", degree="MA")
+        self.create_job_ad(job_type="PT", degree="BA")
+
+        response = self.client.get("/ads/job/search/?job_type=FT&degree=BA")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+
+        facets = response.data["facets"]
+        # شمارش هر وجه بدون اعمال فیلتر خود آن وجه محاسبه می‌شود
+        self.assertEqual(facets["job_type"], {"FT": 1, "PT": 1})
+        self.assertEqual(facets["degree"], {"BA": 1, "MA": 1})
+        self.assertEqual(facets["province"], {str(self.province.id): 1})
+
+    def test_invalid_integer_facet(self):
+        response = self.client.get("/ads/job/search/?industry=abc")
+        self.assertEqual(response.status_code, 400)
+
+
+class PersianFullTextSearchTest(AdvertisementTestMixin, TestCase):
+    """
+    تست نرمال‌سازی فارسی و جستجوی متن کامل آگهی‌ها.
+    """
+
+    def test_normalization(self):
+        # ی و ک عربی، نیم‌فاصله، اعراب و ارقام فارسی
+        self.assertEqual(normalize_persian("كتابي‌ها مُهندس ۱۲۳"), "کتابیها مهندس 123")
+
+    def test_search_matches_normalized_text(self):
+        match = self.create_job_ad(title="برنامه‌نویس پايتون", description="تهران")
+        self.create_job_ad(title="حسابدار")
+
+        response = self.client.get("/ads/job/search/?q=برنامهنویس پایتون")
+        self.assertEqual([item["id"] for item in response.data["results"]], [str(match.id)])
+
+        # پس از حذف آگهی، سند جستجو نیز حذف می‌شود
+        match.delete()
+        response = self.client.get("/ads/job/search/?q=پایتون")
+        self.assertEqual(response.data["results"], [])
+
+
+class AdCardTest(AdvertisementTestMixin, TestCase):
+    """
+    تست نگهداری تدریجی کارت‌های آگهی.
+    """
+
+    def test_card_follows_related_models(self):
+        ad = self.create_job_ad()
+        card = AdCard.objects.get(id=ad.id)
+        self.assertEqual(card.company_name, self.company.name)
+        self.assertEqual(card.province_name, self.province.name)
+
+        self.company.name = "نام جدید"
+        self.company.save()
+        self.city.name = "ری"
+        self.city.save()
+        card.refresh_from_db()
+        self.assertEqual(card.company_name, "نام جدید")
+        self.assertEqual(card.city_name, "ری")
+
+        ad.delete()
+        self.assertFalse(AdCard.objects.filter(id=ad.id).exists())
+
+    def test_list_reads_single_table(self):
+        for i in range(5):
+            self.create_job_ad(title=f"آگهی {i}")
+        with self.assertNumQueries(1):
+            response = self.client.get("/ads/job/")
+        self.assertEqual(len(response.data["results"]), 5)
+
+
+class JobAdvertisementBatchCreateTest(AdvertisementTestMixin, TestCase):
+    """
+    تست ایجاد دسته‌ای آگهی‌های کارفرما.
+    """
+
+    def test_batch_create_reports_per_item_results(self):
+        self.client.force_authenticate(self.employer)
+        payload = {"advertisements": [
+            {"title": "آگهی ۱", "company_id": str(self.company.id), "industry_id": self.industry.id},
+            {"title": "آگهی ۲", "company_id": str(self.company.id), "industry_id": 9999},
+            {"title": "آگهی ۳", "company_id": str(self.company.id), "industry_id": self.industry.id, "job_type": "FT"},
+        ]}
+        # دو کوئری واکشی (شرکت‌ها و صنایع) و هفت INSERT دسته‌ای به همراه SAVEPOINT تراکنش
+        with self.assertNumQueries(11):
+            response = self.client.post("/ads/job/batch/", payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item["index"] for item in response.data["created"]], [0, 2])
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+
+        created_ids = [item["id"] for item in response.data["created"]]
+        self.assertEqual(JobAdvertisement.objects.filter(id__in=created_ids).count(), 2)
+        self.assertEqual(AdCard.objects.filter(id__in=created_ids).count(), 2)
+
+    def test_client_supplied_id_is_ignored(self):
+        self.client.force_authenticate(self.employer)
+        existing = self.create_job_ad()
+        fresh_id = "8c1d2f0e-5b7a-4c3e-9f1a-2b3c4d5e6f70"
+        payload = {"advertisements": [
+            {"id": advertisement_id, "title": "آگهی", "company_id": str(self.company.id), "industry_id": self.industry.id}
+            for advertisement_id in (str(existing.id), fresh_id)
+        ]}
+        response = self.client.post("/ads/job/batch/", payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["errors"], [])
+        created_ids = {item["id"] for item in response.data["created"]}
+        self.assertEqual(len(created_ids), 2)
+        self.assertFalse(created_ids & {str(existing.id), fresh_id})
+        self.assertEqual(JobAdvertisement.objects.count(), 3)
+
+
+class BoundedQueriesMixin:
+    """
+    ابزار تست تعداد کوئری ثابت: یک endpoint با تعداد ردیف‌های متفاوت فراخوانی می‌شود
+    و تعداد کوئری‌ها باید در همه حالت‌ها برابر مقدار مورد انتظار باشد (جلوگیری از N+1).
+    """
+
+    def assertBoundedQueries(self, expected, url, make_row, sizes=(1, 10)):
+        created = 0
+        for size in sizes:
+            while created < size:
+                make_row()
+                created += 1
+            with self.assertNumQueries(expected):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+
+class AdvertisementQueryCountTest(BoundedQueriesMixin, AdvertisementTestMixin, TestCase):
+    """
+    تست ثابت بودن تعداد کوئری endpointهای آگهی مستقل از تعداد ردیف‌ها.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.job_seeker = self.create_job_seeker()
+
+    def test_job_list(self):
+        self.assertBoundedQueries(1, "/ads/job/", self.create_job_ad)
+
+    def test_job_search(self):
+        # یک کوئری نتایج و یک کوئری GROUP BY شمارش وجه‌ها
+        self.assertBoundedQueries(2, "/ads/job/search/?job_type=FT", lambda: self.create_job_ad(job_type="FT"))
+
+    def test_resume_list(self):
+        self.assertBoundedQueries(1, "/ads/resume/", lambda: self.create_resume_ad(self.job_seeker))
+
+    def test_application_list(self):
+        self.client.force_authenticate(self.employer)
+
+        def make_application():
+            Application.objects.create(
+                job_seeker=self.job_seeker,
+                advertisement=self.create_job_ad(),
+                resume=self.job_seeker.resume
+            )
+        self.assertBoundedQueries(1, "/ads/applications/", make_application)
+
+    def test_retrieve_endpoints(self):
+        job_ad = self.create_job_ad()
+        resume_ad = self.create_resume_ad(self.job_seeker)
+        # یک کوئری سبک updated_at (GET شرطی) و یک کوئری واکشی کامل
+        with self.assertNumQueries(2):
+            self.client.get(f"/ads/job/{job_ad.id}/")
+        with self.assertNumQueries(2):
+            self.client.get(f"/ads/resume/{resume_ad.id}/")
+
+    def test_conditional_retrieve(self):
+        job_ad = self.create_job_ad()
+        response = self.client.get(f"/ads/job/{job_ad.id}/")
+        etag = response["ETag"]
+
+        # پاسخ 304 تنها با کوئری updated_at
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/ads/job/{job_ad.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        job_ad.title = "عنوان جدید"
+        job_ad.save()
+        response = self.client.get(f"/ads/job/{job_ad.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_conditional_company_tracks_nested_rows_and_fieldsets(self):
+        self.client.force_authenticate(self.employer)
+        url = f"/companies/{self.company.id}/"
+        response = self.client.get(url)
+        etag = response["ETag"]
+        # نام شهر زمان بروزرسانی ندارد؛ تنها ETag معتبر است
+        self.assertNotIn("Last-Modified", response)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # نمایش دیگری از همان مسیر ETag متفاوتی دارد
+        partial = self.client.get(f"{url}?fields=id,name")
+        self.assertNotEqual(partial["ETag"], etag)
+        self.assertEqual(self.client.get(f"{url}?fields=name,id", HTTP_IF_NONE_MATCH=partial["ETag"]).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=partial["ETag"]).status_code, 200)
+
+        self.city.name = "تهران بزرگ"
+        self.city.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["location"]["name"], "تهران بزرگ")
+
+
+class CandidateMatchingTest(AdvertisementTestMixin, TestCase):
+    """
+    تست امتیازدهی برداری رزومه‌ها نسبت به آگهی کارفرما.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # ماتریس رزومه‌ها در حافظه پروسه نگهداری می‌شود
+        matching.invalidate_resume_matrix()
+
+    def test_best_matching_resume_ranks_first(self):
+        skill = Skill.objects.create(name="پایتون", industry=self.industry)
+
+        good = self.create_job_seeker("09120000002").resume
+        good.industry = self.industry
+        good.location = self.city
+        good.degree = "Master"
+        good.preferred_job_type = "Full-Time"
+        good.save()
+        JobSeekerSkill.objects.create(resume=good, skill=skill, level="expert")
+
+        weak = self.create_job_seeker("09120000003").resume
+
+        ad = self.create_job_ad(degree="BA", job_type="FT")
+        self.client.force_authenticate(self.employer)
+        response = self.client.get(f"/ads/job/{ad.id}/candidates/?k=5")
+        self.assertEqual(response.status_code, 200)
+        results = response.data["results"]
+        self.assertEqual([item["resume_id"] for item in results], [good.id, weak.id])
+        self.assertGreater(results[0]["score"], results[1]["score"])
+
+    def test_only_owner_can_match(self):
+        ad = self.create_job_ad()
+        self.client.force_authenticate(self.create_job_seeker())
+        response = self.client.get(f"/ads/job/{ad.id}/candidates/")
+        self.assertEqual(response.status_code, 403)
+
+
+class RecommendationTest(AdvertisementTestMixin, TestCase):
+    """
+    تست کش و ابطال پیشنهادهای شخصی‌سازی شده کارجو.
+    """
+
+    def setUp(self):
+        super().setUp()
+        recommendations.get_cache().clear()
+        self.job_seeker = self.create_job_seeker()
+        resume = self.job_seeker.resume
+        resume.industry = self.industry
+        resume.location = self.city
+        resume.save()
+        self.client.force_authenticate(self.job_seeker)
+
+    def test_ranked_cached_and_invalidated(self):
+        other_province = Province.objects.create(name="فارس")
+        far_city = City.objects.create(province=other_province, name="شیراز")
+        near = self.create_job_ad(title="نزدیک", status="A")
+        far = self.create_job_ad(title="دور", status="A", location=far_city)
+        self.create_job_ad(title="در حال بررسی")
+
+        response = self.client.get("/ads/job/recommended/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["id"] for item in response.data["results"]], [str(near.id), str(far.id)])
+
+        # بازدید مجدد از کش خوانده می‌شود
+        with self.assertNumQueries(0):
+            self.client.get("/ads/job/recommended/")
+
+        # تایید آگهی جدید در صنعت کارجو پس از commit کش را باطل می‌کند
+        with self.captureOnCommitCallbacks(execute=True):
+            newest = self.create_job_ad(title="جدید", status="A")
+        response = self.client.get("/ads/job/recommended/")
+        self.assertIn(str(newest.id), [item["id"] for item in response.data["results"]])
+
+    def test_only_job_seekers(self):
+        self.client.force_authenticate(self.employer)
+        response = self.client.get("/ads/job/recommended/")
+        self.assertEqual(response.status_code, 403)
+
+
+class ApplicationInboxTest(AdvertisementTestMixin, TestCase):
+    """
+    تست صندوق درخواست‌های کارفرما.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.ad = self.create_job_ad()
+        for index in range(5):
+            job_seeker = self.create_job_seeker(phone=f"0913000000{index}")
+            Application.objects.create(
+                job_seeker=job_seeker,
+                advertisement=self.ad,
+                resume=job_seeker.resume,
+                status="AC" if index == 0 else "PE",
+                viewed_by_employer=index < 2,
+            )
+        self.client.force_authenticate(self.employer)
+
+    def test_inbox_pages_and_counts(self):
+        seen = []
+        url = "/ads/applications/inbox/?page_size=2&status=PE"
+        while url:
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(item["id"] for item in response.data["results"])
+            cursor = response.data["next"]
+            url = f"/ads/applications/inbox/?page_size=2&status=PE&cursor={cursor}" if cursor else None
+        self.assertEqual(len(set(seen)), 4)
+
+        counts = response.data["counts"]
+        self.assertEqual(counts["status"]["PE"], 4)
+        self.assertEqual(counts["status"]["AC"], 1)
+        self.assertEqual(counts["unread"], 3)
+        self.assertEqual(counts["total"], 5)
+
+    def test_inbox_is_scoped_to_owner(self):
+        other_employer = User.objects.create_user(
+            phone="09120000009", user_type="EM", password="password123", full_name="other"
+        )
+        self.client.force_authenticate(other_employer)
+        response = self.client.get("/ads/applications/inbox/")
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(response.data["counts"]["total"], 0)
+
+        response = self.client.get("/ads/applications/inbox/?status=XX")
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_update_only_touches_owned_applications(self):
+        other_employer = User.objects.create_user(
+            phone="09120000009", user_type="EM", password="password123", full_name="other"
+        )
+        foreign_ad = self.create_job_ad(employer=other_employer)
+        foreign = Application.objects.create(
+            job_seeker=self.create_job_seeker("09130000009"),
+            advertisement=foreign_ad,
+        )
+        ids = [str(pk) for pk in Application.objects.values_list("id", flat=True)]
+
+        # تنها یک UPDATE با شرط مالکیت در همان کوئری
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                "/ads/applications/bulk/",
+                {"ids": ids, "status": "IR", "viewed_by_employer": True},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], 5)
+        self.assertEqual(Application.objects.filter(advertisement=self.ad, status="IR").count(), 5)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, "PE")
+        self.assertFalse(foreign.viewed_by_employer)
+
+        response = self.client.post("/ads/applications/bulk/", {"ids": ids}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class IdempotentApplicationTest(AdvertisementTestMixin, TestCase):
+    """
+    تست ارسال تکرارپذیر درخواست و جلوگیری از درخواست تکراری.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.ad = self.create_job_ad()
+        self.job_seeker = self.create_job_seeker()
+        self.client.force_authenticate(self.job_seeker)
+
+    def test_replay_returns_original_response(self):
+        payload = {"advertisement_id": str(self.ad.id), "cover_letter": "سلام"}
+        first = self.client.post("/ads/applications/", payload, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+        self.assertEqual(first.status_code, 201)
+
+        # درخواست تکراری بدون اجرای مسیر نوشتن پاسخ ذخیره شده را برمی‌گرداند
+        with self.assertNumQueries(0):
+            replay = self.client.post("/ads/applications/", payload, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay.data["id"], first.data["id"])
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+
+        response = self.client.post(
+            "/ads/applications/", {**payload, "cover_letter": "دیگر"}, format="json", HTTP_IDEMPOTENCY_KEY="abc"
+        )
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Application.objects.count(), 1)
+
+    def test_duplicate_without_key_is_rejected(self):
+        payload = {"advertisement_id": str(self.ad.id)}
+        self.assertEqual(self.client.post("/ads/applications/", payload, format="json").status_code, 201)
+        self.assertEqual(self.client.post("/ads/applications/", payload, format="json").status_code, 400)
+        self.assertEqual(Application.objects.count(), 1)
+
+
+class ListingResponseCacheTest(AdvertisementTestMixin, TestCase):
+    """
+    تست کش پاسخ لیست‌های عمومی و ابطال آن بر اساس خانواده کلید.
+    """
+
+    def test_cached_until_affected_family_changes(self):
+        job_seeker = self.create_job_seeker()
+        self.create_job_ad()
+        self.create_resume_ad(job_seeker)
+        self.assertEqual(self.client.get("/ads/job/?page_size=5").status_code, 200)
+        self.client.get("/ads/resume/")
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/ads/job/?page_size=5")
+        self.assertEqual(response["X-Cache"], "HIT")
+
+        # تغییر آگهی رزومه تنها خانواده رزومه را باطل می‌کند
+        self.create_resume_ad(self.create_job_seeker("09120000003"))
+        with self.assertNumQueries(0):
+            self.client.get("/ads/job/?page_size=5")
+        response = self.client.get("/ads/resume/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data["results"]), 2)
+
+        # تغییر شرکت خانواده آگهی‌های کارفرما را باطل می‌کند
+        self.company.name = "نام جدید"
+        self.company.save()
+        response = self.client.get("/ads/job/?page_size=5")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["company_name"], "نام جدید")
+
+    def test_normalized_params_share_key(self):
+        self.create_job_ad(job_type="FT")
+        self.client.get("/ads/job/search/?job_type=FT,PT&degree=BA")
+        with self.assertNumQueries(0):
+            response = self.client.get("/ads/job/search/?degree=BA&job_type=PT&job_type=FT")
+        self.assertEqual(response["X-Cache"], "HIT")
+
+
+class SubscriptionExpiryTest(AdvertisementTestMixin, TestCase):
+    """
+    تست منقضی شدن اشتراک آگهی‌ها.
+    """
+
+    def test_expired_ads_leave_the_feed(self):
+
+        active = self.create_job_ad(title="فعال")
+        expired = self.create_job_ad(title="منقضی")
+        subscription = expired.advertisement.subscription
+        subscription.subscription_status = AdvertisementSubscription.SubscriptionStatus.SPECIAL
+        subscription.end_date = timezone.now() - timedelta(days=1)
+        subscription.save()
+        self.assertFalse(subscription.is_active())
+        self.assertEqual(AdvertisementSubscription.objects.active().count(), 1)
+
+        # حتی پیش از اجرای sweeper، شرط تاریخ پایان آگهی منقضی را از لیست حذف می‌کند
+        response = self.client.get("/ads/job/")
+        self.assertEqual([item["id"] for item in response.data["results"]], [str(active.id)])
+
+        self.assertEqual(expire_subscriptions(batch_size=1), 1)
+        subscription.refresh_from_db()
+        self.assertEqual(subscription.subscription_status, AdvertisementSubscription.SubscriptionStatus.EXPIRED)
+        expired.refresh_from_db()
+        self.assertFalse(expired.is_boosted)
+        self.assertEqual(AdCard.objects.get(id=expired.id).subscription_status, "expired")
+        self.assertEqual(expire_subscriptions(), 0)
+
+
+class ViewCounterTest(AdvertisementTestMixin, TestCase):
+    """
+    تست شمارنده بازدید با بافر نوشتن.
+    """
+
+    def test_views_are_buffered_then_flushed(self):
+        ad = self.create_job_ad()
+        for _ in range(3):
+            response = self.client.get(f"/ads/job/{ad.id}/")
+        # تعداد فعلی پیش از flush قابل خواندن است
+        self.assertEqual(response.data["views"], 3)
+        ad.refresh_from_db()
+        self.assertEqual(ad.views, 0)
+
+        self.assertEqual(counters.flush(), 3)
+        ad.refresh_from_db()
+        self.assertEqual(ad.views, 3)
+        response = self.client.get(f"/ads/job/{ad.id}/")
+        self.assertEqual(response.data["views"], 4)
+
+    def test_views_lag_behind_conditional_responses(self):
+        ad = self.create_job_ad()
+        url = f"/ads/job/{ad.id}/"
+        etag = self.client.get(url)["ETag"]
+        # بازدید جزو ETag نیست: اعتبارسنجی مجدد 304 می‌گیرد و درخواست بدون شرط مقدار تازه را
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        response = self.client.get(url)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.data["views"], 3)
+
+    def test_command_flushes_views_of_other_processes(self):
+        ad = self.create_job_ad()
+        resume_ad = self.create_resume_ad(self.create_job_seeker())
+        self.client.get(f"/ads/job/{ad.id}/")
+        self.client.get(f"/ads/job/{ad.id}/")
+        self.client.get(f"/ads/resume/{resume_ad.id}/")
+        # بازدیدهای ثبت شده توسط پروسه دیگر تنها در کش مشترک هستند
+        counters._dirty.clear()
+        self.assertEqual(counters.flush(), 0)
+
+        call_command("flush_ad_views", stdout=io.StringIO())
+        ad.refresh_from_db()
+        resume_ad.refresh_from_db()
+        self.assertEqual((ad.views, resume_ad.views), (2, 1))
+        self.assertEqual(counters.pending_views(Advertisement.TypeChoices.JOB, ad.pk), 0)
+
+    def test_unwritten_log_slot_is_retried(self):
+        ad = self.create_job_ad()
+        # خانه لاگ رزرو شده ولی هنوز نوشته نشده (incr همزمان با flush)
+        slot = counters.incr(counters.LOG_HEAD_KEY)
+        counters.incr(counters.counter_key(Advertisement.TypeChoices.JOB, ad.pk))
+        self.assertEqual(counters.flush_all(), 0)
+        cache.set(counters.log_key(slot), (Advertisement.TypeChoices.JOB, ad.pk), None)
+        self.assertEqual(counters.flush_all(), 1)
+        ad.refresh_from_db()
+        self.assertEqual(ad.views, 1)
+
+    def test_evicted_counter_is_not_an_error(self):
+        ad = self.create_job_ad()
+        self.client.get(f"/ads/job/{ad.id}/")
+        with mock.patch.object(counters.cache, "decr", side_effect=ValueError):
+            self.assertEqual(counters.flush(), 1)
+        ad.refresh_from_db()
+        self.assertEqual(ad.views, 1)
+
+
+class ProvinceFilterTest(AdvertisementTestMixin, TestCase):
+    """
+    تست فیلتر استان با گسترش به شهرهای آن.
+    """
+
+    def test_province_filter_expands_to_cities(self):
+        other_city = City.objects.create(province=self.province, name="ری")
+        far_province = Province.objects.create(name="فارس")
+        far_city = City.objects.create(province=far_province, name="شیراز")
+        job_seeker = self.create_job_seeker()
+        near = self.create_resume_ad(job_seeker)
+        near.location = other_city
+        near.save()
+        self.create_resume_ad(self.create_job_seeker("09120000003"))
+
+        response = self.client.get(f"/ads/resume/search/?province={self.province.id}")
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(self.client.get(f"/ads/resume/search/?province={far_province.id}").data["results"], [])
+
+        job = self.create_job_ad(location=far_city)
+        response = self.client.get(f"/ads/job/search/?province={far_province.id}")
+        self.assertEqual([item["id"] for item in response.data["results"]], [str(job.id)])
+
+        # نگاشت تا زمان باطل شدن ثابت می‌ماند
+        self.assertEqual(province_map.cities_in([far_province.id]), [far_city.id])
+        new_city = City.objects.create(province=far_province, name="مرودشت")
+        self.assertEqual(province_map.cities_in([far_province.id]), [far_city.id])
+        province_map.invalidate()
+        self.assertEqual(province_map.cities_in([far_province.id]), [far_city.id, new_city.id])
+
+
+
+class SimilarJobsTest(AdvertisementTestMixin, TestCase):
+    """
+    تست آگهی‌های مشابه با MinHash / LSH.
+    """
+
+    def test_similar_jobs(self):
+        description = "توسعه سرویس‌های وب با پایتون و جنگو، طراحی API و کار با پایگاه داده پستگرس در تیم محصول"
+        source = self.create_job_ad(title="برنامه‌نویس پایتون", description=description, status="A")
+        near = self.create_job_ad(title="برنامه نویس پایتون ارشد", description=description + " به صورت تمام وقت", status="A")
+        self.create_job_ad(title="حسابدار", description="تهیه صورت‌های مالی، ثبت اسناد حسابداری و تسویه حساب با مشتریان", status="A")
+        # آگهی‌های تقریباً تکراری رد شده یا در حال بررسی پیشنهاد نمی‌شوند
+        self.create_job_ad(title="برنامه‌نویس پایتون", description=description, status="R")
+        self.create_job_ad(title="برنامه‌نویس پایتون", description=description)
+
+        response = self.client.get(f"/ads/job/{source.id}/similar/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["id"] for item in response.data["results"]], [str(near.id)])
+        self.assertGreater(response.data["results"][0]["similarity"], 0.5)
+
+        # ویرایش متن آگهی ایندکس را به‌روز می‌کند
+        near.title = "حسابدار"
+        near.description = "تهیه صورت‌های مالی، ثبت اسناد حسابداری و تسویه حساب با مشتریان"
+        near.save()
+        self.assertEqual(self.client.get(f"/ads/job/{source.id}/similar/").data["results"], [])
+
+    def test_signature_is_stable(self):
+        first = compute_signature("برنامه‌نویس پايتون", "جنگو")
+        # نرمال‌سازی فارسی پیش از ساخت shingleها
+        self.assertTrue((first == compute_signature("برنامهنویس پایتون", "جنگو")).all())
+
+
+
+class ModerationQueueTest(AdvertisementTestMixin, TestCase):
+    """
+    تست صف بررسی آگهی‌ها و تایید/رد دسته‌ای.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_user(
+            phone="09120000099",
+            user_type="EM",
+            password="password123",
+            full_name="admin",
+            is_admin=True
+        )
+
+    def test_queue_is_staff_only_and_oldest_first(self):
+        first = self.create_job_ad(title="اول")
+        resume = self.create_resume_ad(self.create_job_seeker())
+        self.create_job_ad(title="تایید شده", status="A")
+        last = self.create_job_ad(title="آخر")
+
+        self.client.force_authenticate(self.employer)
+        self.assertEqual(self.client.get("/ads/moderation/").status_code, 403)
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get("/ads/moderation/?page_size=2")
+        self.assertEqual([item["id"] for item in response.data["results"]], [str(first.id), str(resume.id)])
+        response = self.client.get(f"/ads/moderation/?page_size=2&cursor={response.data['next']}")
+        self.assertEqual([item["id"] for item in response.data["results"]], [str(last.id)])
+        self.assertIsNone(response.data["next"])
+
+        response = self.client.get("/ads/moderation/?kind=R")
+        self.assertEqual([item["id"] for item in response.data["results"]], [str(resume.id)])
+
+    def test_batch_decision(self):
+        jobs = [self.create_job_ad(title=f"آگهی {index}") for index in range(3)]
+        resume = self.create_resume_ad(self.create_job_seeker())
+        rejected = self.create_job_ad(title="رد شده", status="R")
+        ids = [str(job.id) for job in jobs] + [str(resume.id), str(rejected.id)]
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.post("/ads/moderation/", {"ids": ids, "status": "A"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        # آگهی رد شده در صف نبوده و تغییر نمی‌کند
+        self.assertEqual(response.data, {"updated": 4, "job": 3, "resume": 1})
+        self.assertEqual(JobAdvertisement.objects.filter(status="A").count(), 3)
+        self.assertEqual(JobAdvertisement.objects.get(id=rejected.id).status, "R")
+        self.assertEqual(ResumeAdvertisement.objects.get(id=resume.id).status, "A")
+        self.assertFalse(AdCard.objects.filter(status="P").exists())
+        self.assertEqual(self.client.get("/ads/moderation/").data["results"], [])
+
+        # تصمیم دوباره روی آگهی‌های بررسی شده اثری ندارد
+        response = self.client.post("/ads/moderation/", {"ids": ids, "status": "R"}, format="json")
+        self.assertEqual(response.data["updated"], 0)
+
+        response = self.client.post("/ads/moderation/", {"ids": ids, "status": "P"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+
+class AdvertisementExportTest(AdvertisementTestMixin, TestCase):
+    """
+    تست خروجی NDJSON آگهی‌های تایید شده.
+    """
+
+    def read(self, response):
+        body = b''.join(response.streaming_content)
+        if response["Content-Type"] == "application/gzip":
+            body = gzip.decompress(body)
+        return [json.loads(line) for line in body.decode("utf-8").splitlines()]
+
+    def test_export_streams_approved_ads(self):
+        first = self.create_job_ad(title="اول", status="A")
+        second = self.create_job_ad(title="دوم", status="A", description="توضیحات")
+        self.create_job_ad(title="در حال بررسی")
+
+        # خروجی کامل کاتالوگ برای کاربر ناشناس و غیر کارمند در دسترس نیست
+        self.assertIn(self.client.get("/ads/job/export/").status_code, (401, 403))
+        self.client.force_authenticate(self.employer)
+        self.assertEqual(self.client.get("/ads/job/export/").status_code, 403)
+        self.client.force_authenticate(User.objects.create_user(
+            phone="09120000099", user_type="EM", password="password123", full_name="admin", is_admin=True
+        ))
+
+        response = self.client.get("/ads/job/export/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = self.read(response)
+        self.assertEqual([row["id"] for row in rows], [str(first.id), str(second.id)])
+        self.assertEqual(rows[1]["company_name"], self.company.name)
+        self.assertEqual(rows[1]["province_name"], self.province.name)
+
+        # دریافت تدریجی: تنها آگهی‌های بروزرسانی شده پس از مرز خروجی قبلی
+        until = response["X-Export-Until"]
+        first.title = "اول ویرایش شده"
+        first.save()
+        response = self.client.get("/ads/job/export/", {"since": until, "gzip": "1"})
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertEqual([row["title"] for row in self.read(response)], ["اول ویرایش شده"])
+
+        self.assertEqual(self.client.get("/ads/job/export/?since=yesterday").status_code, 400)
+
+
+
+class SitemapTest(AdvertisementTestMixin, TestCase):
+    """
+    تست تولید تدریجی نقشه سایت تکه‌تکه.
+    """
+
+    def setUp(self):
+        super().setUp()
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        sitemap_settings = self.settings(SITEMAP_ROOT=root, SITEMAP_SHARD_SIZE=2, SITEMAP_SITE_URL="https://jobs.test")
+        sitemap_settings.enable()
+        self.addCleanup(sitemap_settings.disable)
+        # بدون همپوشانی watermark تا تنها تکه‌های تغییر کرده بازنویسی شوند
+        overlap = mock.patch.object(sitemaps, "WATERMARK_OVERLAP", timedelta(0))
+        overlap.start()
+        self.addCleanup(overlap.stop)
+        self.root = root
+        self.sitemaps = sitemaps
+
+    def locations(self, filename):
+        namespace = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+        tree = ElementTree.parse(f"{self.root}/{filename}")
+        return [element.text for element in tree.getroot().findall(".//sm:loc", namespace)]
+
+    def job_urls(self):
+        urls = []
+        for index_url in self.locations("sitemap.xml"):
+            filename = index_url.rsplit("/", 1)[1]
+            if filename.startswith("jobs-"):
+                self.assertTrue(os.path.exists(f"{self.root}/{filename}"))
+                urls.extend(self.locations(filename))
+        return urls
+
+    def test_incremental_generation(self):
+        jobs = [self.create_job_ad(title=f"آگهی {index}", status="A") for index in range(3)]
+        self.create_job_ad(title="در حال بررسی")
+
+        self.assertEqual(self.sitemaps.generate(), {"jobs": 1, "companies": 1})
+        self.assertEqual(self.job_urls(), [f"https://jobs.test/jobs/{job.id}/" for job in jobs])
+        self.assertEqual(len(self.locations("sitemap.xml")), 3)
+        self.assertIn(f"https://jobs.test/companies/{self.company.id}/", self.locations("companies-1.xml"))
+
+        # بدون تغییر، هیچ تکه‌ای بازنویسی نمی‌شود
+        self.assertEqual(self.sitemaps.generate(), {"jobs": 0, "companies": 0})
+
+        # آگهی جدید تنها آخرین تکه را تغییر می‌دهد و تکه پر شده تقسیم می‌شود
+        jobs.append(self.create_job_ad(title="جدید", status="A"))
+        jobs.append(self.create_job_ad(title="جدیدتر", status="A"))
+        self.assertEqual(self.sitemaps.generate(), {"jobs": 1, "companies": 0})
+        self.assertEqual(self.job_urls(), [f"https://jobs.test/jobs/{job.id}/" for job in jobs])
+        self.assertEqual(len(self.locations("sitemap.xml")), 4)
+
+        # رد شدن آگهی آن را از تکه خودش حذف می‌کند
+        jobs[0].status = "R"
+        jobs[0].save()
+        self.assertEqual(self.sitemaps.generate(), {"jobs": 1, "companies": 0})
+        self.assertEqual(self.job_urls(), [f"https://jobs.test/jobs/{job.id}/" for job in jobs[1:]])
+
+        # حذف آگهی تنها با ساخت کامل اعمال می‌شود
+        jobs[1].delete()
+        self.sitemaps.generate(full=True)
+        self.assertEqual(self.job_urls(), [f"https://jobs.test/jobs/{job.id}/" for job in jobs[2:]])
+
+
+
+class ChangeFeedTest(AdvertisementTestMixin, TestCase):
+    """
+    تست فید تغییرات (همگام‌سازی تدریجی) آگهی‌های کارفرما.
+    """
+
+    def setUp(self):
+        super().setUp()
+        feed_settings = self.settings(CHANGE_FEED_LAG=0)
+        feed_settings.enable()
+        self.addCleanup(feed_settings.disable)
+
+    def sync(self, token=None):
+        results = []
+        while True:
+            response = self.client.get("/ads/job/changes/", {"since": token} if token else {})
+            self.assertEqual(response.status_code, 200)
+            results.extend((item["op"], str(item["id"])) for item in response.data["results"])
+            token = response.data["next"]
+            if not response.data["has_more"]:
+                return results, token
+
+    def test_delta_sync(self):
+        first = self.create_job_ad(title="اول", status="A")
+        second = self.create_job_ad(title="دوم")
+
+        # همگام‌سازی اولیه تنها آگهی‌های منتشر شده را برمی‌گرداند
+        results, token = self.sync()
+        self.assertEqual(results, [("upsert", str(first.id))])
+        self.assertEqual(self.sync(token), ([], token))
+
+        # تایید، رد و حذف آگهی‌ها
+        second.status = "A"
+        second.save()
+        first.status = "R"
+        first.save()
+        third = self.create_job_ad(title="سوم", status="A")
+        results, token = self.sync(token)
+        self.assertEqual(results, [
+            ("upsert", str(second.id)), ("delete", str(first.id)), ("upsert", str(third.id)),
+        ])
+
+        second_id = str(second.id)
+        second.delete()
+        results, token = self.sync(token)
+        self.assertEqual(results, [("delete", second_id)])
+
+    def test_card_data_changes_are_synced(self):
+        ad = self.create_job_ad(status="A")
+        _, token = self.sync()
+
+        # تغییر نام شرکت یا شهر updated_at آگهی را نیز به‌روز می‌کند
+        self.company.name = "شرکت جدید"
+        self.company.save()
+        response = self.client.get("/ads/job/changes/", {"since": token})
+        self.assertEqual([(item["op"], str(item["id"])) for item in response.data["results"]], [("upsert", str(ad.id))])
+        self.assertEqual(response.data["results"][0]["data"]["company_name"], "شرکت جدید")
+
+        self.city.name = "کرج"
+        self.city.save()
+        results, _ = self.sync(response.data["next"])
+        self.assertEqual(results, [("upsert", str(ad.id))])
+
+    def test_paging_and_invalid_token(self):
+        ads = [self.create_job_ad(title=f"آگهی {index}", status="A") for index in range(3)]
+        with self.settings(CHANGE_FEED_PAGE_SIZE=1):
+            response = self.client.get("/ads/job/changes/")
+            self.assertTrue(response.data["has_more"])
+            results, _ = self.sync()
+        self.assertEqual(results, [("upsert", str(ad.id)) for ad in ads])
+
+        self.assertEqual(self.client.get("/ads/job/changes/?since=invalid").status_code, 400)
+
+
+
+class SparseFieldsetTest(AdvertisementTestMixin, TestCase):
+    """
+    تست ?fields= / ?omit= و defer ستون‌های حذف شده در کوئری.
+    """
+
+    def selected_columns(self, context):
+        return " ".join(query["sql"].split(" FROM ")[0] for query in context.captured_queries)
+
+    def test_retrieve_defers_omitted_columns(self):
+        job = self.create_job_ad(title="برنامه‌نویس", description="توضیحات طولانی")
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f"/ads/job/{job.id}/?fields=id,title")
+        self.assertEqual(set(response.data), {"id", "title"})
+        self.assertNotIn('"Advertisements_jobadvertisement"."description"', self.selected_columns(context))
+
+        response = self.client.get(f"/ads/job/{job.id}/?omit=description")
+        self.assertNotIn("description", response.data)
+        self.assertIn("views", response.data)
+
+        response = self.client.get(f"/ads/job/{job.id}/?fields=id,unknown")
+        self.assertEqual(response.status_code, 400)
+
+    def test_list_fieldsets(self):
+        self.create_job_ad(title="اول")
+        self.create_job_ad(title="دوم")
+
+        response = self.client.get("/ads/job/?fields=id,title&page_size=1")
+        self.assertEqual(set(response.data["results"][0]), {"id", "title"})
+        # صفحه‌بندی keyset با ستون‌های کلید defer نشده ادامه می‌یابد
+        response = self.client.get(f"/ads/job/?fields=id,title&page_size=1&cursor={response.data['next']}")
+        self.assertEqual(response.data["results"][0]["title"], "اول")
+
+        self.client.force_authenticate(self.employer)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/companies/?omit=description,address")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("description", response.data[0])
+        columns = self.selected_columns(context)
+        self.assertNotIn('"Companies_company"."description"', columns)
+        self.assertNotIn('"Companies_company"."address"', columns)
+
+
+
+class SavedSearchAlertTest(AdvertisementTestMixin, TestCase):
+    """
+    تست جستجوهای ذخیره شده، تطبیق آگهی‌های تایید شده (ایندکس معکوس) و ارسال دسته‌ای هشدارها.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.job_seeker = self.create_job_seeker()
+        self.other_city = City.objects.create(province=self.province, name="شهریار")
+
+    def save_search(self, user, **data):
+        self.client.force_authenticate(user)
+        response = self.client.post("/ads/saved-searches/", data, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        return SavedSearch.objects.get(id=response.data["id"])
+
+    def test_only_matching_searches_are_alerted_on_approval(self):
+        python_here = self.save_search(self.job_seeker, keywords="پايتون", city=self.city.id)
+        industry = self.save_search(self.job_seeker, industry=self.industry.id)
+        elsewhere = self.save_search(self.job_seeker, city=self.other_city.id)
+        java = self.save_search(self.job_seeker, keywords="جاوا")
+        self.assertEqual(python_here.anchor, "kw:پایتون")
+        self.assertEqual(industry.anchor, f"industry:{self.industry.id}")
+
+        ad = self.create_job_ad(title="برنامه‌نویس پایتون", description="توسعه بک‌اند")
+        self.assertFalse(SearchAlert.objects.exists())
+
+        admin = User.objects.create_user(
+            phone="09120000099", user_type="EM", password="password123", full_name="admin", is_admin=True
+        )
+        self.client.force_authenticate(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/ads/moderation/", {"ids": [str(ad.id)], "status": "A"}, format="json")
+            # تطبیق هشدارها پس از commit تصمیم
+            self.assertFalse(SearchAlert.objects.exists())
+
+        alerted = set(SearchAlert.objects.filter(job_advertisement=ad).values_list("saved_search_id", flat=True))
+        self.assertEqual(alerted, {python_here.id, industry.id})
+        self.assertNotIn(elsewhere.id, alerted)
+        self.assertNotIn(java.id, alerted)
+
+        # ویرایش آگهی تایید شده هشدار تکراری ایجاد نمی‌کند
+        ad.title = "برنامه‌نویس ارشد پایتون"
+        ad.save()
+        self.assertEqual(SearchAlert.objects.count(), 2)
+
+    def test_batch_created_approved_ads_are_alerted(self):
+        search = self.save_search(self.job_seeker, industry=self.industry.id)
+        admin = User.objects.create_user(
+            phone="09120000099", user_type="EM", password="password123", full_name="admin", is_admin=True
+        )
+        self.client.force_authenticate(admin)
+        payload = {"advertisements": [
+            {"title": title, "company_id": str(self.company.id), "industry_id": self.industry.id, "status": status}
+            for title, status in (("تایید شده", "A"), ("در حال بررسی", "P"))
+        ]}
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/ads/job/batch/", payload, format="json")
+            # تطبیق هشدارها تا commit تراکنش ایجاد دسته‌ای به تعویق می‌افتد
+            self.assertFalse(SearchAlert.objects.exists())
+        self.assertEqual(response.status_code, 201)
+
+        approved_id = response.data["created"][0]["id"]
+        alerted = SearchAlert.objects.filter(saved_search=search).values_list("job_advertisement_id", flat=True)
+        self.assertEqual([str(pk) for pk in alerted], [approved_id])
+
+    def test_flush_sends_one_digest_per_job_seeker(self):
+        other = self.create_job_seeker(phone="09120000003")
+        self.save_search(self.job_seeker, industry=self.industry.id)
+        self.save_search(self.job_seeker, city=self.city.id)
+        self.save_search(other)
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.create_job_ad(title="اول", status="A")
+            second = self.create_job_ad(title="دوم", status="A")
+        self.assertEqual(SearchAlert.objects.count(), 6)
+
+        digests = []
+        self.assertEqual(alerts.flush(digests.append, batch_size=1), 2)
+        by_user = {digest.job_seeker_id: digest for digest in digests}
+        self.assertEqual(set(by_user), {self.job_seeker.id, other.id})
+        self.assertEqual(sorted(by_user[self.job_seeker.id].advertisement_ids), sorted([first.id, second.id]))
+        self.assertEqual(by_user[other.id].phone, "09120000003")
+
+        self.assertFalse(SearchAlert.objects.filter(sent_at__isnull=True).exists())
+        self.assertEqual(alerts.flush(digests.append), 0)
+
+    def test_saved_searches_are_job_seeker_only_and_private(self):
+        self.client.force_authenticate(self.employer)
+        self.assertEqual(self.client.get("/ads/saved-searches/").status_code, 403)
+
+        search = self.save_search(self.job_seeker, name="پایتون", keywords="پایتون")
+        self.client.force_authenticate(self.create_job_seeker(phone="09120000003"))
+        self.assertEqual(self.client.get("/ads/saved-searches/").data, [])
+        self.assertEqual(self.client.delete(f"/ads/saved-searches/{search.id}/").status_code, 404)
+
+        self.client.force_authenticate(self.job_seeker)
+        response = self.client.patch(f"/ads/saved-searches/{search.id}/", {"keywords": "", "city": self.city.id}, format="json")
+        self.assertEqual(response.status_code, 200)
+        search.refresh_from_db()
+        self.assertEqual(search.anchor, f"city:{self.city.id}")
+
+
+class SharedCacheCheckTest(TestCase):
+    """
+    تست بررسی استقرار: کش‌های وابسته به اشتراک بین پروسه‌ها نباید LocMemCache باشند.
+    """
+
+    def test_process_local_cache_fails_deploy_check(self):
+        self.assertEqual({error.id for error in check_shared_caches(None)}, {"Server.E001"})
+        shared = {
+            alias: {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://localhost:6379/0"}
+            for alias in ("default", "recommendations")
+        }
+        with override_settings(CACHES=shared):
+            self.assertEqual(check_shared_caches(None), [])
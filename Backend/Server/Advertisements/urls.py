@@ -1,7 +1,7 @@
 from django.urls import path, include  
 # ایمپورت توابع path و include برای تعریف الگوهای URL
 
-from Advertisements.routers import JobAdvertisementRouter, ResumeAdvertisementRouter, ApplicationRouter  
+from Advertisements.routers import JobAdvertisementRouter, ResumeAdvertisementRouter, ApplicationRouter, ModerationRouter, SavedSearchRouter  
 # ایمپورت روترهای سفارشی مربوط به اپ آگهی‌ها از ماژول routers
 
 
@@ -13,6 +13,8 @@ app_name = "Advertisements"  # تعریف فضای نام (namespace) برای 
 job_ad_router = JobAdvertisementRouter()
 resume_ad_router = ResumeAdvertisementRouter()
 applications_router = ApplicationRouter()
+moderation_router = ModerationRouter()
+saved_search_router = SavedSearchRouter()
 
 
 urlpatterns = [
@@ -26,5 +28,11 @@ urlpatterns = [
     
     # مسیر 'applications/' شامل URLهای مربوط به درخواست‌ها (Application) می‌باشد؛
     # از طریق applications_router.get_urls()، URLهای مربوط به عملیات CRUD بر روی درخواست‌ها مدیریت می‌شود.
-    path('applications/', include(applications_router.get_urls()))
+    path('applications/', include(applications_router.get_urls())),
+
+    # مسیر 'moderation/' صف بررسی آگهی‌های کارفرما و رزومه و تایید/رد دسته‌ای آن‌ها (فقط admin)
+    path('moderation/', include(moderation_router.get_urls())),
+
+    # مسیر 'saved-searches/' جستجوهای ذخیره شده کارجو جهت دریافت هشدار آگهی‌های جدید منطبق
+    path('saved-searches/', include(saved_search_router.get_urls()))
 ]
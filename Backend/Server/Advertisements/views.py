@@ -1,29 +1,125 @@
+from django.conf import settings
+
+from django.http import StreamingHttpResponse
+
+from django.utils import timezone
+
 from rest_framework import viewsets, permissions, status
 
 from rest_framework.response import Response
 
 from rest_framework.generics import get_object_or_404 
 
+from Server.conditional import ConditionalGet
+
+from Server.fieldsets import Fieldset
+
 from Profiles.models import JobSeekerProfile
 
-from .models import JobAdvertisement, ResumeAdvertisement, Application
+from Resumes.models import JobSeekerResume
+
+from .models import JobAdvertisement, ResumeAdvertisement, Application, AdCard, SavedSearch, StatusChoices
+
+from .serializers import (
+    Advertisement,
+    JobAdvertisementSerializer,
+    JobAdvertisementBatchSerializer,
+    ResumeAdvertisementSerializer,
+    ApplicationSerializer,
+    ApplicationBulkUpdateSerializer,
+    AdCardSerializer,
+    ModerationDecisionSerializer,
+    SavedSearchSerializer,
+)
+
+from .pagination import KeysetPagination
+
+from .search import JobAdvertisementSearch, ResumeAdvertisementSearch
+
+from .inbox import ApplicationInbox
+
+from . import cards, counters
 
-from .serializers import Advertisement, JobAdvertisementSerializer, ResumeAdvertisementSerializer, ApplicationSerializer
+from . import matching
+
+from . import similarity
+
+from . import export
+
+from . import changes as ad_changes
+
+from . import recommendations
+
+from .idempotency import idempotent
+
+from . import response_cache
+
+from .response_cache import cached_response
 
 
 class JobAdvertisementViewSet(viewsets.ViewSet):
+
+    # برنامه واکشی روابط: تمام روابط مورد نیاز سریالایزر، __str__ و بررسی مالکیت با یک JOIN واکشی می‌شوند
+    queryset = JobAdvertisement.objects.select_related(
+        'advertisement__subscription',
+        'company',
+        'employer',
+        'industry',
+        'location__province',
+    )
     
+    # ترتیب فید: آگهی‌های ویژه، سپس جدیدترین‌ها؛ id جهت پایداری ترتیب
+    feed_ordering = ('-is_boosted', '-created_at', '-id')
+    # ستون‌های کلید صفحه‌بندی که با ?fields= نیز defer نمی‌شوند
+    feed_fields = ('is_boosted', 'created_at', 'id')
+
+    @cached_response(response_cache.JOB)
     def list(self, request):
-        # دریافت تمامی نمونه‌های JobAdvertisement (آگهی‌های کارفرما)
-        queryset = JobAdvertisement.objects.all()
-        # سریالایز کردن لیست آگهی‌های کارفرما
-        serializer = JobAdvertisementSerializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # دریافت کارت آگهی‌های کارفرما (جدول تخت بدون join) به صورت صفحه‌بندی شده (keyset) با cursor
+        fieldset = Fieldset.from_request(request)
+        queryset = cards.active(AdCard.objects.filter(kind=Advertisement.TypeChoices.JOB))
+        queryset = fieldset.project(queryset, AdCardSerializer, keep=self.feed_fields)
+        paginator = KeysetPagination(ordering=self.feed_ordering)
+        page = paginator.paginate_queryset(queryset, request)
+        # سریالایز کردن تنها آگهی‌های همین صفحه
+        serializer = AdCardSerializer(page, many=True, fieldset=fieldset)
+        return paginator.get_paginated_response(serializer.data)
+
+    @cached_response(response_cache.JOB)
+    def search(self, request):
+        # جستجوی چندوجهی: نتایج فیلتر شده و صفحه‌بندی شده به همراه شمارش هر وجه
+        search = JobAdvertisementSearch(request.query_params)
+        fieldset = Fieldset.from_request(request)
+        queryset = cards.active(AdCard.objects.filter(kind=Advertisement.TypeChoices.JOB))
+        paginator = KeysetPagination(ordering=self.feed_ordering)
+        page = paginator.paginate_queryset(
+            fieldset.project(search.filter(queryset), AdCardSerializer, keep=self.feed_fields), request
+        )
+        serializer = AdCardSerializer(page, many=True, fieldset=fieldset)
+        response = paginator.get_paginated_response(serializer.data)
+        # شمارش وجه‌ها با یک کوئری GROUP BY
+        response.data['facets'] = search.facet_counts(queryset)
+        return response
     
     def retrieve(self, request, pk):
-        query = get_object_or_404(JobAdvertisement, id=pk)
-        serializer = JobAdvertisementSerializer(query)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # پاسخ 304 از روی updated_at، پیش از واکشی روابط و سریالایز کردن
+        conditional = ConditionalGet(request, JobAdvertisement.objects, id=pk)
+        if conditional.row is not None:
+            # ثبت بازدید در بافر کش (بدون UPDATE دیتابیس به ازای هر بازدید)
+            counters.record_view(Advertisement.TypeChoices.JOB, conditional.row['pk'])
+        # views جزو ETag نیست (هر بازدید updated_at را تغییر نمی‌دهد)؛ پاسخ 304 مقدار views ذخیره شده کلاینت را
+        # معتبر نگه می‌دارد و این مقدار تا تغییر بعدی آگهی ممکن است عقب باشد (ر.ک. counters)
+        not_modified = conditional.not_modified()
+        if not_modified:
+            return not_modified
+        # ستون‌های فیلدهای درخواست نشده (?fields= / ?omit=) از دیتابیس خوانده نمی‌شوند
+        fieldset = Fieldset.from_request(request)
+        query = get_object_or_404(fieldset.project(self.queryset, JobAdvertisementSerializer), id=pk)
+        serializer = JobAdvertisementSerializer(query, fieldset=fieldset)
+        data = serializer.data
+        if 'views' in serializer.fields:
+            data['views'] = counters.current_views(Advertisement.TypeChoices.JOB, query)
+        return conditional.finalize(Response(data, status=status.HTTP_200_OK))
     
     def create(self, request):
         # بررسی می‌شود که کاربر دارای نوع کاربری (user_type) "EM" (کارفرما) است.
@@ -38,9 +134,127 @@ class JobAdvertisementViewSet(viewsets.ViewSet):
             # اگر کاربر کارفرما نباشد، ارسال پیام خطا
             return Response({"Massage": "You are not a employer."}, status=status.HTTP_403_FORBIDDEN)
 
+    def batch_create(self, request):
+        # ایجاد دسته‌ای آگهی‌های کارفرما در یک درخواست و یک تراکنش
+        if request.user.user_type == "EM" or request.user.is_staff:
+            serializer = JobAdvertisementBatchSerializer(data=request.data, context={'request': request})
+            if serializer.is_valid():
+                result = serializer.save()
+                # در صورتی که هیچ آگهی ایجاد نشود، خطاهای هر آیتم با کد 400 برگردانده می‌شود
+                if result['created']:
+                    return Response(result, status=status.HTTP_201_CREATED)
+                return Response(result, status=status.HTTP_400_BAD_REQUEST)
+            else:
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            return Response({"Massage": "You are not a employer."}, status=status.HTTP_403_FORBIDDEN)
+
+    def recommended(self, request):
+        # آگهی‌های پیشنهادی برای کارجو بر اساس رزومه و مهارت‌ها؛ بازدید مجدد تنها یک خواندن از کش است
+        if request.user.is_authenticated and request.user.user_type == "JS":
+            try:
+                results = recommendations.get_recommendations(request.user)
+            except JobSeekerResume.DoesNotExist:
+                return Response({"Massage": "Resume not found."}, status=status.HTTP_404_NOT_FOUND)
+            return Response({"results": results}, status=status.HTTP_200_OK)
+        else:
+            return Response({"Massage": "You are not a job seeker."}, status=status.HTTP_403_FORBIDDEN)
+
+    def candidates(self, request, pk):
+        # k رزومه برتر متناسب با آگهی؛ تنها برای مالک آگهی یا admin
+        instance = get_object_or_404(self.queryset, id=pk)
+        if not (instance.employer == request.user or request.user.is_staff):
+            return Response({"Massage": "You dont have the permissions."}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            k = int(request.query_params.get('k', 20))
+            # مهارت‌های مطلوب (اختیاری)؛ پیش‌فرض مهارت‌های صنعت آگهی
+            skills = request.query_params.get('skills')
+            skill_ids = [int(value) for value in skills.split(',') if value.strip()] if skills else None
+        except ValueError:
+            return Response({"Massage": "k and skills must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        k = max(1, min(k, getattr(settings, 'MATCHING_MAX_K', 100)))
+
+        # حداقل سابقه کار (اختیاری) بر اساس مقادیر سابقه کار رزومه
+        min_experience = request.query_params.get('experience')
+        if min_experience is not None:
+            if min_experience not in matching.EXPERIENCE_ORDER:
+                return Response({"Massage": "Invalid experience."}, status=status.HTTP_400_BAD_REQUEST)
+            min_experience = matching.EXPERIENCE_ORDER[min_experience]
+
+        matches = matching.match_candidates(instance, k=k, skill_ids=skill_ids, min_experience=min_experience)
+
+        # جزئیات تنها برای k رزومه برتر با یک کوئری واکشی می‌شود
+        resumes = JobSeekerResume.objects.in_bulk(
+            [resume_id for resume_id, _, _ in matches]
+        )
+        results = []
+        for resume_id, job_seeker_id, score in matches:
+            resume = resumes.get(resume_id)
+            if resume is None:
+                continue
+            results.append({
+                "resume_id": resume_id,
+                "job_seeker_id": job_seeker_id,
+                "headline": resume.headline,
+                "location_id": resume.location_id,
+                "degree": resume.degree,
+                "experience": resume.experience,
+                "score": score,
+            })
+        return Response({"advertisement": instance.id, "results": results}, status=status.HTTP_200_OK)
+
+    def export(self, request):
+        # خروجی NDJSON (اختیاری gzip) آگهی‌های تایید شده برای سایت‌های تجمیع‌کننده با حافظه ثابت
+        # هر درخواست کل جدول را پیمایش می‌کند؛ تنها برای کارکنان (شرکا از دستور export_ads استفاده می‌کنند)
+        if not request.user.is_staff:
+            return Response({"Massage": "You dont have the permissions."}, status=status.HTTP_403_FORBIDDEN)
+        since = request.query_params.get('since')
+        if since:
+            try:
+                since = export.parse_since(since)
+            except ValueError:
+                return Response({"Massage": "since must be an ISO 8601 datetime."}, status=status.HTTP_400_BAD_REQUEST)
+        # مرز بالای این خروجی؛ کلاینت آن را به عنوان since دریافت بعدی ارسال می‌کند
+        until = timezone.now()
+        compress = request.query_params.get('gzip') in ('1', 'true')
+
+        response = StreamingHttpResponse(
+            export.stream(since or None, until, compress=compress),
+            content_type='application/gzip' if compress else 'application/x-ndjson',
+        )
+        filename = 'jobs.ndjson.gz' if compress else 'jobs.ndjson'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['X-Export-Until'] = until.isoformat()
+        return response
+
+    def changes(self, request):
+        # فید تغییرات (همگام‌سازی تدریجی اپ موبایل): آگهی‌های ایجاد/ویرایش/تایید شده و tombstone حذف‌ها پس از since
+        try:
+            changes, token, has_more = ad_changes.job_changes(request.query_params.get('since') or None)
+        except ad_changes.InvalidToken:
+            return Response({"Massage": "Invalid since token."}, status=status.HTTP_400_BAD_REQUEST)
+        results = []
+        for change in changes:
+            item = {"id": change['id'], "op": change['op']}
+            if change['op'] == 'upsert':
+                item['data'] = AdCardSerializer(change['card']).data
+            results.append(item)
+        return Response({"next": token, "has_more": has_more, "results": results}, status=status.HTTP_200_OK)
+
+    def similar(self, request, pk):
+        # آگهی‌های فعال مشابه از روی ایندکس LSH (بدون مقایسه با تمام آگهی‌ها)
+        instance = get_object_or_404(JobAdvertisement.objects.only('id', 'title', 'description'), id=pk)
+        results = []
+        for card, score in similarity.similar_ads(instance):
+            data = AdCardSerializer(card).data
+            data['similarity'] = score
+            results.append(data)
+        return Response({"advertisement": instance.id, "results": results}, status=status.HTTP_200_OK)
+
     def update(self, request, pk):
         # واکشی آگهی کارفرما بر اساس شناسه (pk)
-        instance = get_object_or_404(JobAdvertisement, id=pk)
+        instance = get_object_or_404(self.queryset, id=pk)
         # چک می‌شود که آیا درخواست‌دهنده مالک آگهی است یا یک admin (is_staff)
         if instance.employer == request.user or request.user.is_staff:
             # ایجاد سریالایزر جهت به‌روزرسانی جزئی (partial update)
@@ -64,7 +278,7 @@ class JobAdvertisementViewSet(viewsets.ViewSet):
             return Response({"Massage": "You dont have the permissions."}, status=status.HTTP_403_FORBIDDEN)
     
     def destroy(self, request, pk):
-        query = get_object_or_404(JobAdvertisement, id=pk)
+        query = get_object_or_404(self.queryset, id=pk)
         if query.employer == request.user or request.user.is_staff:
             query.delete()    # حذف آگهی کارفرما
             return Response({"Massage": "The advertisement deleted."}, status=status.HTTP_204_NO_CONTENT)
@@ -74,18 +288,64 @@ class JobAdvertisementViewSet(viewsets.ViewSet):
 
 
 class ResumeAdvertisementViewSet(viewsets.ViewSet):
+
+    # برنامه واکشی روابط: تمام روابط مورد نیاز سریالایزر، __str__ و بررسی مالکیت با یک JOIN واکشی می‌شوند
+    queryset = ResumeAdvertisement.objects.select_related(
+        'advertisement__subscription',
+        'job_seeker',
+        'resume',
+        'industry',
+        'location__province',
+    )
+
+    # ترتیب فید: آگهی‌های ویژه، سپس جدیدترین‌ها؛ id جهت پایداری ترتیب
+    feed_ordering = ('-is_boosted', '-created_at', '-id')
+    # ستون‌های کلید صفحه‌بندی که با ?fields= نیز defer نمی‌شوند
+    feed_fields = ('is_boosted', 'created_at', 'id')
     
+    @cached_response(response_cache.RESUME)
     def list(self, request):
-        # دریافت تمامی نمونه‌های ResumeAdvertisement (آگهی‌های کارفرما)
-        queryset = ResumeAdvertisement.objects.all()
-        # سریالایز کردن لیست آگهی‌های کارفرما
-        serializer = ResumeAdvertisementSerializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # دریافت کارت آگهی‌های رزومه (جدول تخت بدون join) به صورت صفحه‌بندی شده (keyset)
+        fieldset = Fieldset.from_request(request)
+        queryset = cards.active(AdCard.objects.filter(kind=Advertisement.TypeChoices.RESUME))
+        queryset = fieldset.project(queryset, AdCardSerializer, keep=self.feed_fields)
+        paginator = KeysetPagination(ordering=self.feed_ordering)
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = AdCardSerializer(page, many=True, fieldset=fieldset)
+        return paginator.get_paginated_response(serializer.data)
+
+    @cached_response(response_cache.RESUME)
+    def search(self, request):
+        # جستجوی متن کامل (فارسی) در عنوان و توضیحات آگهی‌های رزومه با پارامتر q
+        # به همراه فیلتر صنعت، شهر و استان (?province=1,2)
+        search = ResumeAdvertisementSearch(request.query_params)
+        fieldset = Fieldset.from_request(request)
+        queryset = search.filter(cards.active(AdCard.objects.filter(kind=Advertisement.TypeChoices.RESUME)))
+        queryset = fieldset.project(queryset, AdCardSerializer, keep=self.feed_fields)
+        paginator = KeysetPagination(ordering=self.feed_ordering)
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = AdCardSerializer(page, many=True, fieldset=fieldset)
+        return paginator.get_paginated_response(serializer.data)
     
     def retrieve(self, request, pk):
-        query = get_object_or_404(ResumeAdvertisement, id=pk)
-        serializer = ResumeAdvertisementSerializer(query)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # پاسخ 304 از روی updated_at، پیش از واکشی روابط و سریالایز کردن
+        conditional = ConditionalGet(request, ResumeAdvertisement.objects, id=pk)
+        if conditional.row is not None:
+            # ثبت بازدید در بافر کش (بدون UPDATE دیتابیس به ازای هر بازدید)
+            counters.record_view(Advertisement.TypeChoices.RESUME, conditional.row['pk'])
+        # views جزو ETag نیست (هر بازدید updated_at را تغییر نمی‌دهد)؛ پاسخ 304 مقدار views ذخیره شده کلاینت را
+        # معتبر نگه می‌دارد و این مقدار تا تغییر بعدی آگهی ممکن است عقب باشد (ر.ک. counters)
+        not_modified = conditional.not_modified()
+        if not_modified:
+            return not_modified
+        # ستون‌های فیلدهای درخواست نشده (?fields= / ?omit=) از دیتابیس خوانده نمی‌شوند
+        fieldset = Fieldset.from_request(request)
+        query = get_object_or_404(fieldset.project(self.queryset, ResumeAdvertisementSerializer), id=pk)
+        serializer = ResumeAdvertisementSerializer(query, fieldset=fieldset)
+        data = serializer.data
+        if 'views' in serializer.fields:
+            data['views'] = counters.current_views(Advertisement.TypeChoices.RESUME, query)
+        return conditional.finalize(Response(data, status=status.HTTP_200_OK))
     
     def create(self, request):
         # بررسی می‌شود که کاربر دارای نوع کاربری (user_type) "JS" (کارجو) است.
@@ -102,7 +362,7 @@ class ResumeAdvertisementViewSet(viewsets.ViewSet):
 
     def update(self, request, pk):
         # واکشی آگهی کارجو بر اساس شناسه (pk)
-        instance = get_object_or_404(ResumeAdvertisement, id=pk)
+        instance = get_object_or_404(self.queryset, id=pk)
         # چک می‌شود که آیا درخواست‌دهنده مالک آگهی است یا یک admin (is_staff)
         if instance.job_seeker == request.user or request.user.is_staff:
             # ایجاد سریالایزر جهت به‌روزرسانی جزئی (partial update)
@@ -126,7 +386,7 @@ class ResumeAdvertisementViewSet(viewsets.ViewSet):
             return Response({"Massage": "You dont have the permissions."}, status=status.HTTP_403_FORBIDDEN)
     
     def destroy(self, request, pk):
-        query = get_object_or_404(ResumeAdvertisement, id=pk)
+        query = get_object_or_404(self.queryset, id=pk)
         if query.job_seeker == request.user or request.user.is_staff:
             query.delete()    # حذف آگهی کارجو
             return Response({"Massage": "The advertisement deleted."}, status=status.HTTP_204_NO_CONTENT)
@@ -142,18 +402,60 @@ class ApplicationViewSet(viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]  
     # تنها کاربران احراز هویت‌شده مجاز به دسترسی به این ویوست هستند
 
+    # برنامه واکشی روابط: آگهی، کارفرمای آگهی (جهت بررسی مجوز ویرایش) و کارجو با یک JOIN
+    queryset = Application.objects.select_related(
+        'job_seeker',
+        'resume',
+        'advertisement__company',
+        'advertisement__employer',
+    )
+
     def list(self, request, *args, **kwargs):
-        queryset = Application.objects.all()  # دریافت queryset (همه درخواست‌ها)
+        # admin همه درخواست‌ها، کارفرما درخواست‌های آگهی‌های خود و کارجو درخواست‌های خود را می‌بیند
+        if request.user.is_staff:
+            queryset = self.queryset.all()
+        elif request.user.user_type == "EM":
+            queryset = self.queryset.filter(advertisement__employer=request.user)
+        else:
+            queryset = self.queryset.filter(job_seeker=request.user)
         serializer = ApplicationSerializer(queryset, many=True)  # سریالایز کردن لیست درخواست‌ها
         return Response(serializer.data)
 
+    def inbox(self, request):
+        # صندوق درخواست‌های کارفرما با فیلتر آگهی/وضعیت، صفحه‌بندی keyset و شمارش هر وضعیت
+        if request.user.user_type != "EM":
+            return Response({"Massage": "You are not a employer."}, status=status.HTTP_403_FORBIDDEN)
+        inbox = ApplicationInbox(request.user, request.query_params)
+        queryset = inbox.scope()
+        paginator = KeysetPagination(ordering=('-created_at', '-id'))
+        page = paginator.paginate_queryset(inbox.filter(queryset), request)
+        serializer = ApplicationSerializer(page, many=True)
+        response = paginator.get_paginated_response(serializer.data)
+        # شمارش وضعیت‌ها و خوانده نشده‌ها با یک کوئری GROUP BY
+        response.data['counts'] = inbox.counts(queryset)
+        return response
+
+    def bulk_update(self, request):
+        # تغییر وضعیت یا علامت‌گذاری مشاهده گروهی از درخواست‌ها با یک UPDATE
+        if request.user.user_type == "EM" or request.user.is_staff:
+            serializer = ApplicationBulkUpdateSerializer(data=request.data, context={'request': request})
+            if serializer.is_valid():
+                result = serializer.save()
+                return Response(result, status=status.HTTP_200_OK)
+            else:
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            return Response({"Massage": "You are not a employer."}, status=status.HTTP_403_FORBIDDEN)
+
     def retrieve(self, request, pk, *args, **kwargs):
         # واکشی درخواست خاص بر اساس کلید اصلی (pk)؛ در صورت عدم وجود خطای 404 برگردانده می‌شود
-        queryset = get_object_or_404(Application, pk=pk)
+        queryset = get_object_or_404(self.queryset, pk=pk)
         serializer = ApplicationSerializer(queryset)  # سریالایز کردن درخواست دریافت‌شده
         return Response(serializer.data)
 
+    @idempotent
     def create(self, request, *args, **kwargs):
+        # درخواست‌های تکراری با هدر Idempotency-Key پاسخ ذخیره شده درخواست اول را دریافت می‌کنند
         # ایجاد سریالایزر با داده‌های ورودی و context شامل request
         serializer = ApplicationSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)  # اعتبارسنجی داده‌ها؛ در صورت عدم اعتبار خطا برمی‌گرداند
@@ -162,7 +464,7 @@ class ApplicationViewSet(viewsets.ViewSet):
 
     def update(self, request, pk, *args, **kwargs):
         # واکشی نمونه درخواست بر اساس pk
-        instance = get_object_or_404(Application, pk=pk)
+        instance = get_object_or_404(self.queryset, pk=pk)
         # ساختن سریالایزر جهت به‌روز رسانی داده‌ها به‌صورت partial (جزئی)
         serializer = ApplicationSerializer(instance, data=request.data, partial=True, context={'request': request})
         if serializer.is_valid(raise_exception=True):
@@ -174,8 +476,84 @@ class ApplicationViewSet(viewsets.ViewSet):
     def destroy(self, request, pk=None, *args, **kwargs):
         # تنها کاربر ادمین اجازه حذف درخواست‌ها را دارد
         if request.user.is_staff:
-            instance = get_object_or_404(Application, pk=pk)  # واکشی درخواست موردنظر
+            instance = get_object_or_404(self.queryset, pk=pk)  # واکشی درخواست موردنظر
             instance.delete()  # حذف درخواست از دیتابیس
             return Response({"detail": "Application deleted successfully."}, status=status.HTTP_204_NO_CONTENT)
         else:
             return Response({"Massage": "You dont have the permissions"}, status=status.HTTP_403_FORBIDDEN)
+
+
+
+class ModerationViewSet(viewsets.ViewSet):
+    # صف بررسی آگهی‌های در حال بررسی؛ تنها برای admin
+    permission_classes = [permissions.IsAuthenticated]
+
+    # قدیمی‌ترین آگهی‌ها ابتدا؛ مطابق ایندکس جزئی ad_card_moderation_idx
+    queue_ordering = ('created_at', 'id')
+
+    def queue(self, request):
+        if not request.user.is_staff:
+            return Response({"Massage": "You dont have the permissions."}, status=status.HTTP_403_FORBIDDEN)
+        queryset = AdCard.objects.filter(status=StatusChoices.PENDING)
+        # فیلتر اختیاری نوع آگهی (?kind=J یا ?kind=R)
+        kind = request.query_params.get('kind')
+        if kind is not None:
+            if kind not in Advertisement.TypeChoices.values:
+                return Response({"Massage": "Invalid kind."}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(kind=kind)
+        fieldset = Fieldset.from_request(request)
+        queryset = fieldset.project(queryset, AdCardSerializer, keep=('created_at', 'id'))
+        paginator = KeysetPagination(ordering=self.queue_ordering)
+        page = paginator.paginate_queryset(queryset, request)
+        serializer = AdCardSerializer(page, many=True, fieldset=fieldset)
+        return paginator.get_paginated_response(serializer.data)
+
+    def decide(self, request):
+        # تایید یا رد دسته‌ای آگهی‌های در حال بررسی با یک UPDATE برای هر جدول
+        if not request.user.is_staff:
+            return Response({"Massage": "You dont have the permissions."}, status=status.HTTP_403_FORBIDDEN)
+        serializer = ModerationDecisionSerializer(data=request.data, context={'request': request})
+        if serializer.is_valid():
+            result = serializer.save()
+            return Response(result, status=status.HTTP_200_OK)
+        else:
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+
+class SavedSearchViewSet(viewsets.ViewSet):
+    # جستجوهای ذخیره شده کارجو؛ آگهی‌های منطبق تازه تایید شده با دستور send_search_alerts اطلاع داده می‌شوند
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self, request):
+        return SavedSearch.objects.filter(job_seeker=request.user).order_by('-created_at', '-id')
+
+    def list(self, request):
+        if request.user.user_type != "JS":
+            return Response({"Massage": "You dont have the permissions."}, status=status.HTTP_403_FORBIDDEN)
+        serializer = SavedSearchSerializer(self.get_queryset(request), many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def create(self, request):
+        if request.user.user_type != "JS":
+            return Response({"Massage": "You dont have the permissions."}, status=status.HTTP_403_FORBIDDEN)
+        serializer = SavedSearchSerializer(data=request.data, context={'request': request})
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        else:
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def update(self, request, pk):
+        query = get_object_or_404(self.get_queryset(request), id=pk)
+        serializer = SavedSearchSerializer(query, data=request.data, partial=True, context={'request': request})
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        else:
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def destroy(self, request, pk):
+        query = get_object_or_404(self.get_queryset(request), id=pk)
+        query.delete()    # حذف جستجو به همراه هشدارهای آن
+        return Response({"Massage": "The saved search deleted."}, status=status.HTTP_204_NO_CONTENT)
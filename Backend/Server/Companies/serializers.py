@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from Server.fieldsets import SparseFieldsetsMixin
 import uuid
 
 from .models import Company
@@ -7,7 +8,7 @@ from Locations.serializers import CitySerializer
 from Users.serializers import UserSerializer
 
 
-class CompanySerializer(serializers.ModelSerializer):
+class CompanySerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     city_id = serializers.CharField(write_only=True, required=False)
     location = CitySerializer(read_only=True)
     employer = UserSerializer(read_only=True)
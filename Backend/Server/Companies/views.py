@@ -3,11 +3,17 @@ from rest_framework.views import Response
 from rest_framework.viewsets import ModelViewSet
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from Server.conditional import ConditionalGet
+from Server.fieldsets import Fieldset
 from .models import Company
 from .serializers import CompanySerializer
 from .permissions import IsAdminOrOwnerForUpdateAndEmployerForCreate
 
 
+# ستون‌های ردیف‌های مرتبطی که CompanySerializer به صورت تو در تو نمایش می‌دهد (کاربر، شهر و استان)
+NESTED_VERSION_FIELDS = ('employer__last_updated', 'location__name', 'location__province_id', 'location__province__name')
+
+
 class CompanyViewSet(ModelViewSet):
 
     permission_classes = [IsAuthenticated, IsAdminOrOwnerForUpdateAndEmployerForCreate]
@@ -17,14 +23,22 @@ class CompanyViewSet(ModelViewSet):
         """List all companies.
            دریافت لیست تمامی شرکت‌ها.
         """
-        queryset = Company.objects.all()
-        serializer = CompanySerializer(queryset, many=True)
+        # ستون‌های فیلدهای درخواست نشده (?fields= / ?omit=) از دیتابیس خوانده نمی‌شوند
+        fieldset = Fieldset.from_request(request)
+        queryset = fieldset.project(Company.objects.all(), CompanySerializer)
+        serializer = CompanySerializer(queryset, many=True, fieldset=fieldset)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def retrieve(self, request, pk, *args, **kwargs):
-        instance = get_object_or_404(Company, id=pk)
-        serializer = CompanySerializer(instance)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # پاسخ 304 از روی updated_at شرکت و ستون‌های کارفرما و شهر تو در تو، پیش از واکشی و سریالایز کردن شرکت
+        conditional = ConditionalGet(request, Company.objects, depends_on=NESTED_VERSION_FIELDS, id=pk)
+        not_modified = conditional.not_modified()
+        if not_modified:
+            return not_modified
+        fieldset = Fieldset.from_request(request)
+        instance = get_object_or_404(fieldset.project(Company.objects.all(), CompanySerializer), id=pk)
+        serializer = CompanySerializer(instance, fieldset=fieldset)
+        return conditional.finalize(Response(serializer.data, status=status.HTTP_200_OK))
 
     def create(self, request, *args, **kwargs):
         serializer = CompanySerializer(data=request.data, context={'request': request})
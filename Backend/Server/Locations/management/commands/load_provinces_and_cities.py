@@ -1,6 +1,7 @@
 import json
 from django.core.management.base import BaseCommand
 from Locations.models import Province, City  # Import your models
+from Locations import province_map
 from Server.settings import BASE_DIR
 import os
 
@@ -18,4 +19,7 @@ class Command(BaseCommand):
             for city_name in province_data['cities']:
                 City.objects.get_or_create(name=city_name, province=province)
 
+        # Cached province -> city map is stale after loading
+        province_map.invalidate()
+
         self.stdout.write(self.style.SUCCESS('Successfully loaded provinces and cities!'))
@@ -0,0 +1,61 @@
+import threading
+
+from django.core.cache import cache
+
+from .models import City
+
+
+
+
+# -------------------------------
+# نگاشت استان -> شناسه شهرها
+# -------------------------------
+# نگاشت در حافظه پروسه نگهداری می‌شود؛ شماره نسخه در کش مشترک است تا تغییر استان/شهر در یک پروسه
+# نسخه‌ی تمام پروسه‌ها را باطل کند. هر جستجو تنها یک خواندن شماره نسخه از کش هزینه دارد.
+VERSION_KEY = 'locations:province_map:version'
+
+_lock = threading.Lock()
+_map = {}
+_version = None
+
+
+def current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def invalidate():
+    """
+    باطل کردن نگاشت در تمام پروسه‌ها؛ پس از هر تغییر در استان‌ها یا شهرها فراخوانی می‌شود.
+    """
+    global _version
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 1, None)
+        cache.incr(VERSION_KEY)
+    with _lock:
+        _version = None
+
+
+def get_province_map():
+    global _map, _version
+    version = current_version()
+    with _lock:
+        if _version != version:
+            province_map = {}
+            for province_id, city_id in City.objects.values_list('province_id', 'id').order_by('id'):
+                province_map.setdefault(province_id, []).append(city_id)
+            _map, _version = province_map, version
+        return _map
+
+
+def cities_in(province_ids):
+    """
+    شناسه تمام شهرهای استان‌های داده شده (بدون join به جدول City).
+    """
+    province_map = get_province_map()
+    return sorted({city_id for province_id in province_ids for city_id in province_map.get(province_id, ())})
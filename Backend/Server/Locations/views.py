@@ -6,6 +6,7 @@ from rest_framework.exceptions import PermissionDenied  # برای رد درخو
 from .permissions import IsAdminUserOrReadOnly  # ایمپورت کلاس مجوز سفارشی؛ در اینجا تنها ادمین اجازه‌ی ایجاد، ویرایش و حذف دارند
 from .models import Province, City             # ایمپورت مدل‌های Province و City از فایل models
 from .serializers import ProvinceSerializer, CitySerializer  # ایمپورت سریالایزرهای مرتبط
+from . import province_map                     # نگاشت درون‌حافظه‌ای استان -> شهرها؛ پس از هر تغییر باطل می‌شود
 
 
 
@@ -41,6 +42,7 @@ class ProvinceViewSet(viewsets.ViewSet):
         serializer = ProvinceSerializer(data=request.data)
         if serializer.is_valid():
             serializer.save()  # فراخوانی متد create() سریالایزر برای ایجاد نمونه جدید
+            province_map.invalidate()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         # در صورت بروز خطا در اعتبارسنجی، ارسال خطاهای دریافتی با کد 400
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -55,6 +57,7 @@ class ProvinceViewSet(viewsets.ViewSet):
         serializer = ProvinceSerializer(province, data=request.data)
         if serializer.is_valid():
             serializer.save()  # فراخوانی متد update() سریالایزر جهت به‌روزرسانی نمونه
+            province_map.invalidate()
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -65,6 +68,7 @@ class ProvinceViewSet(viewsets.ViewSet):
         # بازیابی استان بر اساس pk
         province = get_object_or_404(Province, id=pk)
         province.delete()  # حذف نمونه از دیتابیس
+        province_map.invalidate()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -98,6 +102,7 @@ class CityViewSet(viewsets.ViewSet):
         serializer = CitySerializer(data=request.data)
         if serializer.is_valid():
             serializer.save()  # فراخوانی متد create() سریالایزر جهت ایجاد نمونه جدید شهر
+            province_map.invalidate()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -105,11 +110,12 @@ class CityViewSet(viewsets.ViewSet):
         # تنها admin مجاز به به‌روزرسانی داده‌هاست
         if not request.user.is_staff:
             raise PermissionDenied("Only admin users can update data.")
-        # بازیابی شهر بر اساس اسلاگ
-        city = get_object_or_404(City, sliduidg=pk)
+        # بازیابی شهر بر اساس شناسه
+        city = get_object_or_404(City, id=pk)
         serializer = CitySerializer(city, data=request.data)
         if serializer.is_valid():
             serializer.save()  # فراخوانی متد update() سریالایزر جهت به‌روزرسانی داده‌ها
+            province_map.invalidate()
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -120,4 +126,5 @@ class CityViewSet(viewsets.ViewSet):
         # دریافت شهر با استفاده از اسلاگ؛ ارسال خطای 404 در صورت عدم وجود
         city = get_object_or_404(City, id=pk)
         city.delete()  # حذف شهر از دیتابیس
+        province_map.invalidate()
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,5 +1,7 @@
 # ایمپورت کردن ماژول‌های مورد نیاز از Django REST Framework
 from rest_framework import serializers
+# فیلدهای درخواستی (?fields= / ?omit=) در خروجی سریالایزرها
+from Server.fieldsets import SparseFieldsetsMixin
 # ایمپورت کردن مدل‌های مرتبط از اپلیکیشن‌های مورد نظر
 from .models import (
     PersonalInformation,
@@ -34,7 +36,7 @@ class PersonalInformationSerializer(serializers.ModelSerializer):
 # -----------------------------
 # سریالایزر برای مدل پروفایل جوینده کار
 # -----------------------------
-class JobSeekerProfileSerializer(serializers.ModelSerializer):
+class JobSeekerProfileSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     سریالایزر برای مدل پروفایل جوینده کار.
     این سریالایزر شامل اطلاعات اصلی پروفایل به همراه بخش اطلاعات شخصی تو در تو می‌باشد.
@@ -86,7 +88,7 @@ class JobSeekerProfileSerializer(serializers.ModelSerializer):
 # -----------------------------
 # سریالایزر برای مدل پروفایل کارفرما
 # -----------------------------
-class EmployerProfileSerializer(serializers.ModelSerializer):
+class EmployerProfileSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     سریالایزر برای مدل پروفایل کارفرما.
     این سریالایزر اطلاعات شرکت، جزئیات کارفرما و اطلاعات شخصی مربوط به آن را شامل می‌شود.
@@ -128,7 +130,7 @@ class EmployerProfileSerializer(serializers.ModelSerializer):
 # -----------------------------
 # سریالایزر برای مدل پروفایل مدیر
 # -----------------------------
-class AdminProfileSerializer(serializers.ModelSerializer):
+class AdminProfileSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     سریالایزر برای مدل پروفایل مدیر.
     این سریالایزر اطلاعات مدیر از جمله کاربر مرتبط و تاریخ‌های ایجاد و به‌روزرسانی را شامل می‌شود.
@@ -143,7 +145,7 @@ class AdminProfileSerializer(serializers.ModelSerializer):
 # -----------------------------
 # سریالایزر برای مدل پروفایل پشتیبان
 # -----------------------------
-class SupportProfileSerializer(serializers.ModelSerializer):
+class SupportProfileSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     سریالایزر برای مدل پروفایل پشتیبان.
     این سریالایزر شامل اطلاعات مرتبط با کاربر پشتیبان و تاریخ‌های ساخت و به‌روزرسانی آن می‌شود.
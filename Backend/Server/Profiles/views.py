@@ -4,6 +4,9 @@ from rest_framework.views import Response, APIView  # کلاس پاسخ جهت 
 from rest_framework import status  # وضعیت‌های HTTP جهت ارسال پاسخ‌های مناسب (مثلاً 403 یا 400)
 from rest_framework.permissions import IsAuthenticated  # محدود کردن دسترسی به کاربران احراز هویت شده
 
+from Server.conditional import ConditionalGet  # پاسخ 304 برای درخواست‌های GET شرطی (ETag / Last-Modified)
+from Server.fieldsets import Fieldset  # فیلدهای درخواستی (?fields= / ?omit=) و defer ستون‌های دیگر
+
 # ایمپورت مدل‌های مربوط به پروفایل‌های جوینده کار، کارفرما، مدیر و پشتیبان
 from .models import JobSeekerProfile, EmployerProfile, AdminProfile, SupportProfile
 # ایمپورت سریالایزرهای مربوطه جهت تبدیل داده‌های مدل به JSON و بالعکس
@@ -15,6 +18,10 @@ from .serializers import (
 )
 
 
+# ستون‌های اطلاعات شخصی که سریالایزر پروفایل‌ها به صورت تو در تو نمایش می‌دهد (این مدل زمان بروزرسانی ندارد)
+PERSONAL_INFO_VERSION_FIELDS = ('personal_info__gender', 'personal_info__age', 'personal_info__kids_count')
+
+
 
 # --------------------------------------
 # ویوست برای مدیریت پروفایل‌های جویندگان کار
@@ -33,12 +40,14 @@ class JobSeekerProfileViewSet(viewsets.ViewSet):
         تنها کاربران استاف (مدیر) قادر به مشاهده این لیست هستند.
         """
         if request.user.is_staff:
-            queryset = JobSeekerProfile.objects.all()  # دریافت تمامی پروفایل‌های جوینده کار
-            serializer = JobSeekerProfileSerializer(queryset, many=True)
+            fieldset = Fieldset.from_request(request)
+            queryset = fieldset.project(JobSeekerProfile.objects.all(), JobSeekerProfileSerializer)  # دریافت تمامی پروفایل‌های جوینده کار
+            serializer = JobSeekerProfileSerializer(queryset, many=True, fieldset=fieldset)
             return Response(serializer.data)  # برگرداندن لیست پروفایل‌ها در صورت موفقیت
         elif request.user.user_type == "JS":
-            instance = JobSeekerProfile.objects.get(user=request.user)
-            serializer = JobSeekerProfileSerializer(instance)
+            fieldset = Fieldset.from_request(request)
+            instance = fieldset.project(JobSeekerProfile.objects.all(), JobSeekerProfileSerializer).get(user=request.user)
+            serializer = JobSeekerProfileSerializer(instance, fieldset=fieldset)
             return Response(serializer.data)
         else:
             # ارسال پیام خطای دسترسی در صورت عدم اجازه
@@ -52,10 +61,21 @@ class JobSeekerProfileViewSet(viewsets.ViewSet):
         دریافت اطلاعات یک پروفایل جوینده کار بر اساس نام کاربری.
         تنها مدیر یا خود کاربر مجاز به مشاهده اطلاعات هستند.
         """
-        instance = get_object_or_404(EmployerProfile, id=pk)
+        # بررسی مجوز و پاسخ 304 تنها با خواندن updated_at، user_id و اطلاعات شخصی تو در تو
+        conditional = ConditionalGet(request, JobSeekerProfile.objects, 'user_id', depends_on=PERSONAL_INFO_VERSION_FIELDS, id=pk)
+        if conditional.row is not None and not (request.user.is_staff or conditional.row['user_id'] == request.user.pk):
+            return Response(
+                {"error": "شما اجازه مشاهده این محتوا را ندارید"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        not_modified = conditional.not_modified()
+        if not_modified:
+            return not_modified
+        fieldset = Fieldset.from_request(request)
+        instance = get_object_or_404(fieldset.project(JobSeekerProfile.objects.all(), JobSeekerProfileSerializer), id=pk)
         if request.user.is_staff or instance.user == request.user:
-            serializer = JobSeekerProfileSerializer(instance)
-            return Response(serializer.data)
+            serializer = JobSeekerProfileSerializer(instance, fieldset=fieldset)
+            return conditional.finalize(Response(serializer.data))
         else:
             # ارسال پیام خطای عدم دسترسی
             return Response(
@@ -102,12 +122,14 @@ class EmployerProfileViewSet(viewsets.ViewSet):
         دریافت لیست تمامی پروفایل‌های کارفرما.
         """
         if request.user.is_staff:
-            queryset = EmployerProfile.objects.all()  # دریافت تمام پروفایل‌های کارفرما
-            serializer = EmployerProfileSerializer(queryset, many=True)
+            fieldset = Fieldset.from_request(request)
+            queryset = fieldset.project(EmployerProfile.objects.all(), EmployerProfileSerializer)  # دریافت تمام پروفایل‌های کارفرما
+            serializer = EmployerProfileSerializer(queryset, many=True, fieldset=fieldset)
             return Response(serializer.data)
         elif request.user.user_type == "EM":
-            instance = EmployerProfile.objects.get(user=request.user)
-            serializer = EmployerProfileSerializer(instance)
+            fieldset = Fieldset.from_request(request)
+            instance = fieldset.project(EmployerProfile.objects.all(), EmployerProfileSerializer).get(user=request.user)
+            serializer = EmployerProfileSerializer(instance, fieldset=fieldset)
             return Response(serializer.data)
         else:
             return Response(
@@ -120,10 +142,21 @@ class EmployerProfileViewSet(viewsets.ViewSet):
         دریافت اطلاعات یک پروفایل کارفرما بر اساس نام کاربری.
         تنها مدیر یا خود کاربر قادر به مشاهده اطلاعات هستند.
         """
-        instance = get_object_or_404(EmployerProfile, id=pk)
+        # بررسی مجوز و پاسخ 304 تنها با خواندن updated_at، user_id و اطلاعات شخصی تو در تو
+        conditional = ConditionalGet(request, EmployerProfile.objects, 'user_id', depends_on=PERSONAL_INFO_VERSION_FIELDS, id=pk)
+        if conditional.row is not None and not (request.user.is_staff or conditional.row['user_id'] == request.user.pk):
+            return Response(
+                {"error": "شما اجازه مشاهده این محتوا را ندارید"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        not_modified = conditional.not_modified()
+        if not_modified:
+            return not_modified
+        fieldset = Fieldset.from_request(request)
+        instance = get_object_or_404(fieldset.project(EmployerProfile.objects.all(), EmployerProfileSerializer), id=pk)
         if request.user.is_staff or instance.user == request.user:
-            serializer = EmployerProfileSerializer(instance)
-            return Response(serializer.data)
+            serializer = EmployerProfileSerializer(instance, fieldset=fieldset)
+            return conditional.finalize(Response(serializer.data))
         else:
             return Response(
                 {"error": "شما اجازه مشاهده این محتوا را ندارید"},
@@ -167,8 +200,9 @@ class AdminProfileViewSet(viewsets.ViewSet):
         دسترسی تنها برای مدیران ارشد.
         """
         if request.user.is_superuser:
-            queryset = AdminProfile.objects.all()  # دریافت تمام پروفایل‌های مدیر
-            serializer = AdminProfileSerializer(queryset, many=True)
+            fieldset = Fieldset.from_request(request)
+            queryset = fieldset.project(AdminProfile.objects.all(), AdminProfileSerializer)  # دریافت تمام پروفایل‌های مدیر
+            serializer = AdminProfileSerializer(queryset, many=True, fieldset=fieldset)
             return Response(serializer.data)
         else:
             return Response(
@@ -182,9 +216,14 @@ class AdminProfileViewSet(viewsets.ViewSet):
         فقط مدیران ارشد قادر به مشاهده هستند.
         """
         if request.user.is_superuser:
-            profile = get_object_or_404(AdminProfile, id=pk)
-            serializer = AdminProfileSerializer(profile)
-            return Response(serializer.data)
+            conditional = ConditionalGet(request, AdminProfile.objects, id=pk)
+            not_modified = conditional.not_modified()
+            if not_modified:
+                return not_modified
+            fieldset = Fieldset.from_request(request)
+            profile = get_object_or_404(fieldset.project(AdminProfile.objects.all(), AdminProfileSerializer), id=pk)
+            serializer = AdminProfileSerializer(profile, fieldset=fieldset)
+            return conditional.finalize(Response(serializer.data))
         else:
             return Response(
                 {"error": "شما اجازه مشاهده این محتوا را ندارید"},
@@ -227,12 +266,14 @@ class SupportProfileViewSet(viewsets.ViewSet):
         دریافت لیست تمامی پروفایل‌های پشتیبان.
         """
         if request.user.is_staff:
-            queryset = SupportProfile.objects.all()  # دریافت تمام پروفایل‌های پشتیبان
-            serializer = SupportProfileSerializer(queryset, many=True)
+            fieldset = Fieldset.from_request(request)
+            queryset = fieldset.project(SupportProfile.objects.all(), SupportProfileSerializer)  # دریافت تمام پروفایل‌های پشتیبان
+            serializer = SupportProfileSerializer(queryset, many=True, fieldset=fieldset)
             return Response(serializer.data)
         elif request.user.user_type == "SU":
-            instance = SupportProfile.objects.get(user=request.user)
-            serializer = SupportProfileSerializer(instance)
+            fieldset = Fieldset.from_request(request)
+            instance = fieldset.project(SupportProfile.objects.all(), SupportProfileSerializer).get(user=request.user)
+            serializer = SupportProfileSerializer(instance, fieldset=fieldset)
             return Response(serializer.data)
         else:
             return Response(
@@ -245,9 +286,14 @@ class SupportProfileViewSet(viewsets.ViewSet):
         دریافت اطلاعات یک پروفایل پشتیبان بر اساس نام کاربری.
         """
         if request.user.is_staff:
-            profile = get_object_or_404(SupportProfile, id=pk)
-            serializer = SupportProfileSerializer(profile)
-            return Response(serializer.data)
+            conditional = ConditionalGet(request, SupportProfile.objects, id=pk)
+            not_modified = conditional.not_modified()
+            if not_modified:
+                return not_modified
+            fieldset = Fieldset.from_request(request)
+            profile = get_object_or_404(fieldset.project(SupportProfile.objects.all(), SupportProfileSerializer), id=pk)
+            serializer = SupportProfileSerializer(profile, fieldset=fieldset)
+            return conditional.finalize(Response(serializer.data))
         else:
             return Response(
                 {"error": "شما اجازه مشاهده این محتوا را ندارید"},
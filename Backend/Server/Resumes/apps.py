@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ResumesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Resumes'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from Resumes import uploads
+
+
+class Command(BaseCommand):
+    help = 'Delete CV upload sessions (and their temporary files) idle for longer than CV_UPLOAD_TTL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ttl', type=int, default=None, help='Idle seconds (default: CV_UPLOAD_TTL)')
+
+    def handle(self, *args, **options):
+        purged = uploads.purge_expired(options['ttl'])
+        self.stdout.write(f'Purged {purged} upload(s)')
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:12
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Resumes', '0003_alter_experience_location_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False, unique=True)),
+                ('filename', models.CharField(max_length=255, verbose_name='نام فایل')),
+                ('size', models.PositiveBigIntegerField(verbose_name='اندازه فایل')),
+                ('part_size', models.PositiveIntegerField(verbose_name='اندازه تکه')),
+                ('status', models.CharField(choices=[('P', 'در حال آپلود'), ('C', 'تکمیل شده')], default='P', max_length=1, verbose_name='وضعیت')),
+                ('content_hash', models.CharField(blank=True, max_length=64, verbose_name='هش محتوا')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='تاریخ ایجاد')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاریخ بروزرسانی')),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cv_uploads', to='Resumes.jobseekerresume', verbose_name='رزومه')),
+            ],
+            options={
+                'verbose_name': 'آپلود رزومه',
+                'verbose_name_plural': 'آپلودهای رزومه',
+            },
+        ),
+        migrations.CreateModel(
+            name='CVUploadPart',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(verbose_name='شماره تکه')),
+                ('sha256', models.CharField(max_length=64, verbose_name='هش تکه')),
+                ('upload', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parts', to='Resumes.cvupload', verbose_name='آپلود')),
+            ],
+            options={
+                'verbose_name': 'تکه آپلود رزومه',
+                'verbose_name_plural': 'تکه\u200cهای آپلود رزومه',
+                'constraints': [models.UniqueConstraint(fields=('upload', 'number'), name='unique_cv_upload_part')],
+            },
+        ),
+    ]
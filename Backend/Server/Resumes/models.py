@@ -1,5 +1,7 @@
 from django.db import models  # وارد کردن ماژول models از Django جهت تعریف مدل‌های دیتابیس
 
+import uuid
+
 # ایمپورت مدل‌های مرتبط از اپ‌های دیگر:
 from Locations.models import City              # ایمپورت مدل City از اپ Locations جهت مدیریت اطلاعات مکان
 from Industry.models import Industry, Skill      # ایمپورت مدل‌های Industry برای صنایع و Skill برای مهارت‌ها از اپ Industry
@@ -389,3 +391,88 @@ class JobSeekerSkill(models.Model):
     def __str__(self):
         # نمایش نام مهارت به همراه سطح آن (استفاده از متد get_level_display جهت نمایش مقدار خوانا)
         return f"{self.skill.name} ({self.get_level_display()})"
+
+
+# ------------------------------
+# آپلود تکه‌ای (قابل ادامه) فایل رزومه
+# ------------------------------
+class CVUpload(models.Model):
+    """
+    یک جلسه آپلود تکه‌ای فایل رزومه (Resumes/uploads.py).
+    فایل به part_count تکه با اندازه ثابت part_size تقسیم می‌شود (تکه آخر کوچک‌تر)؛ هر تکه در فایل
+    موقت خود نوشته و هش آن هنگام دریافت محاسبه می‌شود. پس از دریافت تمام تکه‌ها
+    فایل با نام هش محتوا ذخیره و به فیلد cv رزومه متصل می‌شود.
+    """
+    class StatusChoices(models.TextChoices):
+        PENDING = 'P', 'در حال آپلود'
+        COMPLETED = 'C', 'تکمیل شده'
+
+    id = models.UUIDField(default=uuid.uuid4, primary_key=True, unique=True)
+
+    # رزومه‌ای که فایل پس از تکمیل به آن متصل می‌شود
+    resume = models.ForeignKey(
+        JobSeekerResume,
+        on_delete=models.CASCADE,
+        related_name="cv_uploads",
+        verbose_name="رزومه"
+    )
+
+    # نام اصلی فایل (جهت تعیین پسوند)
+    filename = models.CharField(max_length=255, verbose_name="نام فایل")
+
+    # اندازه کل فایل و اندازه هر تکه (بایت)
+    size = models.PositiveBigIntegerField(verbose_name="اندازه فایل")
+    part_size = models.PositiveIntegerField(verbose_name="اندازه تکه")
+
+    status = models.CharField(
+        max_length=1,
+        choices=StatusChoices.choices,
+        default=StatusChoices.PENDING,
+        verbose_name="وضعیت"
+    )
+
+    # هش محتوای فایل پس از تکمیل
+    content_hash = models.CharField(max_length=64, blank=True, verbose_name="هش محتوا")
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="تاریخ ایجاد")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="تاریخ بروزرسانی")
+
+    class Meta:
+        verbose_name = "آپلود رزومه"
+        verbose_name_plural = "آپلودهای رزومه"
+
+    @property
+    def part_count(self):
+        return max(1, -(-self.size // self.part_size))
+
+    def part_length(self, number):
+        # اندازه مورد انتظار تکه شماره number (شماره‌گذاری از صفر)
+        return min(self.part_size, self.size - number * self.part_size)
+
+    def __str__(self):
+        return self.filename
+
+
+class CVUploadPart(models.Model):
+    """
+    تکه دریافت شده یک آپلود به همراه هش SHA-256 آن؛ ارسال دوباره یک تکه آن را جایگزین می‌کند.
+    """
+    upload = models.ForeignKey(
+        CVUpload,
+        on_delete=models.CASCADE,
+        related_name="parts",
+        verbose_name="آپلود"
+    )
+
+    # شماره تکه (از صفر)
+    number = models.PositiveIntegerField(verbose_name="شماره تکه")
+
+    # هش SHA-256 محتوای تکه (hex)
+    sha256 = models.CharField(max_length=64, verbose_name="هش تکه")
+
+    class Meta:
+        verbose_name = "تکه آپلود رزومه"
+        verbose_name_plural = "تکه‌های آپلود رزومه"
+        constraints = [
+            models.UniqueConstraint(fields=['upload', 'number'], name='unique_cv_upload_part'),
+        ]
@@ -5,6 +5,7 @@ from .views import (
     ExperienceViewSet,
     EducationViewSet,
     JobSeekerSkillViewSet,
+    CVUploadViewSet,
 )
 
 
@@ -33,6 +34,8 @@ class JobSeekerResumeRouter(routers.DefaultRouter):
                         'put': 'update', 
                         'delete': 'destroy'
                     })),
+                    # سند کامل رزومه (تجربیات، تحصیلات و مهارت‌ها) در یک درخواست
+                    path('document/', JobSeekerResumeViewSet.as_view({'get': 'document'})),
                 ])),
             ])),
         ]
@@ -122,3 +125,30 @@ class JobSeekerSkillRouter(routers.DefaultRouter):
             ])),
         ]
         return urls + custom_urls
+
+
+# ---------------------------------------------------------
+# روتر آپلود تکه‌ای فایل رزومه (CVUploadRouter)
+# ---------------------------------------------------------
+class CVUploadRouter(routers.DefaultRouter):
+    def __init__(self):
+        super().__init__()
+        # ثبت ویوست CVUploadViewSet با basename 'cv-uploads'
+        self.register(r'', CVUploadViewSet, basename='cv-uploads')
+
+    def get_urls(self):
+        custom_urls = [
+            path('', include([
+                # ایجاد جلسه آپلود
+                path('', CVUploadViewSet.as_view({'post': 'create'})),
+                path('<uuid:pk>/', include([
+                    # وضعیت (تکه‌های دریافت نشده) و لغو آپلود
+                    path('', CVUploadViewSet.as_view({'get': 'retrieve', 'delete': 'destroy'})),
+                    # ارسال یک تکه به صورت بدنه خام
+                    path('parts/<int:number>/', CVUploadViewSet.as_view({'put': 'upload_part'})),
+                    # تکمیل آپلود و اتصال فایل به رزومه
+                    path('complete/', CVUploadViewSet.as_view({'post': 'complete'})),
+                ])),
+            ])),
+        ]
+        return custom_urls
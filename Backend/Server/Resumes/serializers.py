@@ -1,5 +1,6 @@
 from rest_framework import serializers  # وارد کردن ماژول سریالایزرهای Django REST Framework
-from .models import JobSeekerResume, Experience, Education, JobSeekerSkill  # ایمپورت مدل‌های مرتبط از فایل models
+from .models import JobSeekerResume, Experience, Education, JobSeekerSkill, CVUpload  # ایمپورت مدل‌های مرتبط از فایل models
+from . import uploads
 
 
 
@@ -127,3 +128,86 @@ class JobSeekerSkillSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         # جلوگیری از به‌روزرسانی فیلد رزومه و استفاده از به‌روزرسانی پیش‌فرض برای بقیه‌ی فیلدها
         return super().update(instance, validated_data)
+
+
+# ----------------------------
+# سریالایزرهای سند کامل رزومه (فقط خواندنی)
+# ----------------------------
+# روابط به صورت تو در تو با نام نمایش داده می‌شوند؛ view تمام روابط را با select_related و
+# prefetch_related از پیش واکشی می‌کند، پس سریالایز کردن هیچ کوئری اضافه‌ای اجرا نمی‌کند.
+class NamedSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class CityDocumentSerializer(NamedSerializer):
+    province = NamedSerializer()
+
+
+class ExperienceDocumentSerializer(serializers.ModelSerializer):
+    location = CityDocumentSerializer(allow_null=True)
+
+    class Meta:
+        model = Experience
+        fields = ['id', 'employment_type', 'title', 'company', 'location', 'start_date', 'end_date', 'description']
+
+
+class EducationDocumentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Education
+        fields = ['id', 'school', 'degree', 'grade', 'field_of_study', 'start_date', 'end_date', 'description']
+
+
+class JobSeekerSkillDocumentSerializer(serializers.ModelSerializer):
+    skill = NamedSerializer(allow_null=True)
+
+    class Meta:
+        model = JobSeekerSkill
+        fields = ['id', 'skill', 'level']
+
+
+class ResumeDocumentSerializer(serializers.ModelSerializer):
+    job_seeker = serializers.SerializerMethodField()
+    industry = NamedSerializer(allow_null=True)
+    location = CityDocumentSerializer(allow_null=True)
+    experiences = ExperienceDocumentSerializer(source='Experiences', many=True)
+    educations = EducationDocumentSerializer(source='Educations', many=True)
+    skills = JobSeekerSkillDocumentSerializer(source='Job_Seeker_Skills', many=True)
+
+    class Meta:
+        model = JobSeekerResume
+        fields = [
+            'id', 'job_seeker', 'industry', 'headline', 'bio', 'website', 'linkedin_profile',
+            'location', 'gender', 'soldier_status', 'degree', 'years_of_experience',
+            'experience', 'expected_salary', 'preferred_job_type', 'cv', 'availability',
+            'experiences', 'educations', 'skills', 'created_at', 'updated_at'
+        ]
+
+    def get_job_seeker(self, obj):
+        return {'id': obj.job_seeker.id, 'full_name': obj.job_seeker.full_name}
+
+
+# ----------------------------
+# سریالایزرهای آپلود تکه‌ای فایل رزومه
+# ----------------------------
+class CVUploadInitSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+
+
+class CVUploadSerializer(serializers.ModelSerializer):
+    part_count = serializers.IntegerField(read_only=True)
+    # شماره تکه‌های دریافت نشده؛ کلاینت پس از قطع اتصال تنها همین تکه‌ها را ارسال می‌کند
+    missing_parts = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CVUpload
+        fields = [
+            'id', 'filename', 'size', 'part_size', 'part_count', 'missing_parts', 'status', 'content_hash',
+            'created_at', 'updated_at'
+        ]
+
+    def get_missing_parts(self, obj):
+        if obj.status == CVUpload.StatusChoices.COMPLETED:
+            return []
+        return uploads.missing_parts(obj, obj.parts.values_list('number', flat=True))
@@ -0,0 +1,63 @@
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete  # ایمپورت سیگنال‌های ذخیره و حذف شیء
+from django.dispatch import receiver
+from django.utils import timezone
+
+from Industry.models import Industry, Skill
+from Locations.models import Province, City
+from Users.models import User
+from .models import JobSeekerResume, Experience, Education, JobSeekerSkill
+
+
+# تغییر هر بخش رزومه (تجربه، تحصیلات، مهارت) updated_at رزومه را نیز به‌روز می‌کند؛ پس updated_at رزومه
+# بیشینه زمان تغییر کل سند است و نسخه کش و ETag سند رزومه تنها از همین ستون خوانده می‌شود.
+# (از update() استفاده می‌شود تا سیگنال‌های ذخیره رزومه دوباره اجرا نشوند)
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+@receiver(post_save, sender=Education)
+@receiver(post_delete, sender=Education)
+@receiver(post_save, sender=JobSeekerSkill)
+@receiver(post_delete, sender=JobSeekerSkill)
+def touch_resume(sender, instance, **kwargs):
+    JobSeekerResume.objects.filter(pk=instance.resume_id).update(updated_at=timezone.now())
+
+
+def touch_resumes(condition):
+    # زیرکوئری شناسه‌ها تا شرط روی روابط چندگانه (تجربه‌ها، مهارت‌ها) ردیف تکراری ایجاد نکند
+    JobSeekerResume.objects.filter(
+        pk__in=JobSeekerResume.objects.filter(condition).values('pk')
+    ).update(updated_at=timezone.now())
+
+
+# نام‌هایی که سند رزومه از ردیف‌های مرتبط نمایش می‌دهد (نام کاربر، صنعت، شهر، استان و مهارت) نیز
+# بخشی از نسخه سند هستند؛ ویرایش آن‌ها (که به ندرت و توسط مدیر انجام می‌شود) رزومه‌های مرتبط را به‌روز می‌کند.
+@receiver(post_save, sender=User)
+def touch_job_seeker_resume(sender, instance, created, update_fields=None, **kwargs):
+    # ثبت زمان ورود (last_login) در سند رزومه نمایش داده نمی‌شود
+    if created or update_fields == frozenset({'last_login'}):
+        return
+    touch_resumes(Q(job_seeker=instance))
+
+
+@receiver(post_save, sender=Industry)
+def touch_industry_resumes(sender, instance, created, **kwargs):
+    if not created:
+        touch_resumes(Q(industry=instance))
+
+
+@receiver(post_save, sender=City)
+def touch_city_resumes(sender, instance, created, **kwargs):
+    if not created:
+        touch_resumes(Q(location=instance) | Q(Experiences__location=instance))
+
+
+@receiver(post_save, sender=Province)
+def touch_province_resumes(sender, instance, created, **kwargs):
+    if not created:
+        touch_resumes(Q(location__province=instance) | Q(Experiences__location__province=instance))
+
+
+@receiver(post_save, sender=Skill)
+def touch_skill_resumes(sender, instance, created, **kwargs):
+    if not created:
+        touch_resumes(Q(Job_Seeker_Skills__skill=instance))
@@ -1,3 +1,242 @@
-from django.test import TestCase
+import datetime
+import hashlib
+import io
+import os
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from Industry.models import Industry, IndustryCategory, Skill
+from Locations.models import Province, City
+from Users.models import User
+from .models import Experience, Education, JobSeekerSkill, CVUpload
+from . import uploads
+
+
+
+
+class ResumeDocumentTest(TestCase):
+    """
+    تست سند کامل رزومه: تعداد ثابت کوئری‌ها، کش بر اساس نسخه و پاسخ 304.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.job_seeker = User.objects.create_user(
+            phone="09120000002",
+            user_type="JS",
+            password="password123",
+            full_name="job seeker"
+        )
+        self.client.force_authenticate(self.job_seeker)
+        self.resume = self.job_seeker.resume
+        province = Province.objects.create(name="تهران")
+        self.city = City.objects.create(province=province, name="تهران")
+        industry = Industry.objects.create(name="نرم‌افزار", category=IndustryCategory.objects.create(name="فناوری"))
+        self.resume.industry = industry
+        self.resume.location = self.city
+        self.resume.save()
+        self.skills = [Skill.objects.create(name=f"مهارت {i}", industry=industry) for i in range(3)]
+
+    def add_items(self, count):
+        for i in range(count):
+            Experience.objects.create(
+                resume=self.resume, employment_type="full_time", title=f"شغل {i}", company="شرکت",
+                location=self.city, start_date=datetime.date(2020, 1, i + 1)
+            )
+            Education.objects.create(
+                resume=self.resume, school="دانشگاه", degree="Bachelor", field_of_study=f"رشته {i}",
+                start_date=datetime.date(2015, 1, i + 1)
+            )
+            JobSeekerSkill.objects.create(resume=self.resume, skill=self.skills[i % 3], level="expert")
+
+    def url(self):
+        return f"/resumes/resumes/{self.resume.id}/document/"
+
+    def test_document_uses_fixed_number_of_queries(self):
+        self.add_items(1)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url())
+        cache.clear()
+        self.add_items(5)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url())
+        self.assertEqual(len(small), len(large))
+
+        self.assertEqual(len(response.data["experiences"]), 6)
+        self.assertEqual(len(response.data["educations"]), 6)
+        self.assertEqual(response.data["experiences"][0]["location"]["province"]["name"], "تهران")
+        self.assertEqual(response.data["skills"][0]["skill"]["name"], "مهارت 0")
+        self.assertEqual(response.data["location"]["name"], "تهران")
+
+    def test_document_is_cached_by_version(self):
+        self.add_items(1)
+        response = self.client.get(self.url())
+        etag = response["ETag"]
+
+        # همان نسخه: تنها کوئری خواندن نسخه اجرا می‌شود
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url()).data, response.data)
+        self.assertEqual(self.client.get(self.url(), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # تغییر یک بخش فرزند نسخه رزومه را تغییر می‌دهد
+        JobSeekerSkill.objects.filter(resume=self.resume).first().delete()
+        response = self.client.get(self.url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["skills"], [])
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_related_names_change_the_version(self):
+        self.add_items(1)
+        etag = self.client.get(self.url())["ETag"]
+        self.job_seeker.full_name = "نام جدید"
+        self.job_seeker.save()
+        response = self.client.get(self.url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["job_seeker"]["full_name"], "نام جدید")
+
+        etag = response["ETag"]
+        self.skills[0].name = "مهارت تازه"
+        self.skills[0].save()
+        response = self.client.get(self.url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["skills"][0]["skill"]["name"], "مهارت تازه")
+
+        etag = response["ETag"]
+        self.city.province.name = "البرز"
+        self.city.province.save()
+        response = self.client.get(self.url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["experiences"][0]["location"]["province"]["name"], "البرز")
+
+    def test_cached_document_is_per_host(self):
+        self.resume.cv = "jobseekers/resumes/cv.pdf"
+        self.resume.save()
+        self.assertTrue(self.client.get(self.url()).data["cv"].startswith("http://testserver/"))
+        with self.settings(ALLOWED_HOSTS=["other.example"]):
+            response = self.client.get(self.url(), HTTP_HOST="other.example")
+        self.assertTrue(response.data["cv"].startswith("http://other.example/"))
+
+    def test_missing_resume_returns_404(self):
+        self.assertEqual(self.client.get("/resumes/resumes/999999/document/").status_code, 404)
+
+
+
+class CVUploadTest(TestCase):
+    """
+    تست آپلود تکه‌ای فایل رزومه: ادامه آپلود، ذخیره بر اساس هش محتوا و اتصال به رزومه.
+    """
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        upload_settings = override_settings(
+            MEDIA_ROOT=media_root,
+            CV_UPLOAD_TEMP_DIR=os.path.join(media_root, 'uploads'),
+            CV_UPLOAD_PART_SIZE=4,
+        )
+        upload_settings.enable()
+        self.addCleanup(upload_settings.disable)
+        self.media_root = media_root
+        self.client = APIClient()
+
+    def create_job_seeker(self, phone):
+        user = User.objects.create_user(phone=phone, user_type="JS", password="password123", full_name="job seeker")
+        self.client.force_authenticate(user)
+        return user
+
+    def init(self, content, filename="cv.pdf"):
+        response = self.client.post("/resumes/uploads/", {"filename": filename, "size": len(content)}, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data
+
+    def put_part(self, upload_id, number, data):
+        return self.client.put(
+            f"/resumes/uploads/{upload_id}/parts/{number}/", data, content_type="application/octet-stream"
+        )
+
+    def upload(self, content, filename="cv.pdf"):
+        upload = self.init(content, filename)
+        for number in range(upload["part_count"]):
+            self.assertEqual(self.put_part(upload["id"], number, content[number * 4:(number + 1) * 4]).status_code, 200)
+        return self.client.post(f"/resumes/uploads/{upload['id']}/complete/")
+
+    def test_resumed_upload_is_attached_to_resume(self):
+        user = self.create_job_seeker("09120000002")
+        content = b"%PDF-resume"
+        upload = self.init(content)
+        self.assertEqual(upload["part_count"], 3)
+
+        # تکه‌ها به ترتیب دلخواه؛ تکه ناقص ثبت نمی‌شود
+        self.assertEqual(self.put_part(upload["id"], 2, content[8:]).status_code, 200)
+        self.assertEqual(self.put_part(upload["id"], 0, content[:2]).status_code, 400)
+        self.assertEqual(self.client.get(f"/resumes/uploads/{upload['id']}/").data["missing_parts"], [0, 1])
+        self.assertEqual(self.client.post(f"/resumes/uploads/{upload['id']}/complete/").status_code, 400)
+
+        self.put_part(upload["id"], 0, content[:4])
+        self.put_part(upload["id"], 1, content[4:8])
+        response = self.client.post(f"/resumes/uploads/{upload['id']}/complete/")
+        self.assertEqual(response.status_code, 200, response.data)
+
+        digests = b"".join(hashlib.sha256(content[i:i + 4]).digest() for i in range(0, len(content), 4))
+        content_hash = hashlib.sha256(digests).hexdigest()
+        self.assertEqual(response.data["content_hash"], content_hash)
+        user.resume.refresh_from_db()
+        self.assertEqual(user.resume.cv.name, f"jobseekers/resumes/{content_hash[:2]}/{content_hash}.pdf")
+        with user.resume.cv.open("rb") as cv:
+            self.assertEqual(cv.read(), content)
+        self.assertFalse(os.listdir(os.path.join(self.media_root, "uploads")))
+
+        # تکمیل دوباره همان نتیجه را برمی‌گرداند
+        self.assertEqual(self.client.post(f"/resumes/uploads/{upload['id']}/complete/").status_code, 200)
+
+    def test_identical_files_share_one_blob(self):
+        first = self.create_job_seeker("09120000002")
+        self.assertEqual(self.upload(b"same content").status_code, 200)
+        second = self.create_job_seeker("09120000003")
+        self.assertEqual(self.upload(b"same content").status_code, 200)
+
+        first.resume.refresh_from_db()
+        second.resume.refresh_from_db()
+        self.assertEqual(first.resume.cv.name, second.resume.cv.name)
+        blobs = [name for _, _, names in os.walk(os.path.join(self.media_root, "jobseekers")) for name in names]
+        self.assertEqual(len(blobs), 1)
+
+    def test_uploads_are_private_and_validated(self):
+        self.create_job_seeker("09120000002")
+        response = self.client.post("/resumes/uploads/", {"filename": "cv.exe", "size": 10}, format="json")
+        self.assertEqual(response.status_code, 400)
+        upload = self.init(b"12345")
+
+        self.create_job_seeker("09120000003")
+        self.assertEqual(self.client.get(f"/resumes/uploads/{upload['id']}/").status_code, 404)
+        self.assertEqual(self.put_part(upload["id"], 0, b"1234").status_code, 404)
+
+        self.assertEqual(CVUpload.objects.count(), 1)
+
+    def test_part_after_complete_or_abort_is_rejected(self):
+        user = self.create_job_seeker("09120000002")
+        content = b"%PDF-resume"
+        self.assertEqual(self.upload(content).status_code, 200)
+        # نمونه‌ای که پیش از تکمیل خوانده شده است (PUT همزمان با complete)
+        stale = CVUpload.objects.get()
+        stale.status = CVUpload.StatusChoices.PENDING
+        with self.assertRaises(uploads.UploadError):
+            uploads.write_part(stale, 0, io.BytesIO(b"XXXX"), 4)
+        user.resume.refresh_from_db()
+        with user.resume.cv.open("rb") as cv:
+            self.assertEqual(cv.read(), content)
+
+        # فایل تکه حذف شده (abort یا purge همزمان) به جای خطای 500، خطای 400 برمی‌گرداند
+        pending = self.init(b"12345")
+        self.put_part(pending["id"], 0, b"1234")
+        self.put_part(pending["id"], 1, b"5")
+        os.remove(os.path.join(self.media_root, "uploads", f"{pending['id']}.0.part"))
+        self.assertEqual(self.client.post(f"/resumes/uploads/{pending['id']}/complete/").status_code, 400)
+        self.assertEqual(os.listdir(os.path.join(self.media_root, "uploads")), [f"{pending['id']}.1.part"])
@@ -0,0 +1,192 @@
+import hashlib
+import os
+import shutil
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import JobSeekerResume, CVUpload, CVUploadPart
+
+
+
+
+# -------------------------------
+# آپلود تکه‌ای (قابل ادامه) فایل رزومه با ذخیره‌سازی بر اساس هش محتوا
+# -------------------------------
+# init:     ایجاد جلسه آپلود
+# part:     نوشتن جریانی بدنه درخواست در فایل موقت همان تکه و محاسبه هش آن حین دریافت (بدون قفل؛
+#           تکه‌های یک آپلود به صورت موازی دریافت می‌شوند) و ثبت تکه با یک قفل کوتاه روی ردیف آپلود
+# complete: ترکیب هش تکه‌ها، الحاق فایل تکه‌ها در مسیر هش محتوا و اتصال آن به رزومه در یک تراکنش
+#
+# هش محتوا SHA-256 دنباله هش SHA-256 تکه‌ها (به ترتیب) است؛ چون اندازه تکه‌ها ثابت است، فایل‌های یکسان
+# هش یکسان دارند و یک فایل (blob) مشترک خواهند داشت، بدون آن‌که کل فایل دوباره خوانده شود.
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class UploadError(ValueError):
+    pass
+
+
+def temporary_root():
+    return getattr(settings, 'CV_UPLOAD_TEMP_DIR', os.path.join(settings.MEDIA_ROOT, 'jobseekers', 'uploads'))
+
+
+def part_path(upload, number):
+    return os.path.join(temporary_root(), f'{upload.pk}.{number}.part')
+
+
+def remove_parts(upload):
+    for number in range(upload.part_count):
+        if os.path.exists(part_path(upload, number)):
+            os.remove(part_path(upload, number))
+
+
+def extension(filename):
+    return os.path.splitext(filename)[1].lower()
+
+
+def blob_name(content_hash, filename):
+    # مسیر نسبی فایل در MEDIA_ROOT (مقدار فیلد cv)؛ دو نویسه اول هش جهت محدود کردن تعداد فایل هر پوشه
+    return f'jobseekers/resumes/{content_hash[:2]}/{content_hash}{extension(filename)}'
+
+
+def content_hash(part_digests):
+    return hashlib.sha256(b''.join(bytes.fromhex(digest) for digest in part_digests)).hexdigest()
+
+
+# -------------------------------
+# مراحل آپلود
+# -------------------------------
+def init(resume, filename, size):
+    if extension(filename) not in settings.CV_UPLOAD_EXTENSIONS:
+        raise UploadError(f"Allowed file types: {', '.join(settings.CV_UPLOAD_EXTENSIONS)}.")
+    if not 0 < size <= settings.CV_UPLOAD_MAX_SIZE:
+        raise UploadError(f'File size must be between 1 and {settings.CV_UPLOAD_MAX_SIZE} bytes.')
+
+    upload = CVUpload.objects.create(
+        resume=resume,
+        filename=os.path.basename(filename),
+        size=size,
+        part_size=settings.CV_UPLOAD_PART_SIZE,
+    )
+    os.makedirs(temporary_root(), exist_ok=True)
+    return upload
+
+
+def write_part(upload, number, stream, length):
+    """
+    نوشتن یک تکه از روی stream (بدنه خام درخواست) بدون بارگذاری کامل آن در حافظه.
+    تکه در فایلی یکتا و بدون نگه داشتن اتصال یا قفل دیتابیس دریافت می‌شود؛ تنها ثبت آن (جایگزینی فایل
+    تکه و ردیف CVUploadPart) با قفل کوتاه ردیف آپلود و بررسی دوباره وضعیت انجام می‌شود تا complete
+    همزمان تکه‌ای نیمه‌کاره یا تکه‌ای پس از تکمیل را نبیند.
+    تکه تنها در صورت دریافت کامل ثبت می‌شود؛ در غیر این صورت کلاینت همان تکه را دوباره ارسال می‌کند.
+    """
+    if upload.status != CVUpload.StatusChoices.PENDING:
+        raise UploadError('The upload is already completed.')
+    if not 0 <= number < upload.part_count:
+        raise UploadError(f'Part number must be between 0 and {upload.part_count - 1}.')
+    expected = upload.part_length(number)
+    if length != expected:
+        raise UploadError(f'Part {number} must be exactly {expected} bytes.')
+
+    digest = hashlib.sha256()
+    received = 0
+    # نام یکتا؛ ارسال همزمان یک تکه توسط دو درخواست روی فایل یکدیگر نمی‌نویسد
+    incoming = f'{part_path(upload, number)}.{uuid.uuid4().hex}'
+    os.makedirs(temporary_root(), exist_ok=True)
+    try:
+        with open(incoming, 'wb') as output:
+            while received < expected:
+                chunk = stream.read(min(READ_CHUNK_SIZE, expected - received))
+                if not chunk:
+                    break
+                output.write(chunk)
+                digest.update(chunk)
+                received += len(chunk)
+        if received != expected:
+            raise UploadError(f'Part {number} is incomplete ({received} of {expected} bytes received).')
+
+        with transaction.atomic():
+            locked = CVUpload.objects.select_for_update().filter(pk=upload.pk).first()
+            if locked is None:
+                raise UploadError('The upload was aborted or has expired.')
+            if locked.status != CVUpload.StatusChoices.PENDING:
+                raise UploadError('The upload is already completed.')
+            os.replace(incoming, part_path(upload, number))
+            CVUploadPart.objects.update_or_create(upload=upload, number=number, defaults={'sha256': digest.hexdigest()})
+            # آپلود فعال توسط purge_expired حذف نمی‌شود
+            CVUpload.objects.filter(pk=upload.pk).update(updated_at=timezone.now())
+    finally:
+        if os.path.exists(incoming):
+            os.remove(incoming)
+    return digest.hexdigest()
+
+
+def missing_parts(upload, received):
+    return sorted(set(range(upload.part_count)) - set(received))
+
+
+def complete(upload_id, resume):
+    """
+    تکمیل آپلود: فایل تکه‌ها با نام هش محتوا الحاق (یا در صورت وجود فایل یکسان حذف) و فیلد cv رزومه
+    با یک UPDATE در همان تراکنش تنظیم می‌شود. فراخوانی دوباره پس از تکمیل همان نتیجه را برمی‌گرداند.
+    """
+    with transaction.atomic():
+        upload = CVUpload.objects.select_for_update().get(pk=upload_id, resume=resume)
+        if upload.status == CVUpload.StatusChoices.COMPLETED:
+            return upload, blob_name(upload.content_hash, upload.filename)
+
+        parts = dict(upload.parts.values_list('number', 'sha256'))
+        missing = missing_parts(upload, parts)
+        if missing:
+            raise UploadError(f"Missing part(s): {', '.join(map(str, missing))}.")
+
+        upload.content_hash = content_hash(parts[number] for number in range(upload.part_count))
+        name = blob_name(upload.content_hash, upload.filename)
+        path = os.path.join(settings.MEDIA_ROOT, name)
+        # فایل یکسان ممکن است قبلاً ذخیره شده باشد
+        if not os.path.exists(path):
+            joined = os.path.join(temporary_root(), f'{upload.pk}.joined')
+            try:
+                with open(joined, 'wb') as output:
+                    for number in range(upload.part_count):
+                        with open(part_path(upload, number), 'rb') as part:
+                            shutil.copyfileobj(part, output, READ_CHUNK_SIZE)
+            except FileNotFoundError:
+                os.remove(joined)
+                raise UploadError('The upload was aborted or has expired.')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # جایگزینی اتمیک؛ فایل نیمه‌کاره هرگز در مسیر هش قرار نمی‌گیرد
+            os.replace(joined, path)
+        remove_parts(upload)
+
+        # فایل قبلی رزومه حذف نمی‌شود؛ ممکن است بین چند رزومه مشترک باشد
+        JobSeekerResume.objects.filter(pk=resume.pk).update(cv=name, updated_at=timezone.now())
+        upload.status = CVUpload.StatusChoices.COMPLETED
+        upload.save(update_fields=['status', 'content_hash', 'updated_at'])
+        upload.parts.all().delete()
+    return upload, name
+
+
+def abort(upload):
+    # قفل ردیف: ثبت تکه همزمان یا پیش از حذف فایل‌ها انجام می‌شود یا پس از آن آپلود را حذف شده می‌یابد
+    with transaction.atomic():
+        CVUpload.objects.select_for_update().filter(pk=upload.pk).first()
+        remove_parts(upload)
+        upload.delete()
+
+
+def purge_expired(ttl=None):
+    """
+    حذف آپلودهایی که بیش از CV_UPLOAD_TTL ثانیه تغییری نداشته‌اند؛ آپلود ناتمام به همراه فایل تکه‌های آن
+    و آپلود تکمیل شده تنها ردیف جلسه (فایل نهایی متعلق به رزومه است).
+    """
+    ttl = ttl if ttl is not None else getattr(settings, 'CV_UPLOAD_TTL', 24 * 3600)
+    expired = CVUpload.objects.filter(updated_at__lt=timezone.now() - timedelta(seconds=ttl))
+    uploads = list(expired)
+    for upload in uploads:
+        abort(upload)
+    return len(uploads)
@@ -4,6 +4,7 @@ from .routers import (              # ایمپورت روترهای سفارشی
     ExperienceRouter,
     EducationRouter,
     JobSeekerSkillRouter,
+    CVUploadRouter,
 )
 
 
@@ -15,6 +16,7 @@ job_seeker_resumes_router = JobSeekerResumeRouter()  # ایجاد نمونه‌
 experiences_router = ExperienceRouter()              # ایجاد نمونه‌ای از روتر مربوط به تجربیات کاری
 educations_router = EducationRouter()                # ایجاد نمونه‌ای از روتر مربوط به تحصیلات
 skills_router = JobSeekerSkillRouter()               # ایجاد نمونه‌ای از روتر مربوط به مهارت‌های رزومه جوینده کار
+cv_uploads_router = CVUploadRouter()                 # ایجاد نمونه‌ای از روتر مربوط به آپلود تکه‌ای فایل رزومه
 
 
 
@@ -28,4 +30,6 @@ urlpatterns = [
     path('educations/', include(educations_router.get_urls())),
     # مسیر 'skills/' شامل URLهای مربوط به مهارت‌های رزومه می‌باشد
     path('skills/', include(skills_router.get_urls())),
+    # مسیر 'uploads/' شامل URLهای آپلود تکه‌ای و قابل ادامه فایل رزومه می‌باشد
+    path('uploads/', include(cv_uploads_router.get_urls())),
 ]
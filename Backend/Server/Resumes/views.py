@@ -1,16 +1,25 @@
 from rest_framework import viewsets, permissions, status  # وارد کردن ویوست‌ها، مجوزها و وضعیت‌های HTTP
 from rest_framework.response import Response  # کلاس Response جهت ارسال پاسخ به کلاینت
 from rest_framework.generics import get_object_or_404  # تابع get_object_or_404 جهت بازیابی شیء یا ارسال خطای 404
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db.models import Prefetch
+from Server.conditional import ConditionalGet  # پاسخ 304 و کلید نسخه سند رزومه بر اساس updated_at
 
 # ایمپورت مدل‌های مورد استفاده در این ویوست‌ها
-from .models import JobSeekerResume, Experience, Education, JobSeekerSkill
+from .models import JobSeekerResume, Experience, Education, JobSeekerSkill, CVUpload
 # ایمپورت سریالایزرهای مربوط به هر مدل
 from .serializers import (
     JobSeekerResumeSerializer,
     ExperienceSerializer,
     EducationSerializer,
     JobSeekerSkillSerializer,
+    ResumeDocumentSerializer,
+    CVUploadInitSerializer,
+    CVUploadSerializer,
 )
+from . import uploads
 
 # ========================================
 # JobSeekerResume ViewSet
@@ -57,6 +66,38 @@ class JobSeekerResumeViewSet(viewsets.ModelViewSet):
         instance.delete()
         return Response({"detail": "رزومه با موفقیت حذف شد."}, status=status.HTTP_204_NO_CONTENT)
 
+    # برنامه واکشی سند رزومه: یک کوئری برای رزومه (با JOIN کاربر، صنعت، شهر و استان) و یک کوئری
+    # برای هر مجموعه فرزند (با JOIN شهر یا مهارت)؛ مستقل از تعداد ردیف‌ها، همیشه 4 کوئری
+    document_queryset = JobSeekerResume.objects.select_related(
+        'job_seeker', 'industry', 'location__province',
+    ).prefetch_related(
+        Prefetch('Experiences', queryset=Experience.objects.select_related('location__province')),
+        'Educations',
+        Prefetch('Job_Seeker_Skills', queryset=JobSeekerSkill.objects.select_related('skill').order_by('id')),
+    )
+
+    def document(self, request, pk=None, *args, **kwargs):
+        """
+        سند کامل رزومه شامل تجربیات کاری، تحصیلات و مهارت‌ها در یک پاسخ.
+        نسخه سند updated_at رزومه است (تغییر هر بخش آن و نام‌های نمایش داده شده از ردیف‌های مرتبط
+        آن را به‌روز می‌کند، Resumes/signals.py)؛ با یک کوئری سبک، درخواست شرطی با 304 و در غیر این صورت
+        پاسخ کش شده همان نسخه برگردانده می‌شود. آدرس فایل رزومه مطلق است، پس میزبان درخواست بخشی از کلید کش است.
+        """
+        conditional = ConditionalGet(request, JobSeekerResume.objects, pk=pk)
+        not_modified = conditional.not_modified()
+        if not_modified:
+            return not_modified
+        if conditional.row is None:
+            return Response({"detail": "رزومه یافت نشد."}, status=status.HTTP_404_NOT_FOUND)
+
+        key = f"resume_document:{pk}:{conditional.row['updated_at'].isoformat()}:{request.get_host()}"
+        data = cache.get(key)
+        if data is None:
+            instance = get_object_or_404(self.document_queryset, pk=pk)
+            data = ResumeDocumentSerializer(instance, context={'request': request}).data
+            cache.set(key, data, getattr(settings, 'RESUME_DOCUMENT_CACHE_TTL', 300))
+        return conditional.finalize(Response(data))
+
 
 # ========================================
 # Experience ViewSet
@@ -221,3 +262,70 @@ class JobSeekerSkillViewSet(viewsets.ModelViewSet):
         instance = get_object_or_404(self.get_queryset(), pk=pk)
         instance.delete()
         return Response({"detail": "مهارت با موفقیت حذف شد."}, status=status.HTTP_204_NO_CONTENT)
+
+
+# ========================================
+# CVUpload ViewSet
+# ========================================
+class CVUploadViewSet(viewsets.ViewSet):
+    """
+    آپلود تکه‌ای و قابل ادامه فایل رزومه (cv) کارجو:
+      - POST   uploads/                          ایجاد جلسه آپلود با {filename, size}
+      - GET    uploads/<id>/                     وضعیت آپلود و تکه‌های دریافت نشده (ادامه پس از قطع اتصال)
+      - PUT    uploads/<id>/parts/<number>/      ارسال یک تکه به صورت بدنه خام (application/octet-stream)
+      - POST   uploads/<id>/complete/            تکمیل آپلود و اتصال فایل به رزومه
+      - DELETE uploads/<id>/                     لغو آپلود
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_resume(self, request):
+        if request.user.user_type != "JS":
+            return None
+        return JobSeekerResume.objects.filter(job_seeker=request.user).first()
+
+    def create(self, request):
+        resume = self.get_resume(request)
+        if resume is None:
+            return Response({"Massage": "You dont have the permissions."}, status=status.HTTP_403_FORBIDDEN)
+        serializer = CVUploadInitSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            upload = uploads.init(resume, **serializer.validated_data)
+        except uploads.UploadError as e:
+            return Response({"Massage": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(CVUploadSerializer(upload).data, status=status.HTTP_201_CREATED)
+
+    def retrieve(self, request, pk=None):
+        upload = get_object_or_404(CVUpload.objects.filter(resume__job_seeker=request.user), pk=pk)
+        return Response(CVUploadSerializer(upload).data)
+
+    def upload_part(self, request, pk=None, number=None):
+        upload = get_object_or_404(CVUpload.objects.filter(resume__job_seeker=request.user), pk=pk)
+        try:
+            length = int(request.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = 0
+        try:
+            # بدنه درخواست بدون پارس شدن (request.data) به صورت جریانی خوانده می‌شود
+            digest = uploads.write_part(upload, number, request.stream, length)
+        except uploads.UploadError as e:
+            return Response({"Massage": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"number": number, "sha256": digest}, status=status.HTTP_200_OK)
+
+    def complete(self, request, pk=None):
+        resume = self.get_resume(request)
+        if resume is None:
+            return Response({"Massage": "You dont have the permissions."}, status=status.HTTP_403_FORBIDDEN)
+        get_object_or_404(CVUpload.objects.filter(resume=resume), pk=pk)
+        try:
+            upload, name = uploads.complete(pk, resume)
+        except uploads.UploadError as e:
+            return Response({"Massage": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        data = CVUploadSerializer(upload).data
+        data['cv'] = request.build_absolute_uri(default_storage.url(name))
+        return Response(data, status=status.HTTP_200_OK)
+
+    def destroy(self, request, pk=None):
+        upload = get_object_or_404(CVUpload.objects.filter(resume__job_seeker=request.user), pk=pk)
+        uploads.abort(upload)
+        return Response({"detail": "آپلود لغو شد."}, status=status.HTTP_204_NO_CONTENT)
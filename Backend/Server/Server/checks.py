@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+
+
+
+# -------------------------------
+# بررسی کش مشترک بین پروسه‌ها
+# -------------------------------
+# ابطال پیشنهادها، نشانگر درخواست در حال پردازش Idempotency-Key، شمارنده‌های نسل کش لیست‌ها،
+# نسخه نگاشت استان به شهر و شمارنده‌های بازدید تنها زمانی درست کار می‌کنند که همه پروسه‌ها
+# یک کش را ببینند.
+SHARED_ALIASES = ('default', 'recommendations')
+
+# بک‌اندهایی که داده هر پروسه را جدا نگه می‌دارند
+PROCESS_LOCAL_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_caches(app_configs, **kwargs):
+    errors = []
+    for alias in SHARED_ALIASES:
+        backend = settings.CACHES.get(alias, {}).get('BACKEND')
+        if backend in PROCESS_LOCAL_BACKENDS:
+            errors.append(Error(
+                f"Cache '{alias}' uses the per-process backend {backend}.",
+                hint='Set REDIS_URL so that every worker process shares one cache.',
+                id='Server.E001',
+            ))
+    return errors
@@ -0,0 +1,98 @@
+import hashlib
+import json
+
+from django.db import models
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from .fieldsets import Fieldset
+
+
+
+
+def weak(tag):
+    # مقایسه ضعیف ETag: پیشوند W/ در نظر گرفته نمی‌شود
+    return tag[2:] if tag.startswith('W/') else tag
+
+
+def is_timestamp(model, lookup):
+    # آیا مسیر lookup (مثلاً employer__last_updated) به یک ستون DateTimeField می‌رسد؟
+    *relations, name = lookup.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return isinstance(model._meta.get_field(name), models.DateTimeField)
+
+
+class ConditionalGet:
+    """
+    درخواست GET شرطی (ETag / Last-Modified) برای اکشن‌های retrieve.
+
+    ابتدا تنها ستون updated_at (و ستون‌های اضافی لازم برای بررسی مجوز) با یک کوئری سبک خوانده می‌شود؛
+    اگر نسخه کلاینت (If-None-Match یا If-Modified-Since) به‌روز باشد، پاسخ 304 بدون واکشی
+    گراف کامل شیء و سریالایز کردن آن برگردانده می‌شود.
+
+        conditional = ConditionalGet(request, Company.objects, id=pk)
+        not_modified = conditional.not_modified()
+        if not_modified:
+            return not_modified
+        ...
+        return conditional.finalize(Response(serializer.data))
+
+    depends_on: ستون‌های ردیف‌های مرتبطی که سریالایزر به صورت تو در تو نمایش می‌دهد
+    (مثلاً 'location__name')؛ مقدار آن‌ها در همان کوئری سبک خوانده و در ETag درج می‌شود.
+    اگر یکی از آن‌ها زمان بروزرسانی نباشد، Last-Modified ارسال نمی‌شود و تنها ETag معتبر است.
+    فیلدهای درخواستی (?fields= / ?omit=) نیز بخشی از ETag هستند.
+    """
+
+    def __init__(self, request, queryset, *fields, depends_on=(), **lookup):
+        self.request = request
+        self.label = queryset.model._meta.label_lower
+        self.depends_on = tuple(depends_on)
+        self.timestamped = all(is_timestamp(queryset.model, lookup_path) for lookup_path in self.depends_on)
+        self.fieldset = Fieldset.from_request(request)
+        # None در صورت عدم وجود شیء؛ مسیر عادی view خطای 404 را برمی‌گرداند
+        self.row = queryset.filter(**lookup).values('pk', 'updated_at', *fields, *self.depends_on).first()
+
+    @property
+    def etag(self):
+        if self.row is None:
+            return None
+        version = json.dumps([
+            self.label, str(self.row['pk']), self.row['updated_at'].isoformat(),
+            [self.row[name] for name in self.depends_on], self.fieldset.key(),
+        ], default=str)
+        return f'W/"{hashlib.md5(version.encode()).hexdigest()}"'
+
+    @property
+    def last_modified(self):
+        if self.row is None or not self.timestamped:
+            return None
+        timestamps = [self.row['updated_at'], *(self.row[name] for name in self.depends_on)]
+        return int(max(value for value in timestamps if value is not None).timestamp())
+
+    def is_fresh(self):
+        if self.row is None:
+            return False
+        # طبق RFC 7232 در صورت وجود If-None-Match، هدر If-Modified-Since نادیده گرفته می‌شود
+        if_none_match = self.request.headers.get('If-None-Match')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return '*' in etags or weak(self.etag) in {weak(tag) for tag in etags}
+        if self.last_modified is None:
+            return False
+        if_modified_since = parse_http_date_safe(self.request.headers.get('If-Modified-Since', ''))
+        return if_modified_since is not None and self.last_modified <= if_modified_since
+
+    def not_modified(self):
+        if self.is_fresh():
+            return self.finalize(Response(status=status.HTTP_304_NOT_MODIFIED))
+        return None
+
+    def finalize(self, response):
+        if self.row is not None and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = self.etag
+            if self.last_modified is not None:
+                response['Last-Modified'] = http_date(self.last_modified)
+        return response
@@ -0,0 +1,84 @@
+from rest_framework.exceptions import ValidationError
+
+
+
+
+def parse_names(params, name):
+    names = []
+    for raw in params.getlist(name):
+        names.extend(value.strip() for value in raw.split(',') if value.strip())
+    return set(names) or None
+
+
+class Fieldset:
+    """
+    فیلدهای درخواستی (sparse fieldset) با پارامترهای ?fields=a,b و ?omit=c.
+
+    علاوه بر حذف فیلدها از خروجی سریالایزر، ستون‌های مدل متناظر با فیلدهای حذف شده با defer()
+    از کوئری کنار گذاشته می‌شوند تا ستون‌های بزرگ (مانند description) اصلاً از دیتابیس خوانده نشوند.
+
+        fieldset = Fieldset.from_request(request)
+        queryset = fieldset.project(Company.objects.all(), CompanySerializer)
+        serializer = CompanySerializer(queryset, many=True, fieldset=fieldset)
+    """
+
+    def __init__(self, fields=None, omit=None):
+        self.fields = fields
+        self.omit = omit
+
+    @classmethod
+    def from_request(cls, request):
+        return cls(parse_names(request.query_params, 'fields'), parse_names(request.query_params, 'omit'))
+
+    def __bool__(self):
+        return bool(self.fields or self.omit)
+
+    def key(self):
+        # نمایش نرمال‌شده فیلدهای درخواستی (ترتیب و تکرار اهمیتی ندارد)، مثلاً برای ETag
+        return f"fields={','.join(sorted(self.fields or ()))};omit={','.join(sorted(self.omit or ()))}"
+
+    def dropped(self, serializer_fields):
+        """
+        نام فیلدهای سریالایزر که نباید در خروجی باشند؛ نام ناشناخته خطای 400 برمی‌گرداند.
+        """
+        if not self:
+            return set()
+        unknown = ((self.fields or set()) | (self.omit or set())) - set(serializer_fields)
+        if unknown:
+            raise ValidationError({'fields': f"Unknown field(s): {', '.join(sorted(unknown))}."})
+        dropped = set(serializer_fields) - self.fields if self.fields else set()
+        return dropped | (self.omit or set())
+
+    def project(self, queryset, serializer_class, keep=()):
+        """
+        defer کردن ستون‌های غیر رابطه‌ای مدل که تنها منبع فیلدهای حذف شده سریالایزر هستند.
+        keep: ستون‌هایی که خارج از سریالایزر لازم‌اند (مثلاً کلیدهای مرتب‌سازی صفحه‌بندی).
+        """
+        if not self:
+            return queryset
+        serializer_fields = serializer_class().fields
+        dropped = self.dropped(serializer_fields)
+        needed = set(keep) | {
+            field.source.split('.')[0]
+            for name, field in serializer_fields.items()
+            if name not in dropped and field.source != '*'
+        }
+        sources = {serializer_fields[name].source for name in dropped}
+        deferred = [
+            field.name for field in queryset.model._meta.concrete_fields
+            if not field.primary_key and not field.is_relation
+            and field.name in sources and field.name not in needed
+        ]
+        return queryset.defer(*deferred) if deferred else queryset
+
+
+class SparseFieldsetsMixin:
+    """
+    میکسین سریالایزر: پذیرش آرگومان fieldset و حذف فیلدهای درخواست نشده از خروجی.
+    """
+
+    def __init__(self, *args, fieldset=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fieldset is not None:
+            for name in fieldset.dropped(self.fields):
+                self.fields.pop(name)
@@ -93,6 +93,49 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+# Recommendation invalidation, Idempotency-Key in-flight markers, listing cache generations, the
+# province-to-city map version and buffered view counters are only correct when every worker
+# process sees the same cache. Production must set REDIS_URL (requires the redis package);
+# `manage.py check --deploy` fails while either alias below is a per-process LocMemCache.
+# Counters and generations are stored without a TTL, so run Redis with a volatile-* maxmemory-policy
+# to keep them from being evicted.
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'maherkar',
+        },
+        # Per-user recommendation lists
+        'recommendations': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'maherkar:recommendations',
+            'TIMEOUT': 900,
+        },
+    }
+else:
+    # Single-process development server only
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+        # Per-user recommendation lists; LocMemCache evicts least recently used entries when full
+        'recommendations': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'recommendations',
+            'TIMEOUT': 900,
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -217,4 +260,57 @@ CORS_ALLOWED_ORIGINS = [
     'http://localhost:3002',
 ]
 
-CORS_ALLOW_ALL_ORIGINS = True
\ No newline at end of file
+CORS_ALLOW_ALL_ORIGINS = True
+
+# Advertisements feed pagination (keyset)
+ADS_PAGE_SIZE = 20        # Default page size
+ADS_MAX_PAGE_SIZE = 100   # Upper bound for ?page_size=
+ADS_BATCH_MAX_SIZE = 100  # Max job ads per batch create request
+APPLICATIONS_BULK_MAX_SIZE = 1000  # Max application ids per bulk update request
+ADS_MODERATION_MAX_SIZE = 500  # Max ad ids per batch approve/reject request
+ADS_RESPONSE_CACHE_TTL = 60  # Seconds a cached public list/search response is kept
+ADS_EXPORT_CHUNK_SIZE = 2000  # Rows fetched per server-side cursor round trip in the NDJSON export
+CHANGE_FEED_PAGE_SIZE = 500   # Max changes (and max tombstones) per change-feed page
+CHANGE_FEED_LAG = 5           # Seconds; changes newer than this are held back until concurrent commits settle
+
+# Job-to-candidate matching
+MATCHING_MATRIX_TTL = 300  # Seconds before the in-memory resume matrix is rebuilt
+MATCHING_MAX_K = 100       # Upper bound for ?k= on the candidates endpoint
+
+# Personalized job recommendations
+RECOMMENDATIONS_SIZE = 50  # Number of ranked job ads cached per job seeker
+
+# Similar job ads (MinHash / LSH)
+ADS_SIMILAR_SIZE = 10          # Number of similar job ads returned
+ADS_SIMILAR_MIN_SCORE = 0.3    # Minimum estimated Jaccard similarity of a returned ad
+
+# Saved job searches and their alerts
+SAVED_SEARCH_MAX_PER_USER = 20    # Max saved searches per job seeker
+SAVED_SEARCH_MAX_KEYWORDS = 10    # Max keywords per saved search
+SEARCH_ALERTS_BATCH_SIZE = 200    # Job seekers handled per send_search_alerts round (one UPDATE each)
+
+# Composite resume document (cached per resume version, i.e. its updated_at)
+RESUME_DOCUMENT_CACHE_TTL = 300
+
+# Resumable chunked CV uploads (content-addressed blobs under MEDIA_ROOT/jobseekers/resumes/)
+CV_UPLOAD_PART_SIZE = 1024 * 1024        # Bytes per part (every part but the last has exactly this size)
+CV_UPLOAD_MAX_SIZE = 10 * 1024 * 1024    # Max CV file size in bytes
+CV_UPLOAD_EXTENSIONS = ('.pdf', '.doc', '.docx')
+CV_UPLOAD_TEMP_DIR = os.path.join(MEDIA_ROOT, 'jobseekers', 'uploads')
+CV_UPLOAD_TTL = 24 * 3600                # Seconds before an unfinished upload is purged
+
+# Idempotency-Key replay store (seconds a stored response is kept)
+IDEMPOTENCY_KEY_TTL = 3600
+
+# Buffered ad view counters. Counts live in the shared default cache until flushed; run the
+# flush_ad_views command periodically so views recorded by idle or killed workers reach the DB.
+# Views are only lost if the cache evicts a counter key (or restarts) before it is flushed.
+ADS_VIEW_FLUSH_INTERVAL = 30        # Seconds between in-request flushes of a worker's buffered views
+ADS_VIEW_FLUSH_MAX_PENDING = 1000   # Flush early once this many ads have buffered views
+
+# Sharded XML sitemaps (written by the generate_sitemaps command, served as static files)
+SITEMAP_ROOT = os.path.join(MEDIA_ROOT, 'sitemaps')
+SITEMAP_SHARD_SIZE = 50000                  # Max URLs per sitemap file (protocol limit)
+SITEMAP_SITE_URL = 'https://example.com'    # Public site origin used in <loc> URLs
+SITEMAP_JOB_PATH = '/jobs/{id}/'
+SITEMAP_COMPANY_PATH = '/companies/{id}/'
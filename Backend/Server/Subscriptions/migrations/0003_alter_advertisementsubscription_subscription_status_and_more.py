@@ -0,0 +1,22 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Subscriptions', '0002_alter_advertisementsubscription_end_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='advertisementsubscription',
+            name='subscription_status',
+            field=models.CharField(choices=[('default', 'پیش\u200c فرض'), ('special', 'خاص'), ('expired', 'منقضی شده')], default='default', max_length=30, verbose_name='وضعیت اشتراک'),
+        ),
+        migrations.AddIndex(
+            model_name='advertisementsubscription',
+            index=models.Index(fields=['end_date'], name='subscription_end_date_idx'),
+        ),
+    ]
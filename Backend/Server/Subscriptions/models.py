@@ -26,6 +26,32 @@ class SubscriptionPlan(models.Model):
         return self.name
 
 
+def active_subscription_q(prefix='', status_field='subscription_status', end_date_field='end_date'):
+    """
+    شرط SQL اشتراک فعال (معادل AdvertisementSubscription.is_active).
+    prefix مسیر رابطه تا اشتراک است، مثلاً 'advertisement__subscription__'.
+    """
+    return (
+        ~models.Q(**{f'{prefix}{status_field}': AdvertisementSubscription.SubscriptionStatus.EXPIRED})
+        & (
+            models.Q(**{f'{prefix}{end_date_field}__isnull': True})
+            | models.Q(**{f'{prefix}{end_date_field}__gt': timezone.now()})
+        )
+    )
+
+
+class AdvertisementSubscriptionQuerySet(models.QuerySet):
+
+    def active(self):
+        return self.filter(active_subscription_q())
+
+    def expired(self):
+        # اشتراک‌هایی که تاریخ پایانشان گذشته ولی هنوز منقضی علامت نخورده‌اند
+        return self.filter(end_date__lte=timezone.now()).exclude(
+            subscription_status=AdvertisementSubscription.SubscriptionStatus.EXPIRED
+        )
+
+
 class AdvertisementSubscription(models.Model):
     """
     مدل اشتراک برای آگهی‌ها.
@@ -35,6 +61,7 @@ class AdvertisementSubscription(models.Model):
     class SubscriptionStatus(models.TextChoices):
         DEFAULT = 'default', "پیش‌ فرض"
         SPECIAL = 'special', "خاص"
+        EXPIRED = 'expired', "منقضی شده"
 
     subscription_status = models.CharField(
         max_length=30,
@@ -61,17 +88,25 @@ class AdvertisementSubscription(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="تاریخ ایجاد")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="تاریخ بروزرسانی")
 
+    objects = AdvertisementSubscriptionQuerySet.as_manager()
+
     class Meta:
         verbose_name = "اشتراک آگهی"
         verbose_name_plural = "اشتراک های آگهی"
+        indexes = [
+            # جستجوی اشتراک‌های منقضی شده توسط sweeper (دستور expire_subscriptions)
+            models.Index(fields=['end_date'], name='subscription_end_date_idx'),
+        ]
 
     def is_active(self):
         """
-        بررسی وضعیت فعال بودن اشتراک بر اساس پرداخت و تاریخ انقضا.
-        این متد بررسی می‌کند که آیا وضعیت پرداخت برابر با PAID است و تاریخ فعلی قبل از تاریخ پایان اشتراک می‌باشد.
-        توجه: فیلد payment_status و PaymentStatus در کد تعریف نشده‌اند؛ بنابراین فرض بر این است که باید تعریف شوند.
+        بررسی وضعیت فعال بودن اشتراک: منقضی نشده و (در صورت داشتن تاریخ پایان) تاریخ فعلی قبل از تاریخ پایان است.
+        اشتراک‌های بدون تاریخ پایان (پیش‌فرض) همیشه فعال هستند.
+        معادل SQL این شرط active_subscription_q است تا لیست‌ها در دیتابیس فیلتر شوند.
         """
-        return self.payment_status == self.PaymentStatus.PAID and timezone.now() < self.end_date
+        if self.subscription_status == self.SubscriptionStatus.EXPIRED:
+            return False
+        return self.end_date is None or timezone.now() < self.end_date
 
     def __str__(self):
         return f"اشتراک آگهی برای {self.plan.name}"